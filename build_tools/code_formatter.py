@@ -45,6 +45,8 @@ import inspect
 import os
 import re
 
+from generated_files import write_if_changed
+
 
 class lookup(object):
     def __init__(self, formatter, frame, *args, **kwargs):
@@ -171,46 +173,42 @@ class code_formatter(object, metaclass=code_formatter_meta):
         self._data = []
 
     def write(self, *args):
-        f = open(os.path.join(*args), "w")
-        name, extension = os.path.splitext(f.name)
+        path = os.path.join(*args)
+        name, extension = os.path.splitext(path)
 
         # Add a comment to inform which file generated the generated file
         # to make it easier to backtrack and modify generated code
         frame = inspect.currentframe().f_back
         if re.match(r"^\.(cc|hh|c|h)$", extension) is not None:
-            f.write(
-                f"""/**
+            header = f"""/**
  * DO NOT EDIT THIS FILE!
  * File automatically generated by
  *   {frame.f_code.co_filename}:{frame.f_lineno}
  */
 
 """
-            )
         elif re.match(r"^\.py$", extension) is not None:
-            f.write(
-                f"""#
+            header = f"""#
 # DO NOT EDIT THIS FILE!
 # File automatically generated by
 #   {frame.f_code.co_filename}:{frame.f_lineno}
 #
 
 """
-            )
         elif re.match(r"^\.html$", extension) is not None:
-            f.write(
-                f"""<!--
+            header = f"""<!--
  DO NOT EDIT THIS FILE!
  File automatically generated by
    {frame.f_code.co_filename}:{frame.f_lineno}
 -->
 
 """
-            )
+        else:
+            header = ""
 
-        for data in self._data:
-            f.write(data)
-        f.close()
+        # Leave the file untouched if its content is the same, so that
+        # what depends on it isn't rebuilt.
+        write_if_changed(path, header + "".join(self._data))
 
     def __str__(self):
         data = "".join(self._data)
@@ -0,0 +1,157 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Helpers for the code generators run by the build (the ISA parser and
+SLICC) to avoid touching their outputs when nothing changed.
+
+write_if_changed() only replaces a file when its content differs, so the
+modification times of unchanged generated files are kept and the build
+doesn't rescan or rebuild what depends on them.
+
+A GeneratorManifest records the hashes of the inputs of a code generator
+and the outputs it produced. When none of the inputs changed and the
+outputs are untouched, the generator can be skipped altogether.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+
+def write_if_changed(path, data):
+    """Write data (a str or bytes) to the file at path, unless the file
+    already has this content. The file is replaced atomically. Returns
+    whether the file was written."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+class GeneratedFile(io.StringIO):
+    """A text file opened for writing whose content is only written to disk,
+    with write_if_changed(), when it is closed."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.name = path
+
+    def close(self):
+        if not self.closed:
+            write_if_changed(self.name, self.getvalue())
+        super().close()
+
+
+def hash_file(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class GeneratorManifest(object):
+    """Records the inputs and outputs of a code generator run.
+
+    The manifest is a JSON file holding the hash of every input file, the
+    size and modification time of every output file, a key describing the
+    generator options, and arbitrary data the generator needs when it is
+    skipped (e.g., the list of files it generates).
+    """
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self.key = key
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self):
+        """Return the data recorded with the last run if its inputs and
+        outputs are unchanged, or None if the generator must run."""
+        manifest = self._load()
+        if manifest is None or manifest.get("key") != self.key:
+            return None
+
+        for path, (size, mtime) in manifest["outputs"].items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            if st.st_size != size or st.st_mtime_ns != mtime:
+                return None
+
+        for path, digest in manifest["inputs"].items():
+            try:
+                if hash_file(path) != digest:
+                    return None
+            except OSError:
+                return None
+
+        return manifest["data"]
+
+    def record(self, inputs, outputs, data=None):
+        """Record a generator run, with the paths of the files it read and
+        wrote and the data to return from lookup()."""
+        manifest = {
+            "key": self.key,
+            "inputs": {
+                os.path.abspath(p): hash_file(p) for p in sorted(set(inputs))
+            },
+            "outputs": {},
+            "data": data,
+        }
+        for path in sorted(set(outputs)):
+            st = os.stat(path)
+            manifest["outputs"][os.path.abspath(path)] = [
+                st.st_size,
+                st.st_mtime_ns,
+            ]
+        write_if_changed(self.path, json.dumps(manifest, indent=1))
+
+    def invalidate(self):
+        """Forget the last run, e.g., when the generator failed."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -24,7 +24,13 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import contextlib
+import hashlib
+import importlib.util
+import inspect
 import os
+import shutil
+import tempfile
 
 import ply.lex
 import ply.yacc
@@ -37,6 +43,12 @@ class ParseError(Exception):
 
 
 class Grammar(object):
+    # Directory in which the generated lexer and parser tables are cached.
+    # The tables are named after a hash of the source of the grammar, so
+    # they are only generated again when the grammar changes. If None, the
+    # PLY defaults are used.
+    table_dir = None
+
     def setupLexerFactory(self, **kwargs):
         if "module" in kwargs:
             raise AttributeError("module is an illegal attribute")
@@ -69,11 +81,41 @@ class Grammar(object):
             return self.yacc_kwargs
 
         if attr == "lex":
-            self.lex = ply.lex.lex(module=self, **self.lex_kwargs)
+            if self.table_dir is None:
+                self.lex = ply.lex.lex(module=self, **self.lex_kwargs)
+            else:
+                name = self.table_name("lextab")
+                table = self.load_table(name)
+                kwargs = dict(self.lex_kwargs)
+                with self.table_output(name, table) as outputdir:
+                    kwargs.setdefault("outputdir", outputdir)
+                    # With optimize set, PLY skips validating the grammar and
+                    # reads the tables if they exist, or writes them
+                    # otherwise.
+                    self.lex = ply.lex.lex(
+                        module=self,
+                        optimize=True,
+                        lextab=table or name,
+                        **kwargs,
+                    )
             return self.lex
 
         if attr == "yacc":
-            self.yacc = ply.yacc.yacc(module=self, **self.yacc_kwargs)
+            if self.table_dir is None:
+                self.yacc = ply.yacc.yacc(module=self, **self.yacc_kwargs)
+            else:
+                name = self.table_name("parsetab")
+                table = self.load_table(name)
+                kwargs = dict(self.yacc_kwargs)
+                kwargs.setdefault("debug", False)
+                with self.table_output(name, table) as outputdir:
+                    kwargs.setdefault("outputdir", outputdir)
+                    self.yacc = ply.yacc.yacc(
+                        module=self,
+                        optimize=table is not None,
+                        tabmodule=table or name,
+                        **kwargs,
+                    )
             return self.yacc
 
         if attr == "current_lexer":
@@ -95,6 +137,57 @@ class Grammar(object):
             "'%s' object has no attribute '%s'" % (type(self), attr)
         )
 
+    def table_name(self, kind):
+        """The name of the cached table of the given kind ("lextab" or
+        "parsetab"), which identifies the grammar by a hash of the source
+        files of its classes and of its options."""
+        h = hashlib.sha1(ply.yacc.__version__.encode())
+        for cls in type(self).__mro__:
+            if cls is object:
+                continue
+            with open(inspect.getsourcefile(cls), "rb") as f:
+                h.update(f.read())
+        h.update(repr(sorted(self.lex_kwargs.items())).encode())
+        h.update(repr(sorted(self.yacc_kwargs.items())).encode())
+        return f"{kind}_{type(self).__name__}_{h.hexdigest()[:16]}"
+
+    def load_table(self, name):
+        """Load a table module from table_dir, or return None."""
+        path = os.path.join(self.table_dir, f"{name}.py")
+        if not os.path.isfile(path):
+            return None
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            # e.g., a table written by an incompatible version of PLY
+            return None
+        return module
+
+    @contextlib.contextmanager
+    def table_output(self, name, table):
+        """The directory PLY writes the table called name to, if it wasn't
+        loaded. This is a new directory in table_dir, and the files written
+        to it are then renamed into table_dir, so that builds running at the
+        same time never load a partially written table."""
+        os.makedirs(self.table_dir, exist_ok=True)
+        if table is not None:
+            # PLY doesn't write a table it has loaded
+            yield self.table_dir
+            return
+
+        tmp_dir = tempfile.mkdtemp(prefix=f".{name}.", dir=self.table_dir)
+        try:
+            yield tmp_dir
+            for file_name in os.listdir(tmp_dir):
+                os.replace(
+                    os.path.join(tmp_dir, file_name),
+                    os.path.join(self.table_dir, file_name),
+                )
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
     def parse_string(self, data, source="<string>", debug=None, tracking=0):
         if not isinstance(data, str):
             raise AttributeError(
@@ -63,8 +63,18 @@ from code_formatter import code_formatter
 # byte code, compress it, and then generate a c++ file that
 # inserts the result into an array.
 
-if len(sys.argv) < 4:
-    print(f"Usage: {sys.argv[0]} CPP PY MODPATH ABSPATH", file=sys.stderr)
+args = sys.argv[1:]
+# Store the code uncompressed so that it can be unmarshalled without copying
+# it out of the gem5 binary.
+uncompressed = "--uncompressed" in args
+if uncompressed:
+    args.remove("--uncompressed")
+
+if len(args) != 4:
+    print(
+        f"Usage: {sys.argv[0]} [--uncompressed] CPP PY MODPATH ABSPATH",
+        file=sys.stderr,
+    )
     sys.exit(1)
 
 # Set the Python's locale settings manually based on the `LC_CTYPE`
@@ -72,7 +82,7 @@ if len(sys.argv) < 4:
 if "LC_CTYPE" in os.environ:
     locale.setlocale(locale.LC_CTYPE, os.environ["LC_CTYPE"])
 
-_, cpp, python, modpath, abspath = sys.argv
+cpp, python, modpath, abspath = args
 
 with open(python, "r") as f:
     src = f.read()
@@ -80,7 +90,13 @@ with open(python, "r") as f:
 compiled = compile(src, python, "exec")
 marshalled = marshal.dumps(compiled)
 
-compressed = zlib.compress(marshalled)
+# A compressed size of 0 tells gem5 that the code isn't compressed.
+if uncompressed:
+    data = marshalled
+    zlen = 0
+else:
+    data = zlib.compress(marshalled)
+    zlen = len(data)
 
 code = code_formatter()
 code(
@@ -95,7 +111,7 @@ namespace
 """
 )
 
-bytesToCppArray(code, "embedded_module_data", compressed)
+bytesToCppArray(code, "embedded_module_data", data)
 
 # The name of the EmbeddedPython object doesn't matter since it's in an
 # anonymous namespace, and it's constructor takes care of installing it into a
@@ -106,7 +122,7 @@ EmbeddedPython embedded_module_info(
     "${abspath}",
     "${modpath}",
     embedded_module_data,
-    ${{len(compressed)}},
+    ${zlen},
     ${{len(marshalled)}});
 
 } // anonymous namespace
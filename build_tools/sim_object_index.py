@@ -0,0 +1,250 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Generate an index of the names exported by the m5.objects modules.
+
+`from m5.objects import *` used to import every SimObject module when the
+m5.objects package was first imported. With this index, m5.objects can
+instead import a module only once one of the names it exports is used.
+
+The index is built from the source of the modules, without running them.
+Each name a SimObject module exports is mapped to the module it really
+comes from. Names defined by a class or function definition or an
+assignment come from the module itself. Names imported from elsewhere, e.g.,
+`from m5.params import *` or `from m5.SimObject import SimObject`, are
+followed to the module which defines them, through the library modules
+given with --lib-modules when their source is available. A name exported
+with different origins by more than one module is recorded as ambiguous
+since which one wins depends on the order the modules are loaded in.
+m5.objects falls back to loading every module for names which aren't in the
+index or which are ambiguous.
+"""
+
+import argparse
+import ast
+
+from code_formatter import code_formatter
+
+# The package the SimObject modules are imported into. Names imported from
+# it are left to the module which defines them.
+_OBJECTS_PACKAGE = "m5.objects"
+
+
+def _targets(node):
+    if isinstance(node, ast.Name):
+        yield node.id
+    elif isinstance(node, (ast.Tuple, ast.List)):
+        for elt in node.elts:
+            yield from _targets(elt)
+    elif isinstance(node, ast.Starred):
+        yield from _targets(node.value)
+
+
+class _Module:
+    """The names bound at the top level of a python module."""
+
+    def __init__(self, modpath, path):
+        self.modpath = modpath
+        self.is_package = path.endswith("__init__.py")
+        with open(path, "r") as f:
+            tree = ast.parse(f.read(), path)
+        self.all = None
+        # The top level bindings, in order, as (name, (module, attribute)),
+        # where module is None for names bound by the module itself, or as
+        # ("*", module) for star imports.
+        self.bindings = list(self._bindings(tree.body))
+
+    def _from_module(self, node):
+        if not node.level:
+            return node.module
+        parts = self.modpath.split(".")
+        if not self.is_package:
+            parts = parts[:-1]
+        parts = parts[: len(parts) - (node.level - 1)]
+        if node.module:
+            parts.append(node.module)
+        return ".".join(parts)
+
+    def _bindings(self, body):
+        for stmt in body:
+            if isinstance(
+                stmt, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                yield stmt.name, (None, None)
+            elif isinstance(stmt, ast.Assign):
+                for target in stmt.targets:
+                    if isinstance(target, ast.Name) and target.id == "__all__":
+                        self._set_all(stmt.value)
+                    for name in _targets(target):
+                        yield name, (None, None)
+            elif isinstance(stmt, (ast.AnnAssign, ast.AugAssign)):
+                for name in _targets(stmt.target):
+                    yield name, (None, None)
+            elif isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    name = alias.asname or alias.name.partition(".")[0]
+                    yield name, (None, None)
+            elif isinstance(stmt, ast.ImportFrom):
+                module = self._from_module(stmt)
+                for alias in stmt.names:
+                    if alias.name == "*":
+                        yield "*", module
+                    else:
+                        yield alias.asname or alias.name, (module, alias.name)
+            elif isinstance(stmt, (ast.If, ast.For, ast.While)):
+                yield from self._bindings(stmt.body)
+                yield from self._bindings(stmt.orelse)
+            elif isinstance(stmt, ast.With):
+                yield from self._bindings(stmt.body)
+            elif isinstance(stmt, ast.Try):
+                yield from self._bindings(stmt.body)
+                for handler in stmt.handlers:
+                    yield from self._bindings(handler.body)
+                yield from self._bindings(stmt.orelse)
+                yield from self._bindings(stmt.finalbody)
+
+    def _set_all(self, value):
+        if isinstance(value, (ast.List, ast.Tuple)) and all(
+            isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+            for elt in value.elts
+        ):
+            self.all = [elt.value for elt in value.elts]
+
+
+class _Index:
+    """Follows the names exported by modules to where they come from."""
+
+    def __init__(self, modules):
+        self._modules = {module.modpath: module for module in modules}
+        self._origins = {}
+        self._resolving = set()
+
+    def origins(self, modpath):
+        """
+        Map the names bound at the top level of a module to the module they
+        can be taken from, or to None if that isn't known.
+        """
+
+        if modpath in self._origins:
+            return self._origins[modpath]
+        module = self._modules[modpath]
+        self._resolving.add(modpath)
+        origins = {}
+        for name, source in module.bindings:
+            if name == "*":
+                if source in self._modules and source not in self._resolving:
+                    for exported in self.exports(source):
+                        origins[exported] = self.origin(source, exported)
+                # The names of other star imports aren't known, but they
+                # can only be found by running the module.
+                continue
+            from_module, attribute = source
+            if from_module is None:
+                origins[name] = modpath
+            elif from_module == _OBJECTS_PACKAGE:
+                origins[name] = None
+            elif attribute != name:
+                origins[name] = modpath
+            elif (
+                from_module in self._modules
+                and from_module not in self._resolving
+            ):
+                origins[name] = self.origin(from_module, name)
+            else:
+                origins[name] = from_module
+        self._resolving.discard(modpath)
+        self._origins[modpath] = origins
+        return origins
+
+    def origin(self, modpath, name):
+        """The module a name exported by a module can be taken from."""
+
+        # Names listed in __all__ but bound in ways the index can't follow
+        # can still be taken from the module itself.
+        return self.origins(modpath).get(name, modpath)
+
+    def exports(self, modpath):
+        """The names `from <modpath> import *` imports."""
+
+        module = self._modules[modpath]
+        if module.all is not None:
+            return module.all
+        return [name for name in self.origins(modpath) if name[0] != "_"]
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("index_py", help="index file to generate")
+parser.add_argument("--modules", nargs="*", default=[], help="module paths")
+parser.add_argument(
+    "--files", nargs="*", default=[], help="python file of each module"
+)
+parser.add_argument(
+    "--lib-modules",
+    nargs="*",
+    default=[],
+    help="paths of modules the SimObject modules import names from",
+)
+parser.add_argument(
+    "--lib-files", nargs="*", default=[], help="python file of each library"
+)
+
+args = parser.parse_args()
+
+if len(args.modules) != len(args.files):
+    parser.error("each module needs exactly one python file")
+if len(args.lib_modules) != len(args.lib_files):
+    parser.error("each library module needs exactly one python file")
+
+index = _Index(
+    _Module(modpath, path)
+    for modpath, path in zip(
+        args.modules + args.lib_modules, args.files + args.lib_files
+    )
+)
+
+names = {}
+for modpath in args.modules:
+    for name in index.exports(modpath):
+        origin = index.origin(modpath, name)
+        if origin is None:
+            continue
+        if names.setdefault(name, origin) != origin:
+            names[name] = None
+
+code = code_formatter()
+code(
+    """\
+# Maps the names exported by the m5.objects modules to the module they come
+# from, or to None if they come from more than one.
+
+names = {"""
+)
+code.indent()
+for name in sorted(names):
+    code("${{repr(name)}}: ${{repr(names[name])}},")
+code.dedent()
+code("}")
+code.write(args.index_py)
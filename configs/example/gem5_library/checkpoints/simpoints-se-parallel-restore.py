@@ -0,0 +1,95 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+This configuration script shows how to restore all the SimPoint checkpoints
+taken by configs/example/gem5_library/checkpoints/simpoints-se-checkpoint.py
+in parallel, each in its own gem5 process, and weight their stats. The board
+is built by `restore_board` in simpoints_se_restore_board.py.
+
+The stats of every SimPoint and their weighted sum are written to
+m5out/regions.json, and the output of each SimPoint is in m5out/region<index>.
+
+Usage
+-----
+
+```
+scons build/X86/gem5.opt
+./build/X86/gem5.opt \
+    configs/example/gem5_library/checkpoints/simpoints-se-checkpoint.py
+
+./build/X86/gem5.opt \
+    configs/example/gem5_library/checkpoints/simpoints-se-parallel-restore.py \
+    --checkpoint-path se_checkpoint_folder/ -j 4
+```
+"""
+
+import argparse
+from pathlib import Path
+
+from gem5.isas import ISA
+from gem5.simulate.region_executor import RegionExecutor, simpoint_regions
+from gem5.utils.requires import requires
+
+from simpoints_se_restore_board import restore_board, simpoint
+
+requires(isa_required=ISA.X86)
+
+parser = argparse.ArgumentParser(
+    description="Restore SimPoint checkpoints in parallel."
+)
+parser.add_argument(
+    "--checkpoint-path",
+    type=str,
+    required=False,
+    default="se_checkpoint_folder/",
+    help="The directory the checkpoints are stored in.",
+)
+parser.add_argument(
+    "-j",
+    "--processes",
+    type=int,
+    required=False,
+    default=None,
+    help="The number of SimPoints to restore at the same time.",
+)
+
+# The spawned processes import this script again, which must only run the
+# SimPoints in the parent.
+if __name__ == "__m5_main__" or __name__ == "__main__":
+    args = parser.parse_args()
+
+    executor = RegionExecutor(
+        board_builder=restore_board,
+        regions=simpoint_regions(simpoint, Path(args.checkpoint_path)),
+        processes=args.processes,
+    )
+    executor.run(
+        on_result=lambda result: print(
+            f"SimPoint {result.region.region_id} done."
+        )
+    )
+    print(f"{len(executor.get_results())} SimPoints restored.")
@@ -0,0 +1,72 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+The board used by simpoints-se-parallel-restore.py to restore the checkpoints
+taken by simpoints-se-checkpoint.py. The function building the board is in a
+module of its own so that the processes restoring the checkpoints can import
+it.
+"""
+
+from gem5.components.boards.simple_board import SimpleBoard
+from gem5.components.cachehierarchies.classic.private_l1_private_l2_cache_hierarchy import (
+    PrivateL1PrivateL2CacheHierarchy,
+)
+from gem5.components.memory import DualChannelDDR4_2400
+from gem5.components.processors.cpu_types import CPUTypes
+from gem5.components.processors.simple_processor import SimpleProcessor
+from gem5.isas import ISA
+from gem5.resources.resource import SimpointResource, obtain_resource
+from gem5.simulate.region_executor import SampledRegion
+
+# The SimPoints of simpoints-se-checkpoint.py
+simpoint = SimpointResource(
+    simpoint_interval=1000000,
+    simpoint_list=[2, 3, 4, 15],
+    weight_list=[0.1, 0.2, 0.4, 0.3],
+    warmup_interval=1000000,
+)
+
+
+def restore_board(region: SampledRegion) -> SimpleBoard:
+    board = SimpleBoard(
+        clk_freq="3GHz",
+        processor=SimpleProcessor(
+            cpu_type=CPUTypes.TIMING, isa=ISA.X86, num_cores=1
+        ),
+        # The memory size must be the one the checkpoints were taken with
+        memory=DualChannelDDR4_2400(size="2GB"),
+        cache_hierarchy=PrivateL1PrivateL2CacheHierarchy(
+            l1d_size="32kB", l1i_size="32kB", l2_size="256kB"
+        ),
+    )
+    board.set_se_simpoint_workload(
+        binary=obtain_resource("x86-print-this"),
+        arguments=["print this", 15000],
+        simpoint=simpoint,
+        checkpoint=region.checkpoint,
+    )
+    return board
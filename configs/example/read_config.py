@@ -57,8 +57,8 @@ import m5.ticks as ticks
 
 sim_object_classes_by_name = {
     cls.__name__: cls
-    for cls in list(m5.objects.__dict__.values())
-    if inspect.isclass(cls) and issubclass(cls, m5.objects.SimObject)
+    for _, cls in inspect.getmembers(m5.objects, inspect.isclass)
+    if issubclass(cls, m5.objects.SimObject)
 }
 
 # Add some parsing functions to Param classes to handle reading in .ini
@@ -317,6 +317,7 @@ def define_constants(constants):
     constants.gem5_binary_fixture_name = 'gem5'
     constants.xml_filename = 'results.xml'
     constants.pickle_filename = 'results.pickle'
+    constants.history_filename = 'history.sqlite'
     constants.pickle_protocol = highest_pickle_protocol
 
     # The root directory which all test names will be based off of.
@@ -346,6 +347,28 @@ def define_post_processors(config):
             build_dir = (os.path.join(base_dir, 'build'),)
         return build_dir
 
+    def set_default_history_path(history_path):
+        '''
+        Post-processor to keep the run history with the results by default.
+        '''
+        if not history_path or history_path[0] is None:
+            result_path = config._lookup_val('result_path')[0]
+            history_path = (os.path.join(result_path,
+                                         constants.history_filename),)
+        return history_path
+
+    def parse_shard(shard):
+        if shard is None or shard[0] is None:
+            return shard
+        try:
+            index, count = (int(n) for n in shard[0].split('/'))
+        except ValueError:
+            raise ValueError('--shard expects i/N, got %s' % shard[0])
+        if not 1 <= index <= count:
+            raise ValueError('--shard %s: i must be between 1 and N'
+                             % shard[0])
+        return ((index, count),)
+
     def fix_verbosity_hack(verbose):
         return (verbose[0].val,)
 
@@ -357,6 +380,10 @@ def define_post_processors(config):
         if test_threads is not None:
             return (int(test_threads[0]),)
 
+    def test_processes_as_int(test_processes):
+        if test_processes is not None:
+            return (int(test_processes[0]),)
+
     def default_isa(isa):
         if not isa[0]:
             return [constants.supported_tags[constants.isa_tag_type]]
@@ -409,6 +436,8 @@ def define_post_processors(config):
             return (new_positional_tags_list,)
 
     config._add_post_processor('build_dir', set_default_build_dir)
+    config._add_post_processor('history_path', set_default_history_path)
+    config._add_post_processor('shard', parse_shard)
     config._add_post_processor('verbose', fix_verbosity_hack)
     config._add_post_processor('isa', default_isa)
     config._add_post_processor('variant', default_variant)
@@ -416,6 +445,7 @@ def define_post_processors(config):
     config._add_post_processor('host', default_host)
     config._add_post_processor('threads', threads_as_int)
     config._add_post_processor('test_threads', test_threads_as_int)
+    config._add_post_processor('test_processes', test_processes_as_int)
     config._add_post_processor(StorePositionalTagsAction.position_kword,
                                compile_tag_regex)
 class Argument(object):
@@ -565,6 +595,26 @@ def define_common_args(config):
             action='store',
             default=1,
             help='Number of threads to spawn to run concurrent tests with.'),
+        Argument(
+            '-p', '--test-processes',
+            action='store',
+            default=1,
+            help='Number of processes to run concurrent test suites in.'),
+        Argument(
+            '--shard',
+            action='store',
+            default=None,
+            help='Only run shard i of N, given as i/N. The suites are split'
+                 ' into N shards of about the same expected runtime,'
+                 ' according to the run history, so every machine must use'
+                 ' the same history to get disjoint shards.'),
+        Argument(
+            '--history-path',
+            action='store',
+            help='The SQLite database recording the durations of recent'
+                 ' runs, used to start the longest suites first and to'
+                 ' balance shards. Defaults to a file in the results'
+                 ' directory.'),
         Argument(
             '-v',
             action='count',
@@ -663,6 +713,9 @@ class RunParser(ArgParser):
         common_args.bin_path.add_to(parser)
         common_args.threads.add_to(parser)
         common_args.test_threads.add_to(parser)
+        common_args.test_processes.add_to(parser)
+        common_args.shard.add_to(parser)
+        common_args.history_path.add_to(parser)
         common_args.isa.add_to(parser)
         common_args.variant.add_to(parser)
         common_args.length.add_to(parser)
@@ -739,6 +792,9 @@ class RerunParser(ArgParser):
         common_args.bin_path.add_to(parser)
         common_args.threads.add_to(parser)
         common_args.test_threads.add_to(parser)
+        common_args.test_processes.add_to(parser)
+        common_args.shard.add_to(parser)
+        common_args.history_path.add_to(parser)
         common_args.isa.add_to(parser)
         common_args.variant.add_to(parser)
         common_args.length.add_to(parser)
@@ -106,9 +106,12 @@ class ResultHandler(object):
         self.test_stream_manager = _TestStreamManager()
         self._closed = False
 
+        self._suite_start = {}
+
         self.mapping = {
             log.LibraryStatus.type_id: self.handle_library_status,
 
+            log.SuiteStatus.type_id: self.handle_suite_status,
             log.SuiteResult.type_id: self.handle_suite_result,
             log.TestResult.type_id: self.handle_test_result,
 
@@ -124,6 +127,18 @@ class ResultHandler(object):
         if record['status'] in (state.Status.Complete, state.Status.Avoided):
             self.test_stream_manager.close()
 
+    def handle_suite_status(self, record):
+        # Record how long each suite takes, so later runs can schedule the
+        # longest suites first.
+        uid = record['metadata'].uid
+        if record['status'] == state.Status.Building:
+            self._suite_start[uid] = time.time()
+        elif record['status'] in (state.Status.Complete,
+                                  state.Status.Avoided):
+            if uid in self._suite_start:
+                self.internal_results.get_suite_result(uid).duration = \
+                        time.time() - self._suite_start.pop(uid)
+
     def handle_suite_result(self, record):
         suite_result = self.internal_results.get_suite_result(
                     record['metadata'].uid)
@@ -343,6 +358,7 @@ class MultiprocessingHandlerWrapper(object):
         self.queue = multiprocessing.Queue()
         self.queue.cancel_join_thread()
         self._shutdown = threading.Event()
+        self._flushed = {}
 
         # subhandlers should be accessed with the _handler_lock
         self._handler_lock = threading.Lock()
@@ -399,11 +415,36 @@ class MultiprocessingHandlerWrapper(object):
                 return
 
     def _handle(self, record):
+        if isinstance(record, _FlushMarker):
+            self._flushed[record.token].set()
+            return
         self._with_handlers(lambda handler: handler.handle(record))
 
     def handle(self, record):
         self.queue.put(record)
 
+    def flush(self):
+        '''
+        Wait until the records sent so far, by this and other processes,
+        have been forwarded to the subhandlers.
+        '''
+        if not hasattr(self, 'thread') or not self.thread.is_alive():
+            self._drain()
+            return
+        event = threading.Event()
+        self._flushed[id(event)] = event
+        self.queue.put(_FlushMarker(id(event)))
+        event.wait()
+        del self._flushed[id(event)]
+
+    def close_sender(self):
+        '''
+        Called by a child process once it's done logging, to wait until
+        the records it logged have been sent to the parent.
+        '''
+        self.queue.close()
+        self.queue.join_thread()
+
     def _close(self):
         if hasattr(self, 'thread'):
             self.thread.join()
@@ -425,6 +466,15 @@ class MultiprocessingHandlerWrapper(object):
             self._close()
 
 
+class _FlushMarker(object):
+    '''
+    Put on the queue of a :class:`MultiprocessingHandlerWrapper` to find
+    out when the records before it have been handled.
+    '''
+    def __init__(self, token):
+        self.token = token
+
+
 def _wrap(callback, *args, **kwargs):
     try:
         callback(*args, **kwargs)
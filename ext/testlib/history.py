@@ -0,0 +1,102 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+A persistent store of how long test items took on recent runs, used to
+schedule and shard the items by their expected runtime.
+'''
+import os
+import sqlite3
+import statistics
+import time
+
+class RunHistory(object):
+    '''
+    Durations of the recent runs of each test item, keyed by the item's
+    uid, in an SQLite database.
+    '''
+    # The number of recent runs kept for each item.
+    max_runs = 5
+
+    def __init__(self, path):
+        '''
+        :param path: Path of the database. It's created if it doesn't exist.
+        '''
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS durations ('
+                ' uid TEXT NOT NULL,'
+                ' finished REAL NOT NULL,'
+                ' duration REAL NOT NULL)')
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS durations_uid'
+                ' ON durations (uid, finished)')
+
+    def record(self, durations):
+        '''
+        Add the durations of a run, dropping the oldest ones of the items
+        which have more than :attr:`max_runs` durations.
+
+        :param durations: A map from uid (as a str) to a duration in
+            seconds.
+        '''
+        finished = time.time()
+        with self._db:
+            self._db.executemany(
+                'INSERT INTO durations VALUES (?, ?, ?)',
+                ((uid, finished, duration)
+                 for uid, duration in durations.items()))
+            self._db.executemany(
+                'DELETE FROM durations WHERE uid = ? AND finished NOT IN'
+                ' (SELECT finished FROM durations WHERE uid = ?'
+                '  ORDER BY finished DESC LIMIT ?)',
+                ((uid, uid, self.max_runs) for uid in durations))
+
+    def expected_durations(self):
+        '''
+        :returns: A map from uid (as a str) to the expected duration of the
+            item, the median of its recent durations.
+        '''
+        runs = {}
+        for uid, duration in self._db.execute(
+                'SELECT uid, duration FROM durations'):
+            runs.setdefault(uid, []).append(duration)
+        return {uid: statistics.median(durations)
+                for uid, durations in runs.items()}
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
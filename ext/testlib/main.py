@@ -31,6 +31,7 @@ import itertools
 
 import testlib.configuration as configuration
 import testlib.handlers as handlers
+import testlib.history as history_mod
 import testlib.loader as loader_mod
 import testlib.log as log
 import testlib.query as query
@@ -65,8 +66,16 @@ class RunLogHandler():
         self.mp_handler.add_handler(self.result_handler)
 
     def finish_testing(self):
+        # Records from test processes may still be queued.
+        self.mp_handler.flush()
         self.result_handler.close()
 
+    def durations(self):
+        '''
+        :returns: How long each suite that ran took, by suite uid.
+        '''
+        return result.suite_durations(self.result_handler.internal_results)
+
     def __enter__(self):
         return self
 
@@ -255,6 +264,22 @@ def run_schedule(test_schedule, log_handler):
     * Global Fixture Teardown
     '''
 
+    history = history_mod.RunHistory(configuration.config.history_path)
+    durations = history.expected_durations()
+
+    if configuration.config.shard is not None:
+        index, count = configuration.config.shard
+        test_schedule.suites = runner.shard(test_schedule.suites, durations,
+                index, count)
+        log.test_log.message('Running shard {} of {}'.format(index, count))
+
+    parallel = (configuration.config.test_processes > 1
+                or configuration.config.test_threads > 1)
+    if parallel:
+        # Start the suites expected to take the longest first
+        test_schedule.suites = runner.longest_first(test_schedule.suites,
+                durations)
+
     log_handler.schedule_finalized(test_schedule)
 
     log.test_log.message(terminal.separator())
@@ -265,7 +290,10 @@ def run_schedule(test_schedule, log_handler):
     log.test_log.message(terminal.separator())
 
     # Build global fixtures and exectute scheduled test suites.
-    if configuration.config.test_threads > 1:
+    if configuration.config.test_processes > 1:
+        library_runner = runner.LibraryProcessRunner(test_schedule)
+        library_runner.set_processes(configuration.config.test_processes)
+    elif configuration.config.test_threads > 1:
         library_runner = runner.LibraryParallelRunner(test_schedule)
         library_runner.set_threads(configuration.config.test_threads)
     else:
@@ -276,6 +304,9 @@ def run_schedule(test_schedule, log_handler):
 
     log_handler.finish_testing()
 
+    history.record(log_handler.durations())
+    history.close()
+
     return 1 if failed else 0
 
 def do_run():
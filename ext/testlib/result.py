@@ -96,6 +96,8 @@ class InternalSuiteResult(_CommonMetadataMixin):
     def __init__(self, obj, directory):
         self._metadata = obj.metadata
         self.directory = directory
+        # Wall clock time the suite took to run, in seconds, if it ran.
+        self.duration = None
         self._wrap_tests(obj)
 
     def _wrap_tests(self, obj):
@@ -151,6 +153,20 @@ class InternalLibraryResults(_CommonMetadataMixin):
                 helper.append_dictlist(results, test.result.value, test)
         return results
 
+def suite_durations(results):
+    '''
+    :returns: A map from the uid (as a str) of each suite of the given
+        :class:`InternalLibraryResults` to how long it took to run, for the
+        suites which ran.
+    '''
+    durations = {}
+    for suite in results:
+        # Results saved by older versions don't have durations
+        duration = getattr(suite, 'duration', None)
+        if duration is not None:
+            durations[str(suite.uid)] = duration
+    return durations
+
 class InternalSavedResults:
     @staticmethod
     def output_path(test_uid, suite_uid, base=None):
@@ -38,6 +38,7 @@
 #
 # Authors: Sean Wilson
 
+import multiprocessing
 import multiprocessing.dummy
 import traceback
 
@@ -175,11 +176,131 @@ class LibraryParallelRunner(RunnerPattern):
 
     def test(self):
         pool = multiprocessing.dummy.Pool(self.threads)
-        pool.map(lambda suite : suite.runner(suite).run(), self.testable)
+        # Hand the suites out one at a time, in order, so that the longest
+        # ones, when scheduled first, start first.
+        pool.map(lambda suite : suite.runner(suite).run(), self.testable,
+                 chunksize=1)
         self.testable.result = compute_aggregate_result(
                 iter(self.testable))
 
 
+# How long an item is expected to take when nothing longer than zero has
+# been recorded, e.g., on the first run with a new history.
+_DEFAULT_DURATION = 1.0
+
+def _expected_duration(durations):
+    # Items without a recorded duration are expected to be as long as the
+    # longest recorded one.
+    default = max(durations.values(), default=0) or _DEFAULT_DURATION
+    return lambda item: durations.get(str(item.uid), default)
+
+def longest_first(items, durations):
+    '''
+    Order items so those expected to take the longest come first, which
+    keeps all the workers of a pool busy until the end.
+
+    :param durations: A map from the uid of an item (as a str) to how long
+        it is expected to take. Items without a duration are expected to be
+        as long as the longest one.
+    '''
+    return sorted(items, key=_expected_duration(durations), reverse=True)
+
+def shard(items, durations, index, count):
+    '''
+    Split items into count shards of about the same expected runtime, and
+    return the items of one of them, in their original order.
+
+    The items are handed out longest first, each to the shard with the
+    least expected runtime so far, or the fewest items if the runtimes are
+    the same (e.g., all recorded as zero). Items are ordered by uid when
+    their expected runtimes are the same, so all the machines given the
+    same items and durations agree on the shards.
+
+    :param durations: See :func:`longest_first`.
+    :param index: The shard to return, from 1 to count.
+    '''
+    if not 1 <= index <= count:
+        raise ValueError('Shard %d is not between 1 and %d' % (index, count))
+
+    expected = _expected_duration(durations)
+    loads = [0.0] * count
+    sizes = [0] * count
+    selected = set()
+    for item in sorted(items, key=lambda item: (-expected(item),
+                                                str(item.uid))):
+        shard_index = min(range(count),
+                          key=lambda i: (loads[i], sizes[i], i))
+        loads[shard_index] += expected(item)
+        sizes[shard_index] += 1
+        if shard_index == index - 1:
+            selected.add(id(item))
+    return [item for item in items if id(item) in selected]
+
+
+# The library run by the worker processes of a LibraryProcessRunner,
+# inherited from the parent when they are forked.
+_process_runner_suites = None
+
+def _run_suite_in_process(index):
+    import testlib.handlers as handlers
+
+    suite = _process_runner_suites[index]
+    suite.runner(suite).run()
+
+    # Make sure the records logged while running the suite reached the
+    # parent before it gets the outcome.
+    for handler in log.test_log.handlers:
+        if isinstance(handler, handlers.MultiprocessingHandlerWrapper):
+            handler.close_sender()
+
+    return index, (suite.metadata,
+                   [test.metadata for test in suite])
+
+
+class LibraryProcessRunner(RunnerPattern):
+    '''
+    Runs the suites of the library in a pool of processes, each suite in a
+    newly forked process so one can't affect the next. The suites are
+    started in the order of the library, see :func:`longest_first`.
+
+    Suites, rather than tests, are the unit of scheduling as the tests of
+    a suite depend on each other through the suite fixtures (e.g., the
+    verifiers check the output of the test that ran gem5).
+
+    The records the workers log are streamed back to the handlers of the
+    parent as usual, through the :class:`MultiprocessingHandlerWrapper`.
+    '''
+    def set_processes(self, processes):
+        self.processes = processes
+
+    def test(self):
+        global _process_runner_suites
+
+        suites = list(self.testable)
+        _process_runner_suites = suites
+        try:
+            context = multiprocessing.get_context('fork')
+            with context.Pool(self.processes, maxtasksperchild=1) as pool:
+                for i, outcome in pool.imap_unordered(
+                        _run_suite_in_process, range(len(suites))):
+                    self._apply_outcome(suites[i], *outcome)
+        finally:
+            _process_runner_suites = None
+
+        self.testable.result = compute_aggregate_result(
+                iter(self.testable))
+
+    def _apply_outcome(self, suite, suite_metadata, tests_metadata):
+        # The handlers already got the records of the updates, so the
+        # outcome is copied without logging it again.
+        for testable, metadata in zip([suite] + list(suite),
+                                      [suite_metadata] + tests_metadata):
+            testable.metadata.status = metadata.status
+            testable.metadata.result = metadata.result
+            if hasattr(metadata, 'time'):
+                testable.metadata.time = metadata.time
+
+
 class BrokenFixtureException(Exception):
     def __init__(self, fixture, testitem, trace):
         self.trace = trace
@@ -37,14 +37,22 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
 import os
+import pickle
 import re
 import sys
+import time
 import traceback
 
 # get type names
 from types import *
 
+from generated_files import (
+    GeneratedFile,
+    GeneratorManifest,
+    write_if_changed,
+)
 from grammar import Grammar
 from .operand_list import *
 from .operand_types import *
@@ -512,11 +520,18 @@ class InstObjParams(object):
 
 
 class ISAParser(Grammar):
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, table_dir=None):
         super().__init__()
         self.lex_kwargs["reflags"] = int(re.MULTILINE)
         self.output_dir = output_dir
 
+        # Where the lexer and parser tables and the split '##include' files
+        # are cached across runs, if anywhere.
+        self.table_dir = table_dir
+        self.include_cache = {}
+        self.include_cache_file = None
+        self.include_cache_dirty = False
+
         self.filename = None  # for output file watermarking/scaremongering
 
         # variable to hold templates
@@ -537,6 +552,14 @@ class ISAParser(Grammar):
         self.files = {}
         self.splits = {}
 
+        # The files read and written, recorded in the manifest which lets
+        # the next run skip parsing if none of the inputs changed.
+        self.input_files = []
+        self.output_files = []
+
+        # How long each phase of the last parse took, in seconds.
+        self.phase_times = {}
+
         # isa_name / namespace identifier from namespace declaration.
         # before the namespace declaration, None.
         self.isa_name = None
@@ -929,6 +952,8 @@ class ISAParser(Grammar):
     def p_specification(self, t):
         "specification : opt_defs_and_outputs top_level_decode_block"
 
+        start = time.perf_counter()
+
         for f in self.splits.keys():
             f.write("\n#endif\n")
 
@@ -937,6 +962,8 @@ class ISAParser(Grammar):
 
         self.write_top_level_files()
 
+        self.phase_times["write"] = time.perf_counter() - start
+
         t[0] = True
 
     # 'opt_defs_and_outputs' is a possibly empty sequence of def and/or
@@ -1597,17 +1624,18 @@ StaticInstPtr
             return s
 
     def open(self, name, bare=False):
-        """Open the output file for writing and include scary warning."""
+        """Open the output file for writing and include scary warning.
+        The file is only written when closed, and only if its contents
+        changed, so that unchanged outputs keep their modification time."""
         filename = os.path.join(self.output_dir, name)
-        f = open(filename, "w")
-        if f:
-            if not bare:
-                f.write(ISAParser.scaremonger_template % self)
+        f = GeneratedFile(filename)
+        self.output_files.append(filename)
+        if not bare:
+            f.write(ISAParser.scaremonger_template % self)
         return f
 
     def update(self, file, contents):
-        """Update the output file only.  Scons should handle the case when
-        the new contents are unchanged using its built-in hash feature."""
+        """Update the output file only, if its contents changed."""
         f = self.open(file)
         f.write(contents)
         f.close()
@@ -1617,45 +1645,109 @@ StaticInstPtr
         r'^\s*##include\s+"(?P<filename>[^"]*)".*$', re.MULTILINE
     )
 
-    def replace_include(self, matchobj, dirname):
-        """Function to replace a matched '##include' directive with the
-        contents of the specified file (with nested ##includes
-        replaced recursively).  'matchobj' is an re match object
-        (from a match of includeRE) and 'dirname' is the directory
-        relative to which the file path should be resolved."""
+    def flatten_include(self, full_fname):
+        """Return the contents of the file 'full_fname', with nested
+        ##includes replaced recursively, wrapped so line numbers are
+        tracked relative to that file."""
 
-        fname = matchobj.group("filename")
-        full_fname = os.path.normpath(os.path.join(dirname, fname))
-        contents = '##newfile "%s"\n%s\n##endfile\n' % (
+        return '##newfile "%s"\n%s\n##endfile\n' % (
             full_fname,
             self.read_and_flatten(full_fname),
         )
-        return contents
 
-    def read_and_flatten(self, filename):
-        """Read a file and recursively flatten nested '##include' files."""
+    def split_includes(self, filename):
+        """Split a file into its text and '##include' directives. Returns
+        a list of strings, for the text, and tuples holding the path of
+        the included files. The result is cached, along with the hash of
+        the file, so files are only read and split again when they
+        changed."""
+
+        try:
+            st = os.stat(filename)
+        except OSError:
+            error(f'Error including file "{filename}"')
+        signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+        cached = self.include_cache.get(filename)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
 
-        current_dir = os.path.dirname(filename)
         try:
             contents = open(filename).read()
         except IOError:
             error(f'Error including file "{filename}"')
+        digest = hashlib.sha1(contents.encode()).hexdigest()
 
-        self.fileNameStack.push(LineTracker(filename))
+        if cached is not None and cached[1] == digest:
+            parts = cached[2]
+        else:
+            current_dir = os.path.dirname(filename)
+            parts = []
+            last = 0
+            for match in self.includeRE.finditer(contents):
+                parts.append(contents[last : match.start()])
+                fname = match.group("filename")
+                parts.append(
+                    (os.path.normpath(os.path.join(current_dir, fname)),)
+                )
+                last = match.end()
+            parts.append(contents[last:])
+
+        self.include_cache[filename] = (signature, digest, parts)
+        self.include_cache_dirty = True
+        return parts
+
+    def read_and_flatten(self, filename):
+        """Read a file and recursively flatten nested '##include' files."""
 
-        # Find any includes and include them
-        def replace(matchobj):
-            return self.replace_include(matchobj, current_dir)
+        parts = self.split_includes(filename)
+        self.input_files.append(filename)
 
-        contents = self.includeRE.sub(replace, contents)
+        self.fileNameStack.push(LineTracker(filename))
+
+        # Replace the includes with the flattened included files
+        contents = "".join(
+            part if isinstance(part, str) else self.flatten_include(part[0])
+            for part in parts
+        )
 
         self.fileNameStack.pop()
         return contents
 
+    def load_include_cache(self, isa_desc_file):
+        """Load the split '##include' files cached by an earlier run
+        on the same ISA description, if any."""
+
+        self.include_cache = {}
+        self.include_cache_dirty = False
+        if self.table_dir is None:
+            return
+        key = hashlib.sha1(isa_desc_file.encode()).hexdigest()[:16]
+        self.include_cache_file = os.path.join(
+            self.table_dir, f"isa_includes_{key}.pickle"
+        )
+        try:
+            with open(self.include_cache_file, "rb") as f:
+                self.include_cache = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            pass
+
+    def save_include_cache(self):
+        if self.include_cache_file is None or not self.include_cache_dirty:
+            return
+        os.makedirs(self.table_dir, exist_ok=True)
+        write_if_changed(
+            self.include_cache_file, pickle.dumps(self.include_cache)
+        )
+
     AlreadyGenerated = {}
 
-    def _parse_isa_desc(self, isa_desc_file):
-        """Read in and parse the ISA description."""
+    def _parse_isa_desc(self, isa_desc_file, dependencies=()):
+        """Read in and parse the ISA description.
+
+        dependencies lists other files the outputs depend on (e.g., Python
+        modules imported by the description), which are checked along with
+        the description and the parser when deciding whether to skip."""
 
         # The build system can end up running the ISA parser twice: once to
         # finalize the build dependencies, and then to actually generate
@@ -1668,22 +1760,79 @@ StaticInstPtr
         if isa_desc_file in ISAParser.AlreadyGenerated:
             return
 
+        start = time.perf_counter()
+        self.phase_times = {}
+
+        # Across builds, the parser is skipped if neither the description
+        # (and the files it includes) nor the parser changed since the
+        # outputs were generated.
+        manifest = GeneratorManifest(
+            os.path.join(self.output_dir, ".isa_parser.manifest"),
+            key=isa_desc_file,
+        )
+        if manifest.lookup() is not None:
+            ISAParser.AlreadyGenerated[isa_desc_file] = None
+            self.phase_times["up to date"] = time.perf_counter() - start
+            return
+        manifest.invalidate()
+
         # grab the last three path components of isa_desc_file
         self.filename = "/".join(isa_desc_file.split("/")[-3:])
 
         # Read file and (recursively) all included files into a string.
         # PLY requires that the input be in a single string so we have to
         # do this up front.
+        self.load_include_cache(isa_desc_file)
         isa_desc = self.read_and_flatten(isa_desc_file)
+        self.save_include_cache()
+        self.phase_times["read"] = time.perf_counter() - start
 
         # Initialize lineno tracker
         self.lex.lineno = LineTracker(isa_desc_file)
 
-        # Parse.
+        # Parse. This also runs the formats and let blocks, which generate
+        # the code, and writes the output files once the parse completes.
+        parse_start = time.perf_counter()
         self.parse_string(isa_desc)
+        self.phase_times["parse"] = (
+            time.perf_counter()
+            - parse_start
+            - self.phase_times.get("write", 0)
+        )
+        manifest_start = time.perf_counter()
+
+        parser_files = [
+            sys.modules[name].__file__
+            for name in (__name__, "grammar", "generated_files")
+        ] + [
+            os.path.join(os.path.dirname(__file__), name)
+            for name in os.listdir(os.path.dirname(__file__))
+            if name.endswith(".py")
+        ]
+        manifest.record(
+            self.input_files + parser_files + list(dependencies),
+            self.output_files,
+            data=sorted(self.output_files),
+        )
+        self.phase_times["manifest"] = time.perf_counter() - manifest_start
 
         ISAParser.AlreadyGenerated[isa_desc_file] = None
 
+    def timing_report(self):
+        """Return a summary of how long each phase of the last parse
+        took."""
+
+        phases = ("up to date", "read", "parse", "write", "manifest")
+        times = [
+            (phase, self.phase_times[phase])
+            for phase in phases
+            if phase in self.phase_times
+        ]
+        times.append(("total", sum(self.phase_times.values())))
+        return "\n".join(
+            f"  {phase:<12}{seconds:8.3f}s" for phase, seconds in times
+        )
+
     def parse_isa_desc(self, *args, **kwargs):
         try:
             self._parse_isa_desc(*args, **kwargs)
@@ -1694,7 +1843,42 @@ StaticInstPtr
             sys.exit(1)
 
 
+def main(argv=None):
+    """Run the parser from the command line. The build system uses this to
+    parse each ISA description in its own process."""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate C++ code from an ISA description."
+    )
+    parser.add_argument("isa_desc", help="The main ISA description file.")
+    parser.add_argument("output_dir", help="Where to write the outputs.")
+    parser.add_argument(
+        "--table-dir",
+        default=None,
+        help="Where to cache the lexer/parser tables and included files.",
+    )
+    parser.add_argument(
+        "--dependency",
+        action="append",
+        default=[],
+        help="Another file the outputs depend on. Can be repeated.",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Print how long each phase of the parse took.",
+    )
+    args = parser.parse_args(argv)
+
+    isa_parser = ISAParser(args.output_dir, table_dir=args.table_dir)
+    isa_parser.parse_isa_desc(args.isa_desc, dependencies=args.dependency)
+    if args.timing:
+        print(f"ISA parser phases for {args.isa_desc}:")
+        print(isa_parser.timing_report())
+
+
 # Called as script: get args from command line.
-# Args are: <isa desc file> <output dir>
 if __name__ == "__main__":
-    ISAParser(sys.argv[2]).parse_isa_desc(sys.argv[1])
+    main()
@@ -91,6 +91,13 @@ def main(args=None):
         action="store_true",
         help="print traceback on error",
     )
+    parser.add_option(
+        "-j",
+        "--jobs",
+        type="int",
+        default=1,
+        help="Number of processes writing the C++ files",
+    )
     parser.add_option("-q", "--quiet", help="don't print messages")
     opts, files = parser.parse_args(args=args)
 
@@ -132,7 +139,7 @@ def main(args=None):
             slicc.writeHTMLFiles(opts.html_path)
 
         output("Writing C++ files...")
-        slicc.writeCodeFiles(opts.code_path, [])
+        slicc.writeCodeFiles(opts.code_path, [], opts.jobs)
 
     output("SLICC is Done.")
 
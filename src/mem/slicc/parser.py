@@ -58,6 +58,8 @@ class SLICC(Grammar):
         self.verbose = verbose
         self.symtab = SymbolTable(self)
         self.base_dir = base_dir
+        # The SLICC files read, so a build can tell when to generate again
+        self.input_files = []
 
         try:
             self.decl_list = self.parse_file(filename, **kwargs)
@@ -66,6 +68,11 @@ class SLICC(Grammar):
                 sys.exit(str(e))
             raise
 
+    def parse_file(self, f, **kwargs):
+        if isinstance(f, str):
+            self.input_files.append(os.path.abspath(f))
+        return super().parse_file(f, **kwargs)
+
     def currentLocation(self):
         return util.Location(
             self.current_source, self.current_line, no_warning=not self.verbose
@@ -79,8 +86,8 @@ class SLICC(Grammar):
     def process(self):
         self.decl_list.generate()
 
-    def writeCodeFiles(self, code_path, includes):
-        self.symtab.writeCodeFiles(code_path, includes)
+    def writeCodeFiles(self, code_path, includes, jobs=1):
+        self.symtab.writeCodeFiles(code_path, includes, jobs)
 
     def writeHTMLFiles(self, html_path):
         self.symtab.writeHTMLFiles(html_path)
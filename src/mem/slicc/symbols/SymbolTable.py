@@ -25,7 +25,14 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import contextlib
+import io
+import multiprocessing
 import os
+import pickle
+import sys
+import traceback
+from multiprocessing.pool import RemoteTraceback
 
 from slicc.generate import html
 from slicc.symbols.StateMachine import StateMachine
@@ -43,6 +50,35 @@ def makeDir(path):
         os.makedirs(path, exist_ok=True)
 
 
+# The symbol table the worker processes write the code of, inherited from the
+# parent when the workers are forked.
+_worker_symtab = None
+
+
+def _writeSymbolCodeFiles(args):
+    """Write the code of one symbol in a worker process. Returns what the
+    symbol printed, and the exception it raised and its traceback if any, so
+    the parent can report them in symbol order."""
+    index, path, includes = args
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exception = None
+    tb = None
+    try:
+        with contextlib.redirect_stdout(stdout):
+            with contextlib.redirect_stderr(stderr):
+                _worker_symtab.sym_vec[index].writeCodeFiles(path, includes)
+    except BaseException as e:
+        exception = e
+        tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        try:
+            pickle.loads(pickle.dumps(e))
+        except Exception:
+            # Not every exception can be pickled back to the parent
+            exception = Exception(f"{type(e).__name__}: {e}")
+    return stdout.getvalue(), stderr.getvalue(), exception, tb
+
+
 class SymbolTable(object):
     def __init__(self, slicc):
         self.slicc = slicc
@@ -133,7 +169,11 @@ class SymbolTable(object):
             if isinstance(symbol, type):
                 yield symbol
 
-    def writeCodeFiles(self, path, includes):
+    def writeCodeFiles(self, path, includes, jobs=1):
+        """Write the code of all the symbols to path. With more than one
+        job, the symbols are written by that many forked processes, which
+        share the processed AST with the parent. The files are the same
+        either way, since every symbol writes its own files."""
         makeDir(path)
 
         code = self.codeFormatter()
@@ -147,8 +187,42 @@ class SymbolTable(object):
 
         code.write(path, "Types.hh")
 
-        for symbol in self.sym_vec:
-            symbol.writeCodeFiles(path, includes)
+        if jobs > 1 and "fork" in multiprocessing.get_all_start_methods():
+            self.writeSymbolCodeFilesParallel(path, includes, jobs)
+        else:
+            for symbol in self.sym_vec:
+                symbol.writeCodeFiles(path, includes)
+
+    def writeSymbolCodeFilesParallel(self, path, includes, jobs):
+        global _worker_symtab
+
+        # The state machines take far longer than the other symbols, so
+        # they are handed out first to keep all the workers busy.
+        order = sorted(
+            range(len(self.sym_vec)),
+            key=lambda i: not isinstance(self.sym_vec[i], StateMachine),
+        )
+        results = [None] * len(self.sym_vec)
+
+        _worker_symtab = self
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(jobs) as pool:
+                tasks = [(i, path, includes) for i in order]
+                for i, result in zip(
+                    order, pool.imap(_writeSymbolCodeFiles, tasks)
+                ):
+                    results[i] = result
+        finally:
+            _worker_symtab = None
+
+        for stdout, stderr, exception, tb in results:
+            print(stdout, end="")
+            print(stderr, end="", file=sys.stderr)
+            if exception is not None:
+                # As multiprocessing.Pool does, the traceback of the worker
+                # is shown as the cause of the exception.
+                raise exception from RemoteTraceback(tb)
 
     def writeHTMLFiles(self, path):
         makeDir(path)
@@ -48,6 +48,7 @@
 #include <cstdlib>
 #include <iostream>
 #include <list>
+#include <vector>
 
 namespace py = pybind11;
 
@@ -75,24 +76,36 @@ EmbeddedPython::getList()
 py::object
 EmbeddedPython::getCode() const
 {
-    Bytef marshalled[len];
+    auto marshal = py::module_::import("marshal");
+
+    // Code which was embedded uncompressed is unmarshalled in place.
+    if (zlen == 0) {
+        return marshal.attr("loads")(
+                py::memoryview::from_memory(code, len));
+    }
+
+    std::vector<Bytef> marshalled(len);
     uLongf unzlen = len;
-    int ret = uncompress(marshalled, &unzlen, (const Bytef *)code, zlen);
+    int ret = uncompress(marshalled.data(), &unzlen, (const Bytef *)code,
+            zlen);
     if (ret != Z_OK) {
         std::cerr << "Could not uncompress code: " << zError(ret) << std::endl;
         std::abort();
     }
     assert(unzlen == (uLongf)len);
 
-    auto marshal = py::module_::import("marshal");
-    return marshal.attr("loads")(py::bytes((char *)marshalled, len));
+    return marshal.attr("loads")(
+            py::memoryview::from_memory(marshalled.data(), len));
 }
 
 bool
 EmbeddedPython::addModule() const
 {
     auto importer = py::module_::import("importer");
-    importer.attr("add_module")(abspath, modpath, getCode());
+    // The code is only uncompressed and unmarshalled when the module is
+    // imported; most embedded modules never are.
+    importer.attr("add_module")(abspath, modpath,
+            py::cpp_function([this]() { return getCode(); }));
     return true;
 }
 
@@ -58,7 +58,9 @@ struct EmbeddedPython
     const char *abspath;
     const char *modpath;
     const uint8_t *code;
+    // The size of the compressed code, or 0 if it isn't compressed.
     int zlen;
+    // The size of the marshalled code.
     int len;
 
     EmbeddedPython(const char *abspath, const char *modpath,
@@ -0,0 +1,358 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import fcntl
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .md5_utils import md5_dir, md5_file
+from ..utils.filelock import FileLock, FileLockException
+
+"""
+This Python module contains the `ResourceCache`, the index of the verified
+resources of a resource directory.
+
+Checking that a local resource is up to date requires its md5 value, which
+is costly to compute for large disk images and directory resources. The
+index records the md5 value of every resource once it has been computed, or
+once the resource has been downloaded, along with the size, modification
+time and inode of its files. As long as these are unchanged, the recorded
+md5 value is used and the resource is not hashed again.
+
+The index also allows resources to be looked up by their md5 value, and
+records when each resource was last used so the resource directory can be
+kept under a size limit by evicting the least recently used resources. The
+resources a gem5 process uses hold a shared lock (see `mark_in_use`) and are
+never evicted while it runs.
+"""
+
+_INDEX_FILE = ".gem5-resource-index.json"
+
+# The descriptors of the resources used by this process, by path. They are
+# kept open, with a shared lock, until the process exits.
+_in_use = {}
+
+_size_suffixes = {
+    "": 1,
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+    "T": 1 << 40,
+}
+
+
+def parse_size(size: str) -> int:
+    """
+    Parses a size in bytes with an optional binary suffix (e.g., "512M",
+    "20GiB" or "1T").
+
+    :param size: The size to parse.
+
+    :returns: The size in bytes.
+    """
+    value = size.strip().upper()
+    for suffix in ("IB", "B"):
+        if value.endswith(suffix):
+            value = value[: -len(suffix)]
+            break
+    unit = value[-1:] if value[-1:] in _size_suffixes else ""
+    try:
+        number = float(value[: len(value) - len(unit)])
+    except ValueError:
+        raise ValueError(f"Invalid size '{size}'")
+    return int(number * _size_suffixes[unit])
+
+
+def _signature(path: Path) -> Tuple[int, list]:
+    """
+    Returns the total size of a resource and a signature of its files, which
+    changes if any file is modified, replaced, added or removed.
+    """
+    if path.is_file():
+        st = path.stat()
+        return st.st_size, [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    total = 0
+    files = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            file_path = os.path.join(dirpath, name)
+            st = os.stat(file_path)
+            total += st.st_size
+            files.append(
+                [
+                    os.path.relpath(file_path, path),
+                    st.st_size,
+                    st.st_mtime_ns,
+                    st.st_ino,
+                ]
+            )
+    return total, files
+
+
+def _files(entry: Dict) -> Dict[int, int]:
+    """Returns the size of each file of a resource in the index, by inode."""
+    signature = entry["signature"]
+    if signature and not isinstance(signature[0], list):
+        return {signature[2]: signature[0]}
+    return {ino: size for _, size, _, ino in signature}
+
+
+def _disk_usage(entries: Iterable[Dict]) -> int:
+    """
+    Returns the total size of resources in the index. Files which are hard
+    links to the same inode are only counted once.
+    """
+    files = {}
+    for entry in entries:
+        files.update(_files(entry))
+    return sum(files.values())
+
+
+def mark_in_use(path: Path) -> None:
+    """
+    Marks a resource as used by this process, until it exits, so that it is
+    not evicted by `ResourceCache.evict` in this or any other process.
+
+    This takes a shared `flock` lock on the resource file or directory,
+    which the kernel releases when the process exits, even if it crashes.
+
+    :param path: The path to the resource file or directory.
+    """
+    path = os.path.abspath(path)
+    if path in _in_use:
+        return
+    fd = os.open(path, os.O_RDONLY)
+    fcntl.flock(fd, fcntl.LOCK_SH)
+    _in_use[path] = fd
+
+
+class ResourceCache:
+    """
+    The index of the verified resources stored in a resource directory. The
+    index is stored in the directory, in `.gem5-resource-index.json`, and
+    accesses to it are serialized with a `FileLock` so that multiple gem5
+    instances can share the directory.
+
+    Resources are identified by their path relative to the directory.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: The resource directory.
+        """
+        self._directory = os.path.abspath(directory)
+        self._index_file = os.path.join(self._directory, _INDEX_FILE)
+
+    def _lock(self) -> FileLock:
+        return FileLock(self._index_file, timeout=60)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._index_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A missing or corrupted index only means hashing again
+            return {}
+
+    def _save(self, index: Dict[str, Dict]) -> None:
+        tmp_file = f"{self._index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp_file, self._index_file)
+
+    def _key(self, path: Path) -> str:
+        return os.path.relpath(os.path.abspath(path), self._directory)
+
+    def verified_md5(self, path: Path) -> str:
+        """
+        Returns the md5 value of a resource. The recorded value is returned if
+        the resource hasn't changed since it was recorded, otherwise the md5
+        value is computed and recorded.
+
+        :param path: The path to the resource file or directory.
+        """
+        path = Path(path)
+        key = self._key(path)
+        size, signature = _signature(path)
+        with self._lock():
+            index = self._load()
+            entry = index.get(key)
+            if entry is not None and entry["signature"] == signature:
+                entry["last_used"] = time.time()
+                self._save(index)
+                return entry["md5"]
+
+        # The lock is not held while hashing, which may take minutes.
+        md5 = (
+            md5_file(path)
+            if path.is_file()
+            else md5_dir(path, threads=os.cpu_count() or 1)
+        )
+        self._record(key, md5, size, signature)
+        return md5
+
+    def record(self, path: Path, md5: str) -> None:
+        """
+        Records the md5 value of a resource, e.g., computed while it was
+        downloaded, so that it doesn't need to be hashed again.
+
+        :param path: The path to the resource file or directory.
+
+        :param md5: The md5 value of the resource.
+        """
+        path = Path(path)
+        size, signature = _signature(path)
+        self._record(self._key(path), md5, size, signature)
+
+    def _record(self, key: str, md5: str, size: int, signature: list) -> None:
+        with self._lock():
+            index = self._load()
+            index[key] = {
+                "md5": md5,
+                "size": size,
+                "signature": signature,
+                "last_used": time.time(),
+            }
+            self._save(index)
+
+    def forget(self, path: Path) -> None:
+        """
+        Removes a resource from the index, e.g., because it is being deleted.
+
+        :param path: The path to the resource file or directory.
+        """
+        with self._lock():
+            index = self._load()
+            if index.pop(self._key(Path(path)), None) is not None:
+                self._save(index)
+
+    def find(self, md5: str) -> Optional[Path]:
+        """
+        Looks a resource up by its md5 value.
+
+        :param md5: The md5 value of the resource.
+
+        :returns: The path of an unmodified resource with this md5 value, or
+        None if there is none in the index.
+        """
+        with self._lock():
+            candidates = [
+                key
+                for key, entry in self._load().items()
+                if entry["md5"] == md5
+            ]
+        for key in candidates:
+            path = Path(self._directory, key)
+            if path.exists() and self.verified_md5(path) == md5:
+                return path
+        return None
+
+    def total_size(self) -> int:
+        """
+        Returns the total size of the resources in the index. Files which are
+        hard links to the same inode are only counted once.
+        """
+        with self._lock():
+            return _disk_usage(self._load().values())
+
+    def evict(self, max_size: int, keep: Iterable[Path] = ()) -> None:
+        """
+        Deletes the least recently used resources in the index until the total
+        size of the resources in the index is at most `max_size` bytes.
+
+        :param max_size: The maximum total size of the resources, in bytes.
+
+        :param keep: The resources which must not be deleted, e.g., the ones
+        the current simulation uses. The resources marked in use by any
+        process (see `mark_in_use`) are never deleted.
+        """
+        keep = {self._key(Path(path)) for path in keep}
+        with self._lock():
+            index = self._load()
+            for key, entry in sorted(
+                index.items(), key=lambda item: item[1]["last_used"]
+            ):
+                if _disk_usage(index.values()) <= max_size:
+                    break
+                if key in keep:
+                    continue
+                path = Path(self._directory, key)
+                # Resources are locked by `get_resource` while they are
+                # being obtained. Those are skipped.
+                lock = FileLock(f"{path}.lock", timeout=None)
+                try:
+                    lock.acquire()
+                except FileLockException:
+                    continue
+                try:
+                    if path.exists() and not self._delete_unused(path):
+                        continue
+                finally:
+                    lock.release()
+                del index[key]
+            self._save(index)
+
+    def _delete_unused(self, path: Path) -> bool:
+        # Deletes a resource unless a process holds the lock of
+        # `mark_in_use` on it. Returns whether it was deleted.
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+            return True
+        finally:
+            os.close(fd)
+
+
+def verified_md5(path: Path) -> str:
+    """
+    Returns the md5 value of a file or directory. If it is in a resource
+    directory with an index, the value recorded in the index is used while
+    the resource is unchanged.
+
+    :param path: The path to the file or directory.
+    """
+    path = Path(path).absolute()
+    for directory in path.parents:
+        if (directory / _INDEX_FILE).is_file():
+            return ResourceCache(str(directory)).verified_md5(path)
+    return (
+        md5_file(path)
+        if path.is_file()
+        else md5_dir(path, threads=os.cpu_count() or 1)
+    )
@@ -31,10 +31,16 @@ import shutil
 import gzip
 import time
 import random
+import hashlib
+import http.client
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import tarfile
-from urllib.error import HTTPError
-from typing import List, Optional, Dict
+from urllib.error import HTTPError, URLError
+from typing import List, Optional, Dict, Tuple
 
 from _m5 import core
 
@@ -42,8 +48,8 @@ from .client import (
     get_resource_json_obj,
     list_resources as client_list_resources,
 )
-from .md5_utils import md5_file, md5_dir
-from ..utils.progress_bar import tqdm, progress_hook
+from .cache import ResourceCache, mark_in_use
+from ..utils.progress_bar import tqdm, FakeTQDM
 
 from ..utils.filelock import FileLock
 
@@ -53,12 +59,283 @@ information about resources from resources.gem5.org.
 """
 
 
-def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
+class _RangeDownload:
+    """
+    Downloads a file over HTTP(S) with concurrent Range requests.
+
+    The file is split into chunks of `chunk_size` bytes which are fetched by
+    `connections` threads, each reusing a single keep-alive connection. The
+    chunks are written into `<download_to>.part` and the chunks which are
+    complete are recorded in the `<download_to>.part.json` state file, so an
+    interrupted download resumes where it stopped. The md5 of the file is
+    computed as the chunks complete, in file order, so the file doesn't need
+    to be read again afterwards.
+
+    If the server does not support Range requests, the file is downloaded in
+    a single stream instead.
+    """
+
+    _content_range = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+    _read_size = 1024 * 1024
+
+    def __init__(
+        self,
+        url: str,
+        download_to: str,
+        connections: int = 8,
+        chunk_size: int = 16 * 1024 * 1024,
+    ):
+        self._url = url
+        self._download_to = download_to
+        self._part = f"{download_to}.part"
+        self._state_file = f"{download_to}.part.json"
+        self._connections = max(1, connections)
+        self._chunk_size = chunk_size
+        self._local = threading.local()
+        self._open_connections = []
+        self._lock = threading.Lock()
+
+    def run(self) -> str:
+        """
+        Download the file.
+
+        :returns: The md5 hex digest of the downloaded file.
+        """
+
+        request = urllib.request.Request(
+            self._url, headers={"Range": "bytes=0-0"}
+        )
+        try:
+            response = urllib.request.urlopen(request)
+        except HTTPError as e:
+            if e.code != 416:
+                raise
+            # Empty files have no satisfiable range
+            with urllib.request.urlopen(self._url) as response:
+                return self._stream(response)
+        with response:
+            # Redirects are only followed once, the chunks are requested
+            # from the final location.
+            self._final_url = response.geturl()
+            match = self._content_range.fullmatch(
+                response.headers.get("Content-Range", "")
+            )
+            if response.status != 206:
+                return self._stream(response)
+            if match is None:
+                # The size of the file isn't known, so it can't be split in
+                # chunks. The body is only the requested range.
+                with urllib.request.urlopen(self._url) as response:
+                    return self._stream(response)
+            size = int(match.group(3))
+            validator = response.headers.get(
+                "ETag", response.headers.get("Last-Modified")
+            )
+
+        num_chunks = max(1, -(-size // self._chunk_size))
+        state = {
+            "url": self._url,
+            "size": size,
+            "validator": validator,
+            "chunk_size": self._chunk_size,
+            "done": [],
+        }
+        done = self._load_state(state)
+        if done is None:
+            done = set()
+            with open(self._part, "wb") as f:
+                f.truncate(size)
+            self._save_state(state, done)
+
+        hash = hashlib.md5()
+        next_to_hash = 0
+        fd = os.open(self._part, os.O_RDWR)
+        try:
+            progress = self._progress_bar(size)
+            progress.update(sum(self._chunk_length(i, size) for i in done))
+
+            def advance_hash() -> None:
+                # Hash the complete chunks following the ones already hashed.
+                # They were just written, so this is read from the page cache.
+                nonlocal next_to_hash
+                while next_to_hash in done:
+                    start = next_to_hash * self._chunk_size
+                    length = self._chunk_length(next_to_hash, size)
+                    while length > 0:
+                        data = os.pread(
+                            fd, min(length, self._read_size), start
+                        )
+                        hash.update(data)
+                        start += len(data)
+                        length -= len(data)
+                    next_to_hash += 1
+
+            advance_hash()
+            todo = [i for i in range(num_chunks) if i not in done]
+            with ThreadPoolExecutor(
+                max_workers=min(self._connections, max(1, len(todo)))
+            ) as executor:
+                futures = {
+                    executor.submit(self._fetch, fd, i, size): i for i in todo
+                }
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        index = futures[future]
+                        done.add(index)
+                        self._save_state(state, done)
+                        progress.update(self._chunk_length(index, size))
+                        advance_hash()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            progress.close()
+        finally:
+            os.close(fd)
+            for connection in self._open_connections:
+                connection.close()
+
+        os.replace(self._part, self._download_to)
+        os.remove(self._state_file)
+        return hash.hexdigest()
+
+    def _progress_bar(self, size: int):
+        if isinstance(tqdm, FakeTQDM):
+
+            class NoProgress:
+                def update(self, n: int) -> None:
+                    pass
+
+                def close(self) -> None:
+                    pass
+
+            return NoProgress()
+        return tqdm(
+            total=size,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            miniters=1,
+            desc=f"Downloading {self._download_to}",
+        )
+
+    def _chunk_length(self, index: int, size: int) -> int:
+        return min(self._chunk_size, size - index * self._chunk_size)
+
+    def _load_state(self, state: Dict) -> Optional[set]:
+        # Returns the chunks already downloaded, if the partial download is
+        # of the same file.
+        if not (
+            os.path.isfile(self._state_file) and os.path.isfile(self._part)
+        ):
+            return None
+        try:
+            with open(self._state_file) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if any(saved.get(k) != state[k] for k in state if k != "done"):
+            return None
+        if os.path.getsize(self._part) != state["size"]:
+            return None
+        return set(saved.get("done", []))
+
+    def _save_state(self, state: Dict, done: set) -> None:
+        state["done"] = sorted(done)
+        with open(f"{self._state_file}.tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(f"{self._state_file}.tmp", self._state_file)
+
+    def _stream(self, response) -> str:
+        # The server ignored the Range header: write the body as is.
+        hash = hashlib.md5()
+        progress = self._progress_bar(getattr(response, "length", None))
+        with open(self._part, "wb") as f:
+            for data in iter(lambda: response.read(self._read_size), b""):
+                f.write(data)
+                hash.update(data)
+                progress.update(len(data))
+        progress.close()
+        os.replace(self._part, self._download_to)
+        return hash.hexdigest()
+
+    def _connection(self, fresh: bool = False) -> http.client.HTTPConnection:
+        # Each thread keeps one connection alive for all of its requests.
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and not fresh:
+            return connection
+        if connection is not None:
+            connection.close()
+        parts = urllib.parse.urlsplit(self._final_url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                parts.hostname, parts.port
+            )
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        self._local.connection = connection
+        with self._lock:
+            self._open_connections.append(connection)
+        return connection
+
+    def _fetch(self, fd: int, index: int, size: int) -> None:
+        start = index * self._chunk_size
+        end = start + self._chunk_length(index, size)
+        parts = urllib.parse.urlsplit(self._final_url)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        for attempt in range(2):
+            # A kept alive connection may have been closed by the server in
+            # the meantime, so failures are retried once on a new connection.
+            connection = self._connection(fresh=attempt > 0)
+            try:
+                connection.request(
+                    "GET", path, headers={"Range": f"bytes={start}-{end - 1}"}
+                )
+                response = connection.getresponse()
+                if response.status != 206:
+                    response.read()
+                    raise HTTPError(
+                        self._final_url,
+                        response.status,
+                        response.reason,
+                        response.headers,
+                        None,
+                    )
+                offset = start
+                while offset < end:
+                    data = response.read(min(self._read_size, end - offset))
+                    if not data:
+                        break
+                    os.pwrite(fd, data, offset)
+                    offset += len(data)
+                if offset == end:
+                    return
+                raise http.client.IncompleteRead(b"", end - offset)
+            except (http.client.HTTPException, ConnectionError):
+                if attempt > 0:
+                    raise
+
+
+def _download(
+    url: str,
+    download_to: str,
+    max_attempts: int = 6,
+    connections: int = 8,
+    chunk_size: int = 16 * 1024 * 1024,
+) -> str:
     """
     Downloads a file.
 
     The function will run a Truncated Exponential Backoff algorithm to retry
-    the download if the HTTP Status Code returned is deemed retryable.
+    the download if the HTTP Status Code returned is deemed retryable, or if
+    the connection fails (e.g., it is reset or closed in the middle of a
+    response, or times out). Unless a proxy is used, the file is downloaded
+    in chunks with concurrent HTTP Range requests and retries resume the
+    download where it stopped (see `_RangeDownload`).
 
     :param url: The URL of the file to download.
 
@@ -67,6 +344,14 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
     :param max_attempts: The max number of download attempts before stopping.
     The default is 6. This translates to roughly 1 minute of retrying before
     stopping.
+
+    :param connections: The number of concurrent connections used to
+    download the file. The default is 8.
+
+    :param chunk_size: The size, in bytes, of the ranges requested on each
+    connection. The default is 16 MiB.
+
+    :returns: The md5 hex digest of the downloaded file.
     """
 
     # TODO: This whole setup will only work for single files we can get via
@@ -101,6 +386,7 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
 
                 # get the file as a bytes blob
                 request = urllib.request.Request(url)
+                md5 = hashlib.md5()
                 with urllib.request.urlopen(request, context=ctx) as fr:
                     with tqdm.wrapattr(
                         open(download_to, "wb"),
@@ -111,18 +397,15 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
                     ) as fw:
                         for chunk in fr:
                             fw.write(chunk)
+                            md5.update(chunk)
+                return md5.hexdigest()
             else:
-                with tqdm(
-                    unit="B",
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    miniters=1,
-                    desc=f"Downloading {download_to}",
-                ) as t:
-                    urllib.request.urlretrieve(
-                        url, download_to, reporthook=progress_hook(t)
-                    )
-            return
+                return _RangeDownload(
+                    url,
+                    download_to,
+                    connections=connections,
+                    chunk_size=chunk_size,
+                ).run()
         except HTTPError as e:
             # If the error code retrieved is retryable, we retry using a
             # Truncated Exponential backoff algorithm, truncating after
@@ -139,22 +422,29 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
                 time.sleep((2**attempt) + random.uniform(0, 1))
             else:
                 raise e
-        except ConnectionResetError as e:
-            # This catches the ConnectionResetError we see occassionally see
-            # when accessing resources on GitHub Actions.  It retries using a
-            # Truncated Exponential backoff algorithm, truncating after
-            # "max_attempts". If any other is retrieved we raise the error.
-            if e.errno == 104:
-                attempt += 1
-                if attempt >= max_attempts:
-                    raise Exception(
-                        f"After {attempt} attempts, the resource json could "
-                        "not be retrieved. OS Error Code retrieved: "
-                        f"{e.errno}"
-                    )
-                time.sleep((2**attempt) + random.uniform(0, 1))
-            else:
+        except (
+            http.client.HTTPException,
+            ConnectionError,
+            TimeoutError,
+            URLError,
+        ) as e:
+            # This catches the connections which fail, e.g., the
+            # ConnectionResetError we occassionally see when accessing
+            # resources on GitHub Actions, or a connection closed in the
+            # middle of a chunk (http.client.IncompleteRead). It retries using
+            # a Truncated Exponential backoff algorithm, truncating after
+            # "max_attempts". The retries resume from the partial download.
+            if isinstance(e, URLError) and not isinstance(
+                e.reason, (ConnectionError, TimeoutError)
+            ):
                 raise e
+            attempt += 1
+            if attempt >= max_attempts:
+                raise Exception(
+                    f"After {attempt} attempts, the resource could not be "
+                    f"downloaded. Error retrieved: {e!r}"
+                )
+            time.sleep((2**attempt) + random.uniform(0, 1))
         except ValueError as e:
             raise Exception(
                 f"ValueError: {e}\n"
@@ -253,27 +543,49 @@ def get_resource(
             gem5_version=gem5_version,
         )
 
+        # The md5 values of the resources in the directory are cached, so
+        # unchanged resources aren't hashed again.
+        cache = ResourceCache(os.path.dirname(os.path.abspath(to_path)))
+
         if os.path.exists(to_path):
-            if os.path.isfile(to_path):
-                md5 = md5_file(Path(to_path))
-            else:
-                md5 = md5_dir(Path(to_path))
+            md5 = cache.verified_md5(Path(to_path))
 
             if md5 == resource_json["md5sum"]:
                 # In this case, the file has already been download, no need to
                 # do so again.
+                mark_in_use(Path(to_path))
                 return
             elif download_md5_mismatch:
                 if os.path.isfile(to_path):
                     os.remove(to_path)
                 else:
                     shutil.rmtree(to_path)
+                cache.forget(Path(to_path))
             else:
                 raise Exception(
                     "There already a file present at '{}' but "
                     "its md5 value is invalid.".format(to_path)
                 )
 
+        # The same content may already be in the directory under another
+        # name, e.g., another version of the resource.
+        existing = cache.find(resource_json["md5sum"])
+        if existing is not None:
+            print(
+                f"Resource '{resource_name}' was found locally at "
+                f"'{existing}'. Copying it to '{to_path}'..."
+            )
+            if existing.is_dir():
+                shutil.copytree(existing, to_path)
+            else:
+                try:
+                    os.link(existing, to_path)
+                except OSError:
+                    shutil.copy2(existing, to_path)
+            cache.record(Path(to_path), resource_json["md5sum"])
+            mark_in_use(Path(to_path))
+            return
+
         download_dest = to_path
 
         # This if-statement is remain backwards compatable with the older,
@@ -317,7 +629,7 @@ def get_resource(
         # Get the URL.
         url = resource_json["url"]
 
-        _download(url=url, download_to=download_dest)
+        md5 = _download(url=url, download_to=download_dest)
         print(f"Finished downloading resource '{resource_name}'.")
 
         if run_unzip:
@@ -325,9 +637,14 @@ def get_resource(
                 f"Decompressing resource '{resource_name}' ('{download_dest}')..."
             )
             unzip_to = download_dest[: -len(zip_extension)]
+            # The md5 of the decompressed file is computed as it is written
+            md5 = hashlib.md5()
             with gzip.open(download_dest, "rb") as f:
                 with open(unzip_to, "wb") as o:
-                    shutil.copyfileobj(f, o)
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        o.write(chunk)
+                        md5.update(chunk)
+            md5 = md5.hexdigest()
             os.remove(download_dest)
             download_dest = unzip_to
             print(f"Finished decompressing resource '{resource_name}'.")
@@ -364,3 +681,11 @@ def get_resource(
 
                 safe_extract(f, unpack_to)
             os.remove(download_dest)
+        else:
+            # The md5 of an extracted directory is only computed when it is
+            # next verified.
+            cache.record(Path(to_path), md5)
+
+        # The resource can't be evicted while this process may be using it.
+        # It's marked while the lock is held so it can't be evicted first.
+        mark_in_use(Path(to_path))
@@ -26,8 +26,16 @@
 
 from pathlib import Path
 import hashlib
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple, Union
 from _hashlib import HASH as Hash
 
+# Files smaller than this are read in one go rather than memory mapped
+_SMALL_FILE = 1024 * 1024
+
 
 def _md5_update_from_file(filename: Path, hash: Hash) -> Hash:
     assert filename.is_file()
@@ -47,7 +55,7 @@ def _md5_update_from_file(filename: Path, hash: Hash) -> Hash:
         desc=f"Computing md5sum on {filename}",
         total=filename.stat().st_size,
     ) as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hash.update(chunk)
     return hash
 
@@ -63,6 +71,103 @@ def _md5_update_from_dir(directory: Path, hash: Hash) -> Hash:
     return hash
 
 
+def _walk_dir(directory: Path) -> Iterator[Tuple[bytes, Optional[Path]]]:
+    """
+    Yields what `_md5_update_from_dir` hashes, in the same order: the name of
+    every entry of the directory tree and, for files, the file whose content
+    is hashed after the name.
+    """
+    assert directory.is_dir()
+    for path in sorted(directory.iterdir(), key=lambda p: str(p).lower()):
+        if path.is_file():
+            yield path.name.encode(), path
+        else:
+            yield path.name.encode(), None
+            if path.is_dir():
+                yield from _walk_dir(path)
+
+
+def _read_file(filename: Path) -> Union[bytes, mmap.mmap]:
+    """
+    Returns the content of a file, memory mapped if it is large. The kernel
+    is asked to read mapped files ahead.
+    """
+    with open(str(filename), "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _SMALL_FILE:
+            return f.read()
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(data, "madvise"):
+        data.madvise(mmap.MADV_WILLNEED)
+    return data
+
+
+def _file_digest(filename: Path) -> bytes:
+    data = _read_file(filename)
+    try:
+        return hashlib.md5(data).digest()
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def _md5_update_from_dir_threaded(
+    directory: Path, hash: Hash, threads: int
+) -> Hash:
+    """
+    Computes the same digest as `_md5_update_from_dir`. The data still has
+    to be hashed in order, but the files are opened and read ahead by
+    `threads` threads while the previous ones are hashed.
+    """
+    entries = _walk_dir(directory)
+    window = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+
+        def fill() -> None:
+            while len(window) < 4 * threads:
+                entry = next(entries, None)
+                if entry is None:
+                    return
+                name, path = entry
+                future = None
+                if path is not None:
+                    future = executor.submit(_read_file, path)
+                window.append((name, future))
+
+        fill()
+        while window:
+            name, future = window.popleft()
+            hash.update(name)
+            if future is not None:
+                data = future.result()
+                hash.update(data)
+                if isinstance(data, mmap.mmap):
+                    data.close()
+            fill()
+    return hash
+
+
+def _md5_update_from_dir_tree(
+    directory: Path, hash: Hash, threads: int
+) -> Hash:
+    """
+    Hashes every file of the directory concurrently, then hashes the names
+    of the entries of the directory tree, in the same order as
+    `_md5_update_from_dir`, each file name being followed by the digest of
+    the file instead of its content.
+    """
+    entries = list(_walk_dir(directory))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        digests = executor.map(
+            _file_digest, [path for _, path in entries if path is not None]
+        )
+        for name, path in entries:
+            hash.update(name)
+            if path is not None:
+                hash.update(next(digests))
+    return hash
+
+
 def md5(path: Path) -> str:
     """
     Gets the md5 value of a file or directory. `md5_file` is used if the path
@@ -88,7 +193,7 @@ def md5_file(filename: Path) -> str:
     return str(_md5_update_from_file(filename, hashlib.md5()).hexdigest())
 
 
-def md5_dir(directory: Path) -> str:
+def md5_dir(directory: Path, threads: int = 1, legacy: bool = True) -> str:
     """
     Gives the md5 value of a directory.
 
@@ -96,5 +201,24 @@ def md5_dir(directory: Path) -> str:
 
     Note: The path of files are also hashed so the md5 of the directory changes
     if empty files are included or filenames are changed.
+
+    :param directory: The directory in which the md5 is to be calculated.
+
+    :param threads: The number of threads reading (and, if `legacy` is False,
+    hashing) the files. 1 by default.
+
+    :param legacy: If True, the md5 value is the one recorded for
+    gem5-resources entries, which hashes the content of all the files as a
+    single stream. If False, each file is hashed on its own and the md5 value
+    is computed from the file digests. The two values differ, but the latter
+    scales with the number of threads. True by default.
     """
-    return str(_md5_update_from_dir(directory, hashlib.md5()).hexdigest())
+    if not legacy:
+        hash = _md5_update_from_dir_tree(
+            directory, hashlib.md5(), max(1, threads)
+        )
+    elif threads > 1:
+        hash = _md5_update_from_dir_threaded(directory, hashlib.md5(), threads)
+    else:
+        hash = _md5_update_from_dir(directory, hashlib.md5())
+    return str(hash.hexdigest())
@@ -31,6 +31,7 @@ from m5.util import warn, fatal
 from _m5 import core
 
 from .downloader import get_resource
+from .cache import ResourceCache, parse_size
 
 from .looppoint import LooppointCsvLoader, LooppointJsonLoader
 from ..isas import ISA, get_isa_from_str
@@ -573,6 +574,9 @@ def obtain_resource(
     resource is to be stored. If this parameter is not set, it will set to
     the environment variable `GEM5_RESOURCE_DIR`. If the environment is not
     set it will default to `~/.cache/gem5` if available, otherwise the CWD.
+    If the environment variable `GEM5_RESOURCE_CACHE_SIZE` is set, the least
+    recently used resources in this directory are deleted to keep their total
+    size under its value.
     :param download_md5_mismatch: If the resource is present, but does not
     have the correct md5 value, the resoruce will be deleted and
     re-downloaded if this value is True. Otherwise an exception will be
@@ -637,6 +641,16 @@ def obtain_resource(
             gem5_version=gem5_version,
         )
 
+        # If the "GEM5_RESOURCE_CACHE_SIZE" environment variable is set (e.g.,
+        # to "50G"), the least recently used resources are deleted from the
+        # resource directory until the resources gem5 has obtained fit in
+        # this size.
+        max_size = os.getenv("GEM5_RESOURCE_CACHE_SIZE")
+        if max_size:
+            ResourceCache(resource_directory).evict(
+                parse_size(max_size), keep=[to_path]
+            )
+
     # Obtain the type from the JSON. From this we will determine what subclass
     # of `AbstractResource` we are to create and return.
     resources_category = resource_json["category"]
@@ -0,0 +1,589 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Restore the checkpoints of the SimPoint or LoopPoint regions of a workload in
+parallel and combine their stats.
+
+Every attempt at a region is restored in its own gem5 process, a
+`gem5.utils.multiprocessing.Process`, so an attempt ending with `fatal()` or
+`panic()` is seen from its exit code. The longest regions are started first,
+regions which fail are retried, and regions which take longer than a time
+limit are restarted alongside the slow attempt, keeping whichever finishes
+first. The checkpoints are those written by
+`simpoints_save_checkpoint_generator` ("cpt.SimPoint<index>") and
+`looppoint_save_checkpoint_generator` ("cpt.Region<id>").
+
+The boards are built by a function, given the `SampledRegion` to restore,
+which must be importable from a module (see the limitations of
+`gem5.utils.multiprocessing`). The function must set the workload of the
+board, including the checkpoint of the region.
+
+This module can also be used from the command line, e.g.,
+
+```
+gem5 -c "from gem5.simulate.region_executor import main; main()" \
+    --board my_boards:restore_board --regions x86-matrix-multiply-omp-100-8 \
+    --checkpoint-dir looppoint-checkpoints -j 8
+```
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import m5
+from m5.ext.pystats.jsonloader import JsonLoader
+from m5.ext.pystats.simstat import SimStat
+from m5.util import warn
+
+from _m5 import core
+
+from ..components.boards.abstract_board import AbstractBoard
+from ..resources.looppoint import Looppoint
+from ..resources.resource import SimpointResource, obtain_resource
+from ..utils.multiprocessing import Process
+from .exit_event import ExitEvent
+from .sampling import scalar_stats, write_region_stats
+from .simulator import Simulator
+
+
+class SampledRegion:
+    """A region to restore from a checkpoint and simulate."""
+
+    def __init__(
+        self,
+        region_id: Union[int, str],
+        checkpoint: Path,
+        weight: float,
+        warmup: int = 0,
+        length: int = 0,
+        looppoint: bool = False,
+        expected_length: Optional[int] = None,
+    ) -> None:
+        """
+        :param region_id: The SimPoint index or the LoopPoint region id.
+        :param checkpoint: The checkpoint of the region.
+        :param weight: The weight of the region's stats.
+        :param warmup: For SimPoints, the number of warmup instructions. For
+        LoopPoint regions, whether the region has a warmup.
+        :param length: For SimPoints, the number of instructions of the
+        region.
+        :param looppoint: Whether this is a LoopPoint region, which ends at
+        PC count pairs instead of after a number of instructions.
+        :param expected_length: The expected run time of the region relative
+        to the other regions, used to start the longest regions first. By
+        default, the warmup plus the length.
+        """
+        self.region_id = region_id
+        self.checkpoint = Path(checkpoint)
+        self.weight = weight
+        self.warmup = warmup
+        self.length = length
+        self.looppoint = looppoint
+        if expected_length is None:
+            expected_length = warmup + length
+        self.expected_length = expected_length
+
+
+def simpoint_regions(
+    simpoint: SimpointResource, checkpoint_dir: Path
+) -> List[SampledRegion]:
+    """
+    Returns the regions of a SimPoint workload, with the checkpoints written
+    by `simpoints_save_checkpoint_generator` to `checkpoint_dir`.
+    """
+    return [
+        SampledRegion(
+            region_id=index,
+            checkpoint=Path(checkpoint_dir) / f"cpt.SimPoint{index}",
+            weight=weight,
+            warmup=warmup,
+            length=simpoint.get_simpoint_interval(),
+        )
+        for index, (warmup, weight) in enumerate(
+            zip(simpoint.get_warmup_list(), simpoint.get_weight_list())
+        )
+    ]
+
+
+def looppoint_regions(
+    looppoint: Looppoint, checkpoint_dir: Path
+) -> List[SampledRegion]:
+    """
+    Returns the regions of a LoopPoint workload, with the checkpoints written
+    by `looppoint_save_checkpoint_generator` to `checkpoint_dir`. All the
+    regions are expected to take the same time.
+    """
+    return [
+        SampledRegion(
+            region_id=region_id,
+            checkpoint=Path(checkpoint_dir) / f"cpt.Region{region_id}",
+            weight=region.get_multiplier(),
+            warmup=int(bool(region.get_warmup())),
+            looppoint=True,
+            expected_length=1,
+        )
+        for region_id, region in looppoint.get_regions().items()
+    ]
+
+
+class RegionResult:
+    """The stats of a region which was simulated."""
+
+    def __init__(
+        self, region: SampledRegion, attempt: int, simstat_json: str
+    ) -> None:
+        self.region = region
+        self.attempt = attempt
+        self._simstat_json = simstat_json
+        self._stats = None
+
+    def get_simstat(self) -> SimStat:
+        """Returns the stats of the region."""
+        return json.loads(self._simstat_json, cls=JsonLoader)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Returns the value of each scalar stat of the region."""
+        if self._stats is None:
+            self._stats = scalar_stats(json.loads(self._simstat_json))
+        return self._stats
+
+
+def _region_outdir(region: SampledRegion, attempt: int) -> str:
+    if attempt == 1:
+        return f"region{region.region_id}"
+    return f"region{region.region_id}.retry{attempt - 1}"
+
+
+def _run_region(
+    board_builder: Callable[[SampledRegion], AbstractBoard],
+    region: SampledRegion,
+    outdir: str,
+) -> str:
+    """Restore and simulate one region, returning the JSON of its stats."""
+
+    m5.options.outdir = outdir
+    core.setOutputDir(outdir)
+
+    board = board_builder(region)
+
+    def end_region():
+        m5.stats.dump()
+        return True
+
+    def on_region_exit():
+        # SimPoint regions end after a number of instructions, LoopPoint
+        # regions at PC count pairs. Either way the first exit ends the
+        # warmup, if there is one.
+        if region.warmup:
+            m5.stats.reset()
+            if not region.looppoint:
+                simulator.schedule_max_insts(region.length)
+            yield False
+        yield end_region()
+
+    def on_workload_exit():
+        warn(f"The workload ended in region {region.region_id}.")
+        yield end_region()
+
+    region_exit = (
+        ExitEvent.SIMPOINT_BEGIN if region.looppoint else ExitEvent.MAX_INSTS
+    )
+    simulator = Simulator(
+        board=board,
+        on_exit_event={
+            region_exit: on_region_exit(),
+            ExitEvent.EXIT: on_workload_exit(),
+        },
+    )
+    if not region.looppoint:
+        # MAX_INSTS exit events are only scheduled for more than 0
+        # instructions.
+        simulator.schedule_max_insts(region.warmup or region.length)
+    simulator.run()
+
+    return simulator.get_simstats().dumps()
+
+
+# The file, in the output directory of an attempt, its stats are written to
+_SIMSTAT_FILE = "region-simstat.json"
+
+
+def _region_process(
+    simulate: Callable[..., str],
+    board_builder: Callable[[SampledRegion], AbstractBoard],
+    region: SampledRegion,
+    outdir: str,
+) -> None:
+    """The process of an attempt at a region."""
+
+    os.makedirs(outdir, exist_ok=True)
+    simstat_json = simulate(board_builder, region, outdir)
+    # Written to a temporary file first, so the file is only there if the
+    # attempt got that far.
+    path = os.path.join(outdir, _SIMSTAT_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        f.write(simstat_json)
+    os.replace(f"{path}.tmp", path)
+
+
+class RegionExecutor:
+    """
+    Restores the checkpoints of sampled regions in parallel, and combines
+    their stats.
+
+    Usage
+    -----
+    ```
+    from my_boards import restore_board
+
+    regions = simpoint_regions(simpoint, Path("simpoint-checkpoints"))
+    executor = RegionExecutor(restore_board, regions, processes=8)
+    weighted = executor.run(
+        on_result=lambda result: print(result.region.region_id)
+    )
+    ```
+    """
+
+    # The type of the process each attempt is run in, and the function
+    # simulating a region in it, which tests replace to run without gem5.
+    _process_class = Process
+    _simulate = staticmethod(_run_region)
+
+    def __init__(
+        self,
+        board_builder: Callable[[SampledRegion], AbstractBoard],
+        regions: List[SampledRegion],
+        processes: Optional[int] = None,
+        retries: int = 1,
+        timeout: Optional[float] = None,
+        results_file: str = "regions.json",
+    ) -> None:
+        """
+        :param board_builder: An importable function returning the board to
+        restore a region with.
+        :param regions: The regions to simulate.
+        :param processes: The maximum number of regions to simulate at the
+        same time, not counting the attempts which took longer than
+        `timeout`. By default, the number of host CPUs.
+        :param retries: The number of times a region is retried after it
+        fails or times out.
+        :param timeout: The number of seconds after which a region is started
+        again, while the slow attempt carries on. Once there are no retries
+        left, the attempts which took longer are stopped and the region
+        fails. No limit by default.
+        :param results_file: The name of the JSON file, in the output
+        directory, the stats of every region and their weighted sum are
+        written to.
+        """
+        self._board_builder = board_builder
+        self._regions = regions
+        self._processes = processes or os.cpu_count() or 1
+        self._retries = retries
+        self._timeout = timeout
+        self._results_file = results_file
+
+        self._results = {}
+        self._failed = []
+
+    def get_results(self) -> Dict[Union[int, str], RegionResult]:
+        """Returns the result of every region which was simulated."""
+        return self._results
+
+    def get_failed(self) -> List[Union[int, str]]:
+        """Returns the ids of the regions which couldn't be simulated."""
+        return self._failed
+
+    def run(
+        self, on_result: Optional[Callable[[RegionResult], None]] = None
+    ) -> Dict[str, float]:
+        """
+        Simulates every region and waits for all of them to finish.
+
+        :param on_result: An optional function called with the result of
+        every region as soon as it is available.
+        :returns: The weighted sum of every scalar stat over the regions
+        which could be simulated.
+        """
+
+        # The longest regions first, so the short ones fill in at the end
+        pending = deque(
+            (region, 1)
+            for region in sorted(
+                self._regions,
+                key=lambda region: region.expected_length,
+                reverse=True,
+            )
+        )
+        # Attempts started but not finished, as
+        # [process, region, attempt, outdir, start time, timed out]
+        running = []
+        # The last attempt started or queued, by region id
+        attempts = {region.region_id: 0 for region in self._regions}
+
+        def retry(region: SampledRegion) -> bool:
+            # Returns whether the region will be attempted again
+            region_id = region.region_id
+            if any(queued.region_id == region_id for queued, _ in pending):
+                return True
+            if attempts[region_id] > self._retries:
+                return False
+            attempts[region_id] += 1
+            pending.appendleft((region, attempts[region_id]))
+            return True
+
+        def stop(entry: List) -> None:
+            entry[0].terminate()
+            entry[0].join(5)
+            if entry[0].exitcode is None:
+                entry[0].kill()
+                entry[0].join()
+
+        try:
+            while pending or running:
+                # Attempts which took longer than the time limit don't hold
+                # a process slot, so their retry can start.
+                while pending and (
+                    sum(not entry[5] for entry in running) < self._processes
+                ):
+                    region, attempt = pending.popleft()
+                    if region.region_id in self._results:
+                        continue
+                    attempts[region.region_id] = max(
+                        attempts[region.region_id], attempt
+                    )
+                    name = _region_outdir(region, attempt)
+                    outdir = os.path.join(m5.options.outdir, name)
+                    process = self._process_class(
+                        target=_region_process,
+                        args=(
+                            self._simulate,
+                            self._board_builder,
+                            region,
+                            outdir,
+                        ),
+                        name=name,
+                    )
+                    process.start()
+                    running.append(
+                        [process, region, attempt, outdir, time.time(), False]
+                    )
+
+                wait([entry[0].sentinel for entry in running], timeout=0.1)
+
+                # The regions whose running attempts are to be stopped,
+                # because the region is done or out of time
+                done = set()
+                timed_out = set()
+                still_running = []
+                for entry in running:
+                    process, region, attempt, outdir, start, late = entry
+                    region_id = region.region_id
+                    if process.exitcode is None:
+                        if (
+                            self._timeout is not None
+                            and not late
+                            and time.time() - start > self._timeout
+                            and region_id not in self._results
+                        ):
+                            entry[5] = True
+                            if retry(region):
+                                warn(
+                                    f"Region {region_id} is taking more "
+                                    f"than {self._timeout}s, starting it "
+                                    "again."
+                                )
+                            else:
+                                warn(
+                                    f"Region {region_id} is taking more "
+                                    f"than {self._timeout}s, stopping it."
+                                )
+                                timed_out.add(region_id)
+                        still_running.append(entry)
+                        continue
+
+                    process.join()
+                    if region_id in self._results:
+                        # A faster attempt already finished
+                        continue
+                    path = os.path.join(outdir, _SIMSTAT_FILE)
+                    if process.exitcode != 0 or not os.path.exists(path):
+                        warn(
+                            f"Region {region_id} failed (attempt {attempt}, "
+                            f"exit code {process.exitcode})."
+                        )
+                        retry(region)
+                        continue
+
+                    with open(path) as f:
+                        region_result = RegionResult(region, attempt, f.read())
+                    self._results[region_id] = region_result
+                    done.add(region_id)
+                    if on_result:
+                        on_result(region_result)
+
+                running = []
+                for entry in still_running:
+                    region_id = entry[1].region_id
+                    if region_id in done or (
+                        region_id in timed_out and entry[5]
+                    ):
+                        stop(entry)
+                    else:
+                        running.append(entry)
+
+                # A region fails once none of its attempts are left
+                for region in self._regions:
+                    region_id = region.region_id
+                    if (
+                        region_id not in self._results
+                        and region_id not in self._failed
+                        and attempts[region_id] > 0
+                        and not any(
+                            entry[1].region_id == region_id
+                            for entry in running
+                        )
+                        and not any(
+                            queued.region_id == region_id
+                            for queued, _ in pending
+                        )
+                    ):
+                        self._failed.append(region_id)
+        finally:
+            for entry in running:
+                stop(entry)
+
+        if self._failed:
+            warn(
+                "The simulation of these regions failed: "
+                + ", ".join(str(region_id) for region_id in self._failed)
+            )
+
+        return write_region_stats(
+            os.path.join(m5.options.outdir, self._results_file),
+            {
+                region_id: result.get_stats()
+                for region_id, result in self._results.items()
+            },
+            {region.region_id: region.weight for region in self._regions},
+        )
+
+
+def _import_function(spec: str) -> Callable:
+    module, _, function = spec.partition(":")
+    if not function:
+        raise ValueError(f"Expected 'module:function', got '{spec}'.")
+    return getattr(importlib.import_module(module), function)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Restore the regions of a SimPoint or LoopPoint resource in parallel, as
+    configured by the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Restore the checkpoints of the SimPoint or LoopPoint "
+        "regions of a workload in parallel and weight their stats."
+    )
+    parser.add_argument(
+        "--board",
+        required=True,
+        help="The function building the board to restore a region with, as "
+        "'module:function'. The function is given the SampledRegion.",
+    )
+    parser.add_argument(
+        "--regions",
+        required=True,
+        help="The id of the SimPoint or LoopPoint resource of the workload.",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        required=True,
+        help="The directory of the region checkpoints.",
+    )
+    parser.add_argument(
+        "-j",
+        "--processes",
+        type=int,
+        default=None,
+        help="The number of regions to simulate at the same time.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="The number of times a region is retried.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="The number of seconds after which a region is started again.",
+    )
+    parser.add_argument(
+        "--output",
+        default="regions.json",
+        help="The JSON file, in the output directory, to write the stats to.",
+    )
+    args = parser.parse_args(argv)
+
+    resource = obtain_resource(args.regions)
+    if isinstance(resource, SimpointResource):
+        regions = simpoint_regions(resource, args.checkpoint_dir)
+    elif isinstance(resource, Looppoint):
+        regions = looppoint_regions(resource, args.checkpoint_dir)
+    else:
+        raise ValueError(
+            f"'{args.regions}' is not a SimPoint or LoopPoint resource."
+        )
+
+    executor = RegionExecutor(
+        board_builder=_import_function(args.board),
+        regions=regions,
+        processes=args.processes,
+        retries=args.retries,
+        timeout=args.timeout,
+        results_file=args.output,
+    )
+    weighted = executor.run(
+        on_result=lambda result: print(
+            f"Region {result.region.region_id} done "
+            f"(attempt {result.attempt})."
+        )
+    )
+    print(
+        f"{len(executor.get_results())} of {len(regions)} regions simulated, "
+        f"stats written to {os.path.join(m5.options.outdir, args.output)}."
+    )
+    return weighted
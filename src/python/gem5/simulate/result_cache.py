@@ -0,0 +1,301 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+A store of the results of completed simulations, keyed by a fingerprint of
+everything which determines them, so that runs which are identical to an
+earlier run can restore its stats and outputs instead of simulating.
+
+The fingerprint of a run covers:
+
+* The configuration of every SimObject, as given by
+  `SimObject.get_config_digest()`.
+* The md5 value of every host file named by a string parameter (e.g., the
+  kernel, disk image and binary) and of the checkpoint, if any. Resources
+  in a resource directory are hashed through its index, so they are only
+  hashed again when they change.
+* The gem5 version and build, and the arguments of the first call to
+  `Simulator.run()`.
+* The exit event generators: the code of each generator and the values of
+  its arguments. Only values whose state can be inspected (e.g., numbers,
+  strings, paths, containers of them, SimObjects and functions) can be
+  fingerprinted. A simulation with any other value, e.g., an instance of a
+  user class, is not cached.
+
+Anything else a script does which changes the simulation, e.g., calling m5
+functions directly between calls to `Simulator.run()`, is not part of the
+fingerprint.
+"""
+
+import enum
+import hashlib
+import json
+import os
+import shutil
+import types
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Union
+
+from m5 import defines
+from m5.SimObject import SimObject
+from m5.params import VectorParamValue
+
+from ..resources.cache import verified_md5
+
+_RESULT_FILE = "result.json"
+_OUTPUTS_DIR = "outputs"
+
+# Changes to the layout of the entries, or to what is in a fingerprint,
+# must change this value so that older entries are ignored.
+_FORMAT_VERSION = 1
+
+
+class FingerprintError(Exception):
+    """Raised when a simulation can't be fingerprinted."""
+
+
+def _code_digest(code: types.CodeType) -> str:
+    """
+    Returns a digest of the bytecode of a function, including the functions
+    defined in it. `marshal` isn't used as its output depends on reference
+    counts.
+    """
+    h = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            h.update(_code_digest(const).encode("utf-8"))
+        elif isinstance(const, frozenset):
+            # The iteration order of sets of strings varies between runs
+            h.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            h.update(repr(const).encode("utf-8"))
+    h.update(repr((code.co_names, code.co_varnames)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _value_fingerprint(value: Any) -> Any:
+    """Returns a JSON serializable fingerprint of a value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    if isinstance(value, enum.Enum):
+        return [
+            f"{type(value).__module__}.{type(value).__qualname__}",
+            _value_fingerprint(value.value),
+        ]
+    if isinstance(value, (list, tuple)):
+        return [_value_fingerprint(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(
+            (_value_fingerprint(v) for v in value),
+            key=lambda v: json.dumps(v, sort_keys=True),
+        )
+    if isinstance(value, dict):
+        return sorted(
+            [str(k), _value_fingerprint(v)] for k, v in value.items()
+        )
+    if isinstance(value, SimObject):
+        # Its configuration is already part of the fingerprint
+        return value.path()
+    if isinstance(value, types.GeneratorType):
+        return generator_fingerprint(value)
+    if isinstance(value, types.MethodType):
+        return [
+            _value_fingerprint(value.__self__),
+            _value_fingerprint(value.__func__),
+        ]
+    if isinstance(value, types.FunctionType):
+        return [
+            value.__module__,
+            value.__qualname__,
+            _code_digest(value.__code__),
+            _value_fingerprint(value.__defaults__),
+        ]
+    # Two objects of the same type can have different states, which would
+    # give different simulations the same fingerprint.
+    raise FingerprintError(
+        "Can't fingerprint a value of type "
+        f"{type(value).__module__}.{type(value).__qualname__}."
+    )
+
+
+def generator_fingerprint(generator: Generator) -> List:
+    """
+    Returns a JSON serializable fingerprint of an exit event generator: its
+    name, a digest of its code, and the values of its local variables, which
+    before the generator has started are its arguments.
+
+    :raises FingerprintError: If the value of a local variable can't be
+    fingerprinted.
+    """
+    frame = generator.gi_frame
+    local_values = frame.f_locals if frame is not None else {}
+    return [
+        generator.__qualname__,
+        _code_digest(generator.gi_code),
+        _value_fingerprint(local_values),
+    ]
+
+
+def _host_files(root: SimObject) -> List[str]:
+    """
+    Returns the paths of the host files named by the string parameters of
+    the SimObjects.
+    """
+    paths = set()
+    for obj in root.descendants():
+        for value in obj._values.values():
+            values = value if isinstance(value, VectorParamValue) else [value]
+            for v in values:
+                if isinstance(v, str) and v and os.path.isfile(v):
+                    paths.add(os.path.abspath(v))
+    return sorted(paths)
+
+
+def run_fingerprint(
+    root: SimObject,
+    checkpoint: Optional[Path],
+    on_exit_event: Optional[Dict],
+    expected_execution_order: Optional[List],
+    max_ticks: int,
+) -> str:
+    """
+    Returns the fingerprint of a simulation. The parameters of the SimObjects
+    must have been unproxied.
+
+    :param root: The root of the simulated SimObjects.
+    :param checkpoint: The checkpoint the simulation is restored from.
+    :param on_exit_event: The exit event generators given by the user, or
+    None if the default ones are used.
+    :param expected_execution_order: The expected order of exit events.
+    :param max_ticks: The `max_ticks` argument of the first `run()`.
+    :raises FingerprintError: If an exit event generator can't be
+    fingerprinted.
+    """
+    files = {path: verified_md5(Path(path)) for path in _host_files(root)}
+    if checkpoint:
+        files["checkpoint"] = verified_md5(Path(checkpoint))
+
+    fingerprint = {
+        "format": _FORMAT_VERSION,
+        "config": root.get_config_digest(),
+        "files": files,
+        "gem5": [
+            defines.gem5Version,
+            defines.compileDate,
+            sorted([k, str(v)] for k, v in defines.buildEnv.items()),
+        ],
+        "max_ticks": max_ticks,
+        "on_exit_event": None
+        if on_exit_event is None
+        else sorted(
+            [event.value, _value_fingerprint(generator)]
+            for event, generator in on_exit_event.items()
+        ),
+        "expected_execution_order": None
+        if expected_execution_order is None
+        else [event.value for event in expected_execution_order],
+    }
+    return hashlib.sha256(
+        json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class ResultCache:
+    """
+    A directory of the results of completed simulations. Each entry is a
+    directory named after the fingerprint of the simulation, holding a JSON
+    file with its stats and exit events, and a copy of the files in its
+    output directory.
+
+    Entries are written to a temporary directory and renamed into place, so
+    the directory can be shared by simulations running at the same time.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """
+        :param directory: The directory of the entries. It is created if it
+        doesn't exist.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def load(self, fingerprint: str) -> Optional[Dict]:
+        """
+        Returns the result stored for a fingerprint, or None if there is none.
+        """
+        try:
+            with open(self._directory / fingerprint / _RESULT_FILE) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if result.get("format") != _FORMAT_VERSION:
+            return None
+        return result
+
+    def restore_outputs(
+        self, fingerprint: str, outdir: str, skip: List[str] = ()
+    ) -> None:
+        """
+        Copies the output files stored for a fingerprint to `outdir`,
+        replacing the existing ones.
+
+        :param skip: The names of the files not to restore, e.g., those of
+        the redirected stdout and stderr of the current process.
+        """
+        outputs = self._directory / fingerprint / _OUTPUTS_DIR
+        for path in outputs.iterdir():
+            if path.name not in skip:
+                shutil.copy2(path, os.path.join(outdir, path.name))
+
+    def store(self, fingerprint: str, result: Dict, outdir: str) -> None:
+        """
+        Stores the result of a simulation, along with the files (but not the
+        directories) in its output directory. An existing entry for the same
+        fingerprint is kept.
+        """
+        entry = self._directory / fingerprint
+        if entry.exists():
+            return
+
+        tmp = self._directory / f".{fingerprint}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        (tmp / _OUTPUTS_DIR).mkdir(parents=True)
+        for name in os.listdir(outdir):
+            path = os.path.join(outdir, name)
+            if os.path.isfile(path):
+                shutil.copy2(path, tmp / _OUTPUTS_DIR / name)
+        with open(tmp / _RESULT_FILE, "w") as f:
+            json.dump(dict(result, format=_FORMAT_VERSION), f)
+
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another simulation stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,480 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Sampled simulation of SimPoint and LoopPoint regions without checkpoints.
+
+Rather than saving a checkpoint at the start of every region and restoring
+each checkpoint in a separate simulation, the `ForkedSampler` fast-forwards a
+single simulation and forks a copy-on-write child of gem5 (see `m5.fork()`)
+at the start of every region. The child switches to the detailed cores, runs
+the warmup and the region, and writes the stats of the region. The parent
+keeps fast-forwarding to the next region and, at the end, combines the stats
+of every region using the region weights.
+"""
+
+import json
+import os
+import sys
+import traceback
+from typing import Dict, List, Optional, Union
+
+import m5
+from m5.util import warn
+
+from _m5 import core
+
+from ..components.boards.abstract_board import AbstractBoard
+from ..components.processors.switchable_processor import SwitchableProcessor
+from .exit_event import ExitEvent
+from .simulator import Simulator
+
+
+class _Region:
+    """A region to simulate in detail, and how to weight its stats."""
+
+    def __init__(
+        self,
+        region_id: Union[int, str],
+        weight: float,
+        start: int = 0,
+        warmup: int = 0,
+        length: int = 0,
+        looppoint_region=None,
+    ) -> None:
+        self.region_id = region_id
+        self.weight = weight
+        # SimPoint regions are in instructions, the start including the warmup
+        self.start = start
+        self.warmup = warmup
+        self.length = length
+        # LoopPoint regions are delimited by PC count pairs
+        self.looppoint_region = looppoint_region
+        self.forked = False
+
+
+def scalar_stats(stats: Dict, prefix: str = "") -> Dict[str, float]:
+    """
+    Flatten the JSON form of a SimStat to the value of each scalar stat.
+
+    :param stats: The JSON dictionary of a SimStat, e.g., as returned by
+    `SimStat.to_json()`.
+    :returns: The value of each scalar stat, by its dotted path.
+    """
+    values = {}
+    for name, value in stats.items():
+        path = f"{prefix}.{name}" if prefix else name
+        if isinstance(value, dict):
+            if isinstance(value.get("value"), (int, float)):
+                values[path] = value["value"]
+            else:
+                values.update(scalar_stats(value, path))
+    return values
+
+
+def write_region_stats(
+    path: str,
+    region_stats: Dict[Union[int, str], Dict[str, float]],
+    weights: Dict[Union[int, str], float],
+) -> Dict[str, float]:
+    """
+    Weight the scalar stats of sampled regions, and write them to a JSON file
+    along with the stats of every region.
+
+    :param path: The path of the JSON file to write.
+    :param region_stats: The scalar stats of every region, by region id.
+    :param weights: The weight of every region, by region id.
+    :returns: The weighted sum of every stat over the regions.
+    """
+    weighted = {}
+    for region_id, stats in region_stats.items():
+        for name, value in stats.items():
+            weighted[name] = weighted.get(name, 0) + weights[region_id] * value
+
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "regions": {
+                    str(region_id): {
+                        "weight": weights[region_id],
+                        "stats": stats,
+                    }
+                    for region_id, stats in region_stats.items()
+                },
+                "weighted": weighted,
+            },
+            f,
+            indent=4,
+        )
+
+    return weighted
+
+
+class ForkedSampler:
+    """
+    Simulates the SimPoint or LoopPoint regions of a workload in forked
+    children of a single fast-forwarding simulation.
+
+    The board's processor must be a `SwitchableProcessor` which starts on the
+    fast cores (e.g., KVM or atomic cores) and can be switched to the
+    detailed cores. The regions are those of the SimPoint or LoopPoint
+    workload set on the board. LoopPoint regions are found by counting PCs,
+    which KVM cores don't do, so LoopPoint workloads need to fast-forward with
+    atomic cores.
+
+    Each region is simulated in its own output directory, "region<id>" in the
+    output directory of the parent, which holds the stats of the region and
+    a JSON file with the value of each scalar stat. The parent writes a JSON
+    file with the stats of every region and their weighted sum.
+
+    The stats are weighted by the SimPoint weights, so the weighted sum of a
+    stat estimates its value over one SimPoint interval, or by the LoopPoint
+    multipliers, so the weighted sum estimates its value over the whole
+    workload.
+
+    The sampler must be created before the board is instantiated, since it
+    disables the listeners, which can't be forked, and attaches the LoopPoint
+    PC trackers to the detailed cores.
+
+    Usage
+    -----
+    ```
+    board.set_se_simpoint_workload(binary=..., simpoint=...)
+    sampler = ForkedSampler(board=board, max_children=8)
+    weighted = sampler.run()
+    ```
+    """
+
+    def __init__(
+        self,
+        board: AbstractBoard,
+        switch_to: Optional[str] = None,
+        max_children: Optional[int] = None,
+        results_file: str = "sampling.json",
+    ) -> None:
+        """
+        :param board: The board to simulate, with a SimPoint or LoopPoint
+        workload set.
+        :param switch_to: The key of the detailed cores in the switchable
+        processor. If not set, the processor's `switch` function is used, as
+        for a `SimpleSwitchableProcessor`.
+        :param max_children: The maximum number of regions to simulate at the
+        same time. By default, the number of host CPUs.
+        :param results_file: The name of the JSON files the stats are written
+        to, in the output directory of the parent and of every region.
+        """
+
+        processor = board.get_processor()
+        if not isinstance(processor, SwitchableProcessor):
+            raise Exception(
+                "Forked sampling needs a board with a SwitchableProcessor."
+            )
+        if switch_to is None and not hasattr(processor, "switch"):
+            raise Exception(
+                "The key of the detailed cores must be given for processors "
+                "without a `switch` function."
+            )
+
+        self._board = board
+        self._processor = processor
+        self._switch_to = switch_to
+        self._max_children = max_children or os.cpu_count() or 1
+        self._results_file = results_file
+
+        self._simpoint = None
+        self._looppoint = None
+        try:
+            self._looppoint = board.get_looppoint()
+        except Exception:
+            try:
+                self._simpoint = board.get_simpoint()
+            except Exception:
+                pass
+
+        if self._simpoint is not None:
+            self._regions = self._simpoint_regions()
+        elif self._looppoint is not None:
+            self._regions = self._looppoint_regions()
+            # The PC counts are kept by the manager, so the trackers of the
+            # detailed cores carry on counting where the fast cores stopped.
+            current = self._processor.get_cores()
+            for core in self._processor._all_cores():
+                if core not in current:
+                    core.add_pc_tracker_probe(
+                        self._looppoint.get_targets(),
+                        self._looppoint.get_manager(),
+                    )
+        else:
+            raise Exception(
+                "Forked sampling needs a board with a SimPoint or LoopPoint "
+                "workload."
+            )
+
+        m5.disableAllListeners()
+
+        # The region simulated by this process, None in the parent
+        self._region = None
+        self._warming_up = False
+        self._forked = 0
+        # The running children, by pid
+        self._children = {}
+        self._region_stats = {}
+        self._failed = []
+
+        self._simulator = Simulator(
+            board=board,
+            on_exit_event={
+                ExitEvent.SIMPOINT_BEGIN: self._on_simpoint_begin(),
+                ExitEvent.MAX_INSTS: self._on_max_insts(),
+                ExitEvent.EXIT: self._on_exit(),
+            },
+        )
+
+    def _simpoint_regions(self) -> List[_Region]:
+        simpoint = self._simpoint
+        regions = [
+            _Region(
+                region_id=index,
+                weight=weight,
+                start=start,
+                warmup=warmup,
+                length=simpoint.get_simpoint_interval(),
+            )
+            for index, (start, warmup, weight) in enumerate(
+                zip(
+                    simpoint.get_simpoint_start_insts(),
+                    simpoint.get_warmup_list(),
+                    simpoint.get_weight_list(),
+                )
+            )
+        ]
+        # The SIMPOINT_BEGIN exit events come in order of instructions
+        return sorted(regions, key=lambda region: region.start)
+
+    def _looppoint_regions(self) -> List[_Region]:
+        return [
+            _Region(
+                region_id=region_id,
+                weight=region.get_multiplier(),
+                looppoint_region=region,
+            )
+            for region_id, region in self._looppoint.get_regions().items()
+        ]
+
+    def get_simulator(self) -> Simulator:
+        """Returns the simulator which fast-forwards through the workload."""
+        return self._simulator
+
+    def get_region_stats(self) -> Dict[Union[int, str], Dict[str, float]]:
+        """
+        Returns the value of each scalar stat of every region which was
+        simulated, by region id.
+        """
+        return self._region_stats
+
+    def run(self) -> Dict[str, float]:
+        """
+        Fast-forwards through the workload, simulating every region in a
+        child, and waits for all of them to finish.
+
+        :returns: The weighted sum of every scalar stat over the regions.
+        """
+
+        try:
+            self._simulator.run()
+        except BaseException:
+            if self._region is None:
+                raise
+            traceback.print_exc()
+            self._exit_child(1)
+
+        if self._region is not None:
+            self._exit_child(0)
+
+        if self._forked < len(self._regions):
+            missing = len(self._regions) - self._forked
+            warn(
+                f"The workload ended before {missing} of the sampled regions "
+                "were reached."
+            )
+
+        while self._children:
+            self._wait()
+
+        if self._failed:
+            raise Exception(
+                "The simulation of these regions failed: "
+                + ", ".join(str(region_id) for region_id in self._failed)
+            )
+
+        return write_region_stats(
+            os.path.join(m5.options.outdir, self._results_file),
+            self._region_stats,
+            {region.region_id: region.weight for region in self._regions},
+        )
+
+    def _region_outdir(self, region: _Region) -> str:
+        return os.path.join(m5.options.outdir, f"region{region.region_id}")
+
+    def _fork(self, region: _Region) -> None:
+        while len(self._children) >= self._max_children:
+            self._wait()
+
+        region.forked = True
+        self._forked += 1
+        # Don't let the child print what the parent has buffered
+        sys.stdout.flush()
+        sys.stderr.flush()
+        region_id = str(region.region_id).replace("%", "%%")
+        pid = m5.fork(os.path.join("%(parent)s", f"region{region_id}"))
+        if pid == 0:
+            self._region = region
+            self._children = {}
+            self._start_region()
+        else:
+            self._children[pid] = region
+
+    def _wait(self) -> None:
+        pid, status = os.waitpid(-1, 0)
+        region = self._children.pop(pid, None)
+        if region is None:
+            return
+        if not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+            self._failed.append(region.region_id)
+            return
+        path = os.path.join(self._region_outdir(region), self._results_file)
+        with open(path) as f:
+            self._region_stats[region.region_id] = json.load(f)
+
+    def _switch(self) -> None:
+        if self._switch_to is None:
+            self._processor.switch()
+        else:
+            self._processor.switch_to_processor(self._switch_to)
+
+    def _start_region(self) -> None:
+        self._switch()
+        m5.stats.reset()
+        region = self._region
+        if self._simpoint is not None:
+            # MAX_INSTS exit events are only scheduled for more than 0
+            # instructions.
+            self._warming_up = region.warmup > 0
+            self._simulator.schedule_max_insts(
+                region.warmup if self._warming_up else region.length
+            )
+        else:
+            self._warming_up = bool(region.looppoint_region.get_warmup())
+
+    def _end_warmup(self) -> None:
+        self._warming_up = False
+        m5.stats.reset()
+        if self._simpoint is not None:
+            self._simulator.schedule_max_insts(self._region.length)
+
+    def _end_region(self) -> None:
+        m5.stats.dump()
+        stats = scalar_stats(self._simulator.get_simstats().to_json())
+        with open(
+            os.path.join(m5.options.outdir, self._results_file), "w"
+        ) as f:
+            json.dump(stats, f, indent=4)
+
+    def _exit_child(self, code: int) -> None:
+        # Leave without running the rest of the configuration script, or the
+        # exit handlers which would dump the stats again.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        core.doExitCleanup()
+        os._exit(code)
+
+    def _all_forked(self) -> bool:
+        # A child has only just started its region
+        return self._region is None and self._forked == len(self._regions)
+
+    def _simpoint_reached(self) -> bool:
+        # There is an exit event for every distinct start, in order, so a
+        # child is forked for each of the SimPoints which start here. A child
+        # stops forking once it has its region.
+        if self._forked < len(self._regions):
+            start = self._regions[self._forked].start
+            while (
+                self._region is None
+                and self._forked < len(self._regions)
+                and self._regions[self._forked].start == start
+            ):
+                self._fork(self._regions[self._forked])
+        return self._all_forked()
+
+    def _looppoint_reached(self) -> bool:
+        region_id = self._looppoint.get_current_region()
+        for region in self._regions:
+            # A region is only forked the first time its start is reached
+            if region.region_id == region_id and not region.forked:
+                self._fork(region)
+                break
+        return self._all_forked()
+
+    def _region_pair_reached(self) -> bool:
+        if self._looppoint is None:
+            return False
+        region = self._region.looppoint_region
+        pair = self._looppoint.get_current_pair()
+        if self._warming_up:
+            if pair == region.get_warmup().get_end():
+                self._end_warmup()
+            return False
+        if pair == region.get_simulation().get_end().get_pc_count_pair():
+            self._end_region()
+            return True
+        return False
+
+    def _on_simpoint_begin(self):
+        while True:
+            if self._region is not None:
+                yield self._region_pair_reached()
+            elif self._simpoint is not None:
+                yield self._simpoint_reached()
+            else:
+                yield self._looppoint_reached()
+
+    def _on_max_insts(self):
+        while True:
+            if self._region is None:
+                yield False
+            elif self._warming_up:
+                self._end_warmup()
+                yield False
+            else:
+                self._end_region()
+                yield True
+
+    def _on_exit(self):
+        while True:
+            if self._region is not None:
+                warn(f"The workload ended in region {self._region.region_id}.")
+                self._end_region()
+            yield True
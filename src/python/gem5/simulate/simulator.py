@@ -27,10 +27,13 @@
 import m5
 import m5.ticks
 from m5.stats import addStatVisitor
+from m5.ext.pystats.jsonloader import JsonLoader
 from m5.ext.pystats.simstat import SimStat
 from m5.objects import Root
-from m5.util import warn
+from m5.util import inform, warn
 
+import atexit
+import json
 import os
 import sys
 from pathlib import Path
@@ -45,6 +48,7 @@ from .exit_event_generators import (
     dump_stats_generator,
 )
 from .exit_event import ExitEvent
+from .result_cache import FingerprintError, ResultCache, run_fingerprint
 from ..components.boards.abstract_board import AbstractBoard
 from ..components.processors.switchable_processor import SwitchableProcessor
 
@@ -87,6 +91,7 @@ class Simulator:
         ] = None,
         expected_execution_order: Optional[List[ExitEvent]] = None,
         checkpoint_path: Optional[Path] = None,
+        result_cache: Optional[Path] = None,
     ) -> None:
         """
         :param board: The board to be simulated.
@@ -107,6 +112,14 @@ class Simulator:
         checkpoint will be loaded. By default, the path is None. **This
         parameter is deprecated. Please set the checkpoint when setting the
         board's workload**.
+        :param result_cache: An optional directory to store the results of
+        completed simulations in. If set, when a simulation with the same
+        configuration, resources, gem5 build, exit event generators and
+        `run()` arguments has completed before, its stats and output files
+        are restored instead of simulating. See `result_cache.py` for what
+        is part of a simulation's fingerprint. Simulations whose exit event
+        generators hold values which can't be fingerprinted are not cached.
+        By default, no results are stored.
 
         `on_exit_event` usage notes
         ---------------------------
@@ -227,6 +240,19 @@ class Simulator:
 
         self._checkpoint_path = checkpoint_path
 
+        self._root = None
+        self._result_cache = (
+            ResultCache(result_cache) if result_cache else None
+        )
+        # The fingerprint of the simulation when its result is to be stored
+        self._fingerprint = None
+        # The max_ticks of every call to `run()`, in order
+        self._run_max_ticks = []
+        # The result of the simulation if it was restored from the cache
+        self._cached_result = None
+        # The result of the last `run()` which completed, to be stored
+        self._result = None
+
     def schedule_simpoint(self, simpoint_start_insts: List[int]) -> None:
         """
         Schedule SIMPOINT_BEGIN exit events
@@ -264,21 +290,29 @@ class Simulator:
 
         return self.get_simstats().to_json()
 
-    def get_simstats(self) -> SimStat:
+    def get_simstats(self, lazy: bool = False) -> SimStat:
         """
         Obtains the SimStat of the current simulation.
 
+        :param lazy: If True, statistics are only translated from gem5 when
+        they are accessed. This is much faster when only a few statistics are
+        read, e.g., `simulator.get_simstats(lazy=True)["board.processor..."]`.
+        False by default.
+
         :raises Exception: An exception is raised if this function is called
         before `run()`. The board must be initialized before obtaining
         statistics.
         """
 
+        if self._cached_result is not None:
+            return json.loads(self._cached_result["simstats"], cls=JsonLoader)
+
         if not self._instantiated:
             raise Exception(
                 "Cannot obtain simulation statistics prior to initialization."
             )
 
-        return m5.stats.gem5stats.get_simstat(self._root)
+        return m5.stats.gem5stats.get_simstat(self._root, lazy=lazy)
 
     def add_text_stats_output(self, path: str) -> None:
         """
@@ -333,12 +367,16 @@ class Simulator:
         """
         Returns the last exit event cause.
         """
+        if self._cached_result is not None:
+            return self._cached_result["last_exit_event_cause"]
         return self._last_exit_event.getCause()
 
     def get_current_tick(self) -> int:
         """
         Returns the current tick.
         """
+        if self._cached_result is not None:
+            return self._cached_result["tick"]
         return m5.curTick()
 
     def get_tick_stopwatch(self) -> List[Tuple[ExitEvent, int]]:
@@ -363,14 +401,14 @@ class Simulator:
 
         return to_return
 
-    def _instantiate(self) -> None:
+    def _create_root(self) -> None:
         """
-        This method will instantiate the board and carry out necessary
-        boilerplate code before the instantiation such as setting up root and
-        setting the sim_quantum (if running in KVM mode).
+        This method will carry out the necessary boilerplate code before the
+        instantiation of the board, such as setting up root and setting the
+        sim_quantum (if running in KVM mode).
         """
 
-        if not self._instantiated:
+        if self._root is None:
 
             # Before anything else we run the AbstractBoard's
             # `_pre_instantiate` function.
@@ -410,6 +448,15 @@ class Simulator:
                 m5.ticks.fixGlobalFrequency()
                 root.sim_quantum = m5.ticks.fromSeconds(0.001)
 
+    def _instantiate(self) -> None:
+        """
+        This method will instantiate the board, creating the root first if
+        needed.
+        """
+
+        if not self._instantiated:
+            self._create_root()
+
             # m5.instantiate() takes a parameter specifying the path to the
             # checkpoint directory. If the parameter is None, no checkpoint
             # will be restored.
@@ -432,6 +479,11 @@ class Simulator:
         run. If this max_ticks value is met, a MAX_TICK exit event is
         received, if another simulation exit event is met the tick count is
         reset. This is the **maximum number of ticks per simulation run**.
+
+        If the Simulator has a result cache and an identical simulation has
+        completed before, its results are restored instead of simulating.
+        The later calls to `run()` must then match those of the cached
+        simulation.
         """
 
         # Check to ensure no banned module has been imported.
@@ -443,6 +495,9 @@ class Simulator:
                     f"Reason: {self._banned_modules[banned_module]}"
                 )
 
+        if self._result_cache is not None and self._restore_result(max_ticks):
+            return
+
         # We instantiate the board if it has not already been instantiated.
         self._instantiate()
 
@@ -498,8 +553,113 @@ class Simulator:
             # If the generator returned True we will return from the Simulator
             # run loop.
             if exit_on_completion:
+                if self._fingerprint is not None:
+                    self._record_result()
                 return
 
+    def _restore_result(self, max_ticks: int) -> bool:
+        """
+        Looks the simulation up in the result cache when `run()` is first
+        called, and restores its results if it has completed before.
+
+        :returns: Whether the results of this call to `run()` were restored
+        from the cache.
+        """
+        self._run_max_ticks.append(max_ticks)
+
+        if self._cached_result is not None:
+            runs = self._cached_result["max_ticks"]
+            if self._run_max_ticks != runs[: len(self._run_max_ticks)]:
+                raise Exception(
+                    "The results of this simulation were restored from the "
+                    "result cache, whose simulation called `run()` "
+                    f"with max_ticks {runs}. It can't be continued with "
+                    f"{self._run_max_ticks}. Please disable the result "
+                    "cache for this simulation."
+                )
+            return True
+
+        if self._instantiated or len(self._run_max_ticks) > 1:
+            return False
+
+        # The configuration can only be fingerprinted once the parameters
+        # are final, which m5.instantiate() would otherwise do first. These
+        # passes are idempotent.
+        self._create_root()
+        m5.ticks.fixGlobalFrequency()
+        for obj in self._root.descendants():
+            obj.adoptOrphanParams()
+        for obj in self._root.descendants():
+            obj.unproxyParams()
+
+        try:
+            fingerprint = run_fingerprint(
+                root=self._root,
+                checkpoint=self._board._checkpoint or self._checkpoint_path,
+                on_exit_event=self._on_exit_event
+                if self._on_exit_event is not self._default_on_exit_dict
+                else None,
+                expected_execution_order=self._expected_execution_order,
+                max_ticks=max_ticks,
+            )
+        except FingerprintError as e:
+            warn(f"Not using the result cache for this simulation. {e}")
+            self._result_cache = None
+            return False
+
+        result = self._result_cache.load(fingerprint)
+        if result is None:
+            # The result is stored at exit, once the stats have been dumped
+            # and the output files closed. Exit handlers run in reverse
+            # order, and m5.simulate() registers its own the first time it
+            # is called.
+            self._fingerprint = fingerprint
+            atexit.register(self._store_result)
+            return False
+
+        options = m5.options
+        skip = []
+        if options.redirect_stdout:
+            skip.append(options.stdout_file)
+        if options.redirect_stderr:
+            skip.append(options.stderr_file)
+        self._result_cache.restore_outputs(fingerprint, options.outdir, skip)
+
+        self._cached_result = result
+        self._tick_stopwatch = [
+            (ExitEvent(exit_event), tick)
+            for exit_event, tick in result["tick_stopwatch"]
+        ]
+        inform(
+            "Restored the results of an identical simulation from the result "
+            f"cache ({fingerprint})."
+        )
+        return True
+
+    def _record_result(self) -> None:
+        """Record the result of the simulation when `run()` completes."""
+        self._result = {
+            "max_ticks": list(self._run_max_ticks),
+            "tick": self.get_current_tick(),
+            "last_exit_event_cause": self.get_last_exit_event_cause(),
+            "tick_stopwatch": [
+                (exit_event.value, tick)
+                for exit_event, tick in self._tick_stopwatch
+            ],
+            "simstats": self.get_simstats().dumps(),
+        }
+
+    def _store_result(self) -> None:
+        """Store the result of the simulation in the result cache, at exit."""
+        # Only simulations whose last call to `run()` completed are stored
+        if (
+            self._result is not None
+            and self._result["max_ticks"] == self._run_max_ticks
+        ):
+            self._result_cache.store(
+                self._fingerprint, self._result, m5.options.outdir
+            )
+
     def save_checkpoint(self, checkpoint_dir: Path) -> None:
         """
         This function will save the checkpoint to the specified directory.
@@ -36,12 +36,17 @@ class ByteCodeLoader(importlib.abc.Loader):
         self.code = code
 
     def exec_module(self, module):
-        exec(self.code, module.__dict__)
+        code = self.code
+        if callable(code):
+            code = code()
+        exec(code, module.__dict__)
 
 
 # Simple importer that allows python to import data from a dict of
 # code objects.  The keys are the module path, and the items are the
-# filename and bytecode of the file.
+# filename and bytecode of the file.  The bytecode can also be a function
+# returning the code object, which is only called when the module is
+# executed, so that modules which are never imported are never unmarshalled.
 class CodeImporter(object):
     def __init__(self):
         self.modules = {}
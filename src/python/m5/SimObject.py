@@ -38,7 +38,10 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
+import json
 import sys
+from bisect import bisect_left, bisect_right
 from types import FunctionType, MethodType, ModuleType
 from functools import wraps
 import inspect
@@ -118,6 +121,16 @@ instanceDict = {}
 # Did any of the SimObjects lack a header file?
 noCxxHeader = False
 
+# Generation counter for the configuration hierarchy. It is bumped
+# every time a parent/child link changes so that cached descendant
+# lists (see SimObject.descendants_list()) know when to rebuild.
+_hierarchy_generation = 0
+
+
+def invalidateDescendantsCache():
+    global _hierarchy_generation
+    _hierarchy_generation += 1
+
 
 def public_value(key, value):
     return key.startswith("_") or isinstance(
@@ -731,6 +744,8 @@ class SimObject(object, metaclass=MetaSimObject):
         self._name = None
         self._ccObject = None  # pointer to C++ object
         self._ccParams = None
+        self._descendants_cache = None
+        self._hierarchy_index = None
         self._instantiated = False  # really "cloned"
         self._init_called = True  # Checked so subclasses don't forget __init__
 
@@ -926,11 +941,13 @@ class SimObject(object, metaclass=MetaSimObject):
     def clear_parent(self, old_parent):
         assert self._parent is old_parent
         self._parent = None
+        invalidateDescendantsCache()
 
     # Also implemented by SimObjectVector
     def set_parent(self, parent, name):
         self._parent = parent
         self._name = name
+        invalidateDescendantsCache()
 
     # Return parent object of this SimObject, not implemented by
     # SimObjectVector because the elements in a SimObjectVector may not share
@@ -1016,6 +1033,23 @@ class SimObject(object, metaclass=MetaSimObject):
     def ini_str(self):
         return self.path()
 
+    # Return the index of the configuration tree this object belongs
+    # to. The index is stored on the topmost ancestor and rebuilt
+    # whenever the hierarchy changes.
+    def _get_hierarchy_index(self):
+        top = self
+        while isSimObject(top._parent):
+            top = top._parent
+        index = top._hierarchy_index
+        if index is None or index.generation != _hierarchy_generation:
+            index = _HierarchyIndex(top)
+            top._hierarchy_index = index
+        if not index.contains(self):
+            # Not reachable through its ancestors' children (e.g., a
+            # child that was refused by add_child()), so index it alone.
+            index = _HierarchyIndex(self)
+        return index
+
     def find_any(self, ptype):
         if isinstance(self, ptype):
             return self, True
@@ -1034,47 +1068,19 @@ class SimObject(object, metaclass=MetaSimObject):
                     )
                 found_obj = child
         # search param space
-        for pname, pdesc in self._params.items():
-            if issubclass(pdesc.ptype, ptype):
-                match_obj = self._values[pname]
-                if found_obj != None and found_obj != match_obj:
-                    raise AttributeError(
-                        "parent.any matched more than one: %s and %s"
-                        % (found_obj.path, match_obj.path)
-                    )
-                found_obj = match_obj
+        index = self._get_hierarchy_index()
+        for pname in index.param_names(type(self), ptype):
+            match_obj = self._values[pname]
+            if found_obj != None and found_obj != match_obj:
+                raise AttributeError(
+                    "parent.any matched more than one: %s and %s"
+                    % (found_obj.path, match_obj.path)
+                )
+            found_obj = match_obj
         return found_obj, found_obj != None
 
     def find_all(self, ptype):
-        all = {}
-        # search children
-        for child in self._children.values():
-            # a child could be a list, so ensure we visit each item
-            if isinstance(child, list):
-                children = child
-            else:
-                children = [child]
-
-            for child in children:
-                if (
-                    isinstance(child, ptype)
-                    and not isproxy(child)
-                    and not isNullPointer(child)
-                ):
-                    all[child] = True
-                if isSimObject(child):
-                    # also add results from the child itself
-                    child_all, done = child.find_all(ptype)
-                    all.update(dict(zip(child_all, [done] * len(child_all))))
-        # search param space
-        for pname, pdesc in self._params.items():
-            if issubclass(pdesc.ptype, ptype):
-                match_obj = self._values[pname]
-                if not isproxy(match_obj) and not isNullPointer(match_obj):
-                    all[match_obj] = True
-        # Also make sure to sort the keys based on the objects' path to
-        # ensure that the order is the same on all hosts
-        return sorted(all.keys(), key=lambda o: o.path()), True
+        return self._get_hierarchy_index().find_all(self, ptype), True
 
     def unproxy(self, base):
         return self
@@ -1169,6 +1175,40 @@ class SimObject(object, metaclass=MetaSimObject):
 
         return d
 
+    def get_config_digest(self, digests=None):
+        """
+        Returns a digest of what get_config_as_dict() would return, without
+        building the dictionary. The digest of each child is computed from
+        its own parameters and the digests of its children, so every subtree
+        is only serialized once. If digests is a dictionary, the digest of
+        every object in the subtree is recorded in it, by path.
+        """
+        h = hashlib.sha256()
+
+        def update(*values):
+            h.update(json.dumps(values, default=str).encode("utf-8"))
+            h.update(b"\0")
+
+        update(getattr(self, "type", None), getattr(self, "cxx_class", None))
+
+        for param in sorted(self._params.keys()):
+            value = self._values.get(param)
+            if value != None:
+                update(param, value.config_value())
+
+        for n in sorted(self._children.keys()):
+            update(n, self._children[n].get_config_digest(digests))
+
+        for port_name in sorted(self._ports.keys()):
+            port = self._port_refs.get(port_name, None)
+            if port != None:
+                update(port_name, port.get_config_as_dict())
+
+        digest = h.hexdigest()
+        if digests is not None:
+            digests[self.path()] = digest
+        return digest
+
     def getCCParams(self):
         if self._ccParams:
             return self._ccParams
@@ -1252,6 +1292,18 @@ class SimObject(object, metaclass=MetaSimObject):
             for obj in child.descendants():
                 yield obj
 
+    # Flattened, pre-order equivalent of descendants(). The list is
+    # cached on the object and only rebuilt when the configuration
+    # hierarchy has changed since it was last computed, so repeated
+    # walks over a large, stable tree (e.g., the phases of
+    # m5.instantiate()) don't have to recurse through _children again.
+    def descendants_list(self):
+        cache = self._descendants_cache
+        if cache is None or cache[0] != _hierarchy_generation:
+            cache = (_hierarchy_generation, list(self.descendants()))
+            self._descendants_cache = cache
+        return cache[1]
+
     # Call C++ to create C++ object corresponding to this object
     def createCCObject(self):
         if self.abstract:
@@ -1322,6 +1374,90 @@ class SimObject(object, metaclass=MetaSimObject):
         return eval(simobj_path, d)
 
 
+class _HierarchyIndex:
+    """Index of a configuration tree used to resolve Parent.any and
+    Parent.all/Self.all proxies without walking the tree for every
+    proxied parameter.
+
+    Objects are numbered in descendants() order, so the subtree rooted
+    at any object occupies a contiguous range of positions. The
+    positions of the objects (and SimObject-valued parameters) of a
+    given type are collected on first use, after which the matches
+    below any object are found with two bisections.
+    """
+
+    def __init__(self, top):
+        self.generation = _hierarchy_generation
+        self._order = []
+        self._span = {}
+        self._by_type = {}
+        self._param_names = {}
+        self._build(top)
+
+    def _build(self, obj):
+        start = len(self._order)
+        self._order.append(obj)
+        # Same traversal order as SimObject.descendants()
+        for name, child in sorted(obj._children.items()):
+            for item in child:
+                if isSimObject(item):
+                    self._build(item)
+        self._span[obj] = (start, len(self._order))
+
+    def contains(self, obj):
+        return obj in self._span
+
+    def param_names(self, cls, ptype):
+        key = (cls, ptype)
+        names = self._param_names.get(key)
+        if names is None:
+            names = [
+                pname
+                for pname, pdesc in cls._params.items()
+                if issubclass(pdesc.ptype, ptype)
+            ]
+            self._param_names[key] = names
+        return names
+
+    def _typed(self, ptype):
+        typed = self._by_type.get(ptype)
+        if typed is None:
+            obj_pos = []
+            param_pos = []
+            params = []
+            for pos, obj in enumerate(self._order):
+                if isinstance(obj, ptype):
+                    obj_pos.append(pos)
+                for pname in self.param_names(type(obj), ptype):
+                    param_pos.append(pos)
+                    params.append((obj, pname))
+            typed = (obj_pos, param_pos, params)
+            self._by_type[ptype] = typed
+        return typed
+
+    def find_all(self, obj, ptype):
+        obj_pos, param_pos, params = self._typed(ptype)
+        start, end = self._span[obj]
+
+        all = {}
+        # objects of the requested type strictly below obj
+        first = bisect_right(obj_pos, start)
+        last = bisect_left(obj_pos, end)
+        for pos in obj_pos[first:last]:
+            all[self._order[pos]] = True
+        # parameters of the requested type on obj and below. Their
+        # values are read now since unproxying may have changed them.
+        first = bisect_left(param_pos, start)
+        last = bisect_left(param_pos, end)
+        for owner, pname in params[first:last]:
+            match_obj = owner._values[pname]
+            if not isproxy(match_obj) and not isNullPointer(match_obj):
+                all[match_obj] = True
+        # Also make sure to sort the keys based on the objects' path to
+        # ensure that the order is the same on all hosts
+        return sorted(all.keys(), key=lambda o: o.path())
+
+
 # Function to provide to C++ so it can look up instances based on paths
 def resolveSimObject(name):
     obj = instanceDict[name]
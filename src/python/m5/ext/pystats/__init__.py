@@ -32,6 +32,8 @@ from .statistic import Statistic
 from .storagetype import StorageType
 from .timeconversion import TimeConversion
 from .jsonloader import JsonLoader
+from .deltabin import DeltaBinReader, DeltaBinWriter
+from .columnar import ColumnarStatsReader, ColumnarStatsWriter
 
 __all__ = [
     "AbstractStat",
@@ -42,4 +44,8 @@ __all__ = [
     "StorageType",
     "SerializableStat",
     "JsonLoader",
+    "DeltaBinReader",
+    "DeltaBinWriter",
+    "ColumnarStatsReader",
+    "ColumnarStatsWriter",
 ]
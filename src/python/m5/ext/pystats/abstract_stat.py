@@ -43,6 +43,8 @@ class AbstractStat(SerializableStat):
     All PyStats are JsonSerializable.
     """
 
+    __slots__ = ()
+
     def children(
         self,
         predicate: Optional[Callable[[str], bool]] = None,
@@ -62,8 +64,7 @@ class AbstractStat(SerializableStat):
         """
 
         to_return = []
-        for attr in self.__dict__:
-            obj = getattr(self, attr)
+        for attr, obj in list(self._stat_items()):
             if isinstance(obj, AbstractStat):
                 if (predicate and predicate(attr)) or not predicate:
                     to_return.append(obj)
@@ -95,3 +96,31 @@ class AbstractStat(SerializableStat):
         return self.children(
             lambda _name: re.match(pattern, _name), recursive=True
         )
+
+    def __getitem__(self, path: str) -> "AbstractStat":
+        """Get a stat by its path relative to this stat. Only the stats along
+        the path are accessed.
+
+        ```
+        >>> simstat["board.processor.cores0.core.ipc"]
+        ```
+
+        :param: path: The dot-separated names of the stats on the way to the
+                requested stat.
+        """
+        obj = self
+        names = path.split(".")
+        i = 0
+        while i < len(names):
+            # Stat names may contain dots themselves, so try joining the
+            # following components when a name is not found.
+            for j in range(i + 1, len(names) + 1):
+                child = getattr(obj, ".".join(names[i:j]), None)
+                # Only stats, not the methods and other attributes
+                if isinstance(child, AbstractStat):
+                    break
+            else:
+                raise KeyError(path)
+            obj = child
+            i = j
+        return obj
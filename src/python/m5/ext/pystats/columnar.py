@@ -0,0 +1,363 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Reader and writer for the columnar time-series stats format produced by the
+`columnar://` stat visitor.
+
+The file is laid out so that it can be memory-mapped and read directly into
+numpy arrays. All values are little-endian and every section is 8 byte
+aligned.
+
+* Header: an 8 byte magic string, a 32-bit format version and a 32-bit
+  column count, followed by the name of each column (a 16-bit length and
+  UTF-8 bytes), padded to a multiple of 8 bytes.
+* Row groups, one after the other. A row group holds a number of consecutive
+  dumps: a 32-bit row count `n` and 4 bytes of padding, the `n` 64-bit ticks
+  of the dumps, and then, for every column in order, its `n` 64-bit float
+  values.
+
+The row group headers form the index of the file: reading one stat across
+all the dumps only needs the row count of every group, not the values of the
+other stats.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import IO, Dict, List, Sequence, Tuple
+
+try:
+    import numpy
+
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
+MAGIC = b"gem5col\x00"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_NAME_LEN = struct.Struct("<H")
+_GROUP = struct.Struct("<I4x")
+
+# numpy equivalent of the array typecodes used in the file
+_dtypes = {"d": "<f8", "Q": "<u8"}
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+class ColumnarStatsWriter:
+    """
+    Writes stat dumps as rows of a columnar table, buffering
+    `rows_per_group` dumps in memory before writing them out as a row group.
+    """
+
+    def __init__(
+        self, fp: IO[bytes], names: Sequence[str], rows_per_group: int = 64
+    ):
+        """
+        Parameters
+        ----------
+
+        fp: IO[bytes]
+            A binary file object, opened for writing, to write the table to.
+
+        names: Sequence[str]
+            The name of every column (stat) in the table.
+
+        rows_per_group: int
+            The number of dumps per row group.
+        """
+
+        if rows_per_group < 1:
+            raise ValueError("A row group must hold at least one row")
+
+        self._fp = fp
+        self._num_columns = len(names)
+        self._rows_per_group = rows_per_group
+        self._ticks = array("Q")
+        self._rows = []
+
+        header = [_HEADER.pack(MAGIC, VERSION, len(names))]
+        for name in names:
+            encoded = name.encode("utf-8")
+            header.append(_NAME_LEN.pack(len(encoded)))
+            header.append(encoded)
+        header = b"".join(header)
+        self._fp.write(header + b"\0" * _padding(len(header)))
+
+    def write_row(self, tick: int, values: Sequence[float]) -> None:
+        """
+        Add one dump to the table.
+
+        Parameters
+        ----------
+
+        tick: int
+            The simulation tick of the dump.
+
+        values: Sequence[float]
+            The value of each column, in the order the names were given.
+        """
+
+        if len(values) != self._num_columns:
+            raise ValueError(
+                f"Expected {self._num_columns} values, got {len(values)}"
+            )
+        self._ticks.append(tick)
+        self._rows.append(array("d", values))
+        if len(self._rows) == self._rows_per_group:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered dumps out as a row group."""
+
+        if not self._rows:
+            return
+
+        rows = self._rows
+        num_rows = len(rows)
+        # Transpose the buffered rows into column chunks
+        columns = array("d", bytes(8 * num_rows * self._num_columns))
+        for r, row in enumerate(rows):
+            columns[r::num_rows] = row
+
+        ticks = self._ticks
+        if sys.byteorder != "little":
+            ticks.byteswap()
+            columns.byteswap()
+
+        self._fp.write(_GROUP.pack(num_rows))
+        self._fp.write(ticks.tobytes())
+        self._fp.write(columns.tobytes())
+        self._fp.flush()
+
+        self._ticks = array("Q")
+        self._rows = []
+
+
+class ColumnarStatsReader:
+    """
+    Reader for files written by `ColumnarStatsWriter`. Columns are returned
+    as numpy arrays when numpy is available, and as `array.array` otherwise.
+
+    Usage
+    -----
+    ```
+    from m5.ext.pystats.columnar import ColumnarStatsReader
+
+    with ColumnarStatsReader("m5out/stats.col") as reader:
+        ipc = reader["system.cpu.ipc"]
+        ticks = reader.ticks
+    ```
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            # Empty files can't be memory mapped
+            self._map = b""
+
+        try:
+            self._read_header(path)
+            self._read_index()
+        except:
+            self.close()
+            raise
+
+    def _read_header(self, path: str) -> None:
+        data = self._map
+        if len(data) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a columnar stats file")
+        magic, version, num_columns = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a columnar stats file")
+        if version != VERSION:
+            raise ValueError(
+                f"'{path}' has unsupported columnar version {version}"
+            )
+
+        offset = _HEADER.size
+        self._names = []
+        for _ in range(num_columns):
+            (length,) = _NAME_LEN.unpack_from(data, offset)
+            offset += _NAME_LEN.size
+            self._names.append(
+                bytes(data[offset : offset + length]).decode("utf-8")
+            )
+            offset += length
+        self._columns = {name: i for i, name in enumerate(self._names)}
+        self._data_offset = offset + _padding(offset)
+
+    def _read_index(self) -> None:
+        # (offset of the ticks, number of rows) of every row group
+        self._groups = []
+        self._num_rows = 0
+        num_columns = len(self._names)
+        offset = self._data_offset
+        end = len(self._map)
+        while offset + _GROUP.size <= end:
+            (num_rows,) = _GROUP.unpack_from(self._map, offset)
+            offset += _GROUP.size
+            size = 8 * num_rows * (num_columns + 1)
+            if offset + size > end:
+                # Truncated row group, e.g., the simulation is still running
+                break
+            self._groups.append((offset, num_rows))
+            self._num_rows += num_rows
+            offset += size
+
+    def _read(self, typecode: str, offset: int, count: int):
+        if _have_numpy:
+            return numpy.frombuffer(
+                self._map, dtype=_dtypes[typecode], count=count, offset=offset
+            )
+        values = array(typecode)
+        values.frombytes(self._map[offset : offset + 8 * count])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def _concatenate(self, chunks: List):
+        if _have_numpy:
+            if not chunks:
+                return numpy.empty(0)
+            return numpy.concatenate(chunks)
+        result = array(chunks[0].typecode if chunks else "d")
+        for chunk in chunks:
+            result.extend(chunk)
+        return result
+
+    @property
+    def names(self) -> List[str]:
+        """The names of all the stats in the file."""
+        return list(self._names)
+
+    @property
+    def ticks(self):
+        """The simulation tick of each dump."""
+        return self._concatenate(
+            [
+                self._read("Q", offset, num_rows)
+                for offset, num_rows in self._groups
+            ]
+        )
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str):
+        return self.stat(name)
+
+    def stat(self, name: str):
+        """
+        Get the value of a stat in every dump.
+
+        Parameters
+        ----------
+
+        name: str
+            The name of the stat.
+
+        Returns
+        -------
+        The values of the stat, one per dump.
+        """
+
+        column = self._columns[name]
+        return self._concatenate(
+            [
+                self._read("d", offset + 8 * num_rows * (column + 1), num_rows)
+                for offset, num_rows in self._groups
+            ]
+        )
+
+    def _locate(self, dump: int) -> Tuple[int, int, int]:
+        if dump < 0:
+            dump += self._num_rows
+        if not 0 <= dump < self._num_rows:
+            raise IndexError(f"Dump index {dump} out of range")
+        for offset, num_rows in self._groups:
+            if dump < num_rows:
+                return offset, num_rows, dump
+            dump -= num_rows
+
+    def dump(self, dump: int) -> Dict[str, float]:
+        """
+        Get the value of every stat in one dump.
+
+        Parameters
+        ----------
+
+        dump: int
+            The index of the dump. Negative values count from the last dump.
+        """
+
+        offset, num_rows, row = self._locate(dump)
+        values = array("d")
+        for column in range(len(self._names)):
+            start = offset + 8 * (num_rows * (column + 1) + row)
+            values.frombytes(self._map[start : start + 8])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return dict(zip(self._names, values))
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ColumnarStatsReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def load(path: str) -> Dict[str, object]:
+    """
+    Load every stat of a columnar stats file.
+
+    Returns
+    -------
+    Dict[str, object]
+        A map from stat name to its values, one per dump. The values are
+        numpy arrays when numpy is available.
+    """
+
+    with ColumnarStatsReader(path) as reader:
+        return {name: reader.stat(name) for name in reader.names}
@@ -0,0 +1,418 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Reader and writer for the delta-encoded binary stats format produced by the
+`deltabin://` stat visitor.
+
+A file starts with an 8 byte magic string and a 32-bit format version. The
+rest of the file is a sequence of records, each made of a one byte record
+type, a 32-bit payload length and the payload. All values are little-endian.
+
+* `S` (schema): a 32-bit count followed by that many names, each a 16-bit
+  length and UTF-8 bytes. Names are numbered in the order they appear in the
+  file. The first schema record names every stat of the first dump, later
+  ones only append stats that were not seen before.
+* `K` (keyframe) and `D` (delta): a 64-bit tick, a 32-bit entry count `n`,
+  `n` 32-bit stat indices and `n` 64-bit float values. A keyframe holds every
+  known stat, a delta only the stats whose value changed since the previous
+  dump.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import IO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"gem5dlt\x00"
+VERSION = 1
+
+SCHEMA = b"S"
+KEYFRAME = b"K"
+DELTA = b"D"
+
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct("<cI")
+_COUNT = struct.Struct("<I")
+_NAME_LEN = struct.Struct("<H")
+_DUMP = struct.Struct("<QI")
+
+assert array("I").itemsize == 4 and array("d").itemsize == 8
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _same(a: Optional[float], b: float) -> bool:
+    # NaN never compares equal to itself, but an unchanged NaN stat
+    # should not be written on every dump.
+    return a == b or (a != a and b != b)
+
+
+class DeltaBinWriter:
+    """
+    Writes a sequence of stat dumps, only recording the stats whose value
+    changed since the previous dump.
+    """
+
+    def __init__(self, fp: IO[bytes], keyframe_interval: int = 0):
+        """
+        Parameters
+        ----------
+
+        fp: IO[bytes]
+            A binary file object, opened for writing, to write the dumps to.
+
+        keyframe_interval: int
+            Write every stat, rather than only the changed ones, every
+            `keyframe_interval` dumps. This bounds the number of deltas a
+            reader has to apply to reconstruct a dump. The first dump is
+            always a keyframe. 0 (the default) disables periodic keyframes.
+        """
+
+        self._fp = fp
+        self._keyframe_interval = keyframe_interval
+        self._index = {}
+        self._values = []
+        self._num_dumps = 0
+        # Index list of the last names sequence written. Dumps usually
+        # pass the same sequence every time, so this saves a dict lookup
+        # per stat per dump.
+        self._last_names = None
+        self._last_indices = None
+
+        self._fp.write(_HEADER.pack(MAGIC, VERSION))
+
+    def _write_record(self, kind: bytes, payload: bytes) -> None:
+        self._fp.write(_RECORD.pack(kind, len(payload)))
+        self._fp.write(payload)
+
+    def _indices(self, names: Sequence[str]) -> List[int]:
+        if names is self._last_names:
+            return self._last_indices
+
+        new_names = []
+        indices = []
+        for name in names:
+            index = self._index.get(name)
+            if index is None:
+                index = len(self._values)
+                self._index[name] = index
+                self._values.append(None)
+                new_names.append(name)
+            indices.append(index)
+
+        if new_names:
+            payload = [_COUNT.pack(len(new_names))]
+            for name in new_names:
+                encoded = name.encode("utf-8")
+                payload.append(_NAME_LEN.pack(len(encoded)))
+                payload.append(encoded)
+            self._write_record(SCHEMA, b"".join(payload))
+
+        self._last_names = names
+        self._last_indices = indices
+        return indices
+
+    def write_dump(
+        self, tick: int, names: Sequence[str], values: Sequence[float]
+    ) -> None:
+        """
+        Write one stat dump.
+
+        Parameters
+        ----------
+
+        tick: int
+            The simulation tick of the dump.
+
+        names: Sequence[str]
+            The names of the stats in the dump. Passing the same sequence
+            object for every dump is cheaper than passing a new one.
+
+        values: Sequence[float]
+            The value of each of the stats in `names`.
+        """
+
+        assert len(names) == len(values)
+        indices = self._indices(names)
+        last = self._values
+
+        keyframe = self._num_dumps == 0 or (
+            self._keyframe_interval > 0
+            and self._num_dumps % self._keyframe_interval == 0
+        )
+
+        changed_indices = array("I")
+        changed_values = array("d")
+        for index, value in zip(indices, values):
+            value = float(value)
+            if keyframe or not _same(last[index], value):
+                last[index] = value
+                changed_indices.append(index)
+                changed_values.append(value)
+
+        if keyframe:
+            # Stats that are known but not part of this dump still have
+            # to be in a keyframe for it to be self contained.
+            present = set(indices)
+            for index, value in enumerate(last):
+                if index not in present and value is not None:
+                    changed_indices.append(index)
+                    changed_values.append(value)
+
+        self._write_record(
+            KEYFRAME if keyframe else DELTA,
+            _DUMP.pack(tick, len(changed_indices))
+            + _to_le(changed_indices)
+            + _to_le(changed_values),
+        )
+        self._fp.flush()
+        self._num_dumps += 1
+
+
+class DeltaBinReader:
+    """
+    Random access reader for files written by `DeltaBinWriter`.
+
+    Opening a file only scans the record headers. Dumps are reconstructed
+    on demand by applying deltas from the closest preceding keyframe, or
+    from the last reconstructed dump when reading forwards.
+
+    Usage
+    -----
+    ```
+    from m5.ext.pystats.deltabin import DeltaBinReader
+
+    with DeltaBinReader("m5out/stats.dlt") as reader:
+        for tick, dump in zip(reader.ticks, reader):
+            print(tick, dump["system.cpu.numCycles"])
+        ipc = reader.stat("system.cpu.ipc")
+    ```
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            # Empty files can't be memory mapped
+            self._map = b""
+
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a deltabin stats file")
+        magic, version = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a deltabin stats file")
+        if version != VERSION:
+            raise ValueError(
+                f"'{path}' has unsupported deltabin version {version}"
+            )
+
+        self._names = []
+        self._index = {}
+        # (payload offset, payload length, keyframe?, number of names
+        # defined when the dump was written) of every dump.
+        self._dumps = []
+        self._ticks = []
+        self._scan()
+
+        self._cached_dump = None
+        self._cached_values = None
+
+    def _scan(self) -> None:
+        data = self._map
+        offset = _HEADER.size
+        end = len(data)
+        while offset + _RECORD.size <= end:
+            kind, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > end:
+                # Truncated record, e.g., the simulation is still running
+                break
+            if kind == SCHEMA:
+                self._read_schema(offset)
+            elif kind in (KEYFRAME, DELTA):
+                (tick,) = struct.unpack_from("<Q", data, offset)
+                self._ticks.append(tick)
+                self._dumps.append(
+                    (offset, length, kind == KEYFRAME, len(self._names))
+                )
+            else:
+                raise ValueError(f"Unknown deltabin record type {kind!r}")
+            offset += length
+
+    def _read_schema(self, offset: int) -> None:
+        data = self._map
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            (length,) = _NAME_LEN.unpack_from(data, offset)
+            offset += _NAME_LEN.size
+            name = bytes(data[offset : offset + length]).decode("utf-8")
+            offset += length
+            self._index[name] = len(self._names)
+            self._names.append(name)
+
+    def _entries(self, dump: int) -> Tuple[array, array]:
+        offset, length, _, _ = self._dumps[dump]
+        _, count = _DUMP.unpack_from(self._map, offset)
+        start = offset + _DUMP.size
+        mid = start + 4 * count
+        indices = _from_le("I", self._map[start:mid])
+        values = _from_le("d", self._map[mid : mid + 8 * count])
+        return indices, values
+
+    def _values_at(self, dump: int) -> List[Optional[float]]:
+        if dump < 0:
+            dump += len(self._dumps)
+        if not 0 <= dump < len(self._dumps):
+            raise IndexError(f"Dump index {dump} out of range")
+
+        if self._cached_dump == dump:
+            return self._cached_values
+
+        start = dump
+        while not self._dumps[start][2]:
+            start -= 1
+
+        if self._cached_dump is not None and start <= self._cached_dump < dump:
+            # Continue from the last reconstructed dump
+            values = self._cached_values
+            start = self._cached_dump + 1
+        else:
+            values = []
+
+        num_names = self._dumps[dump][3]
+        values.extend([None] * (num_names - len(values)))
+        for d in range(start, dump + 1):
+            indices, dump_values = self._entries(d)
+            for index, value in zip(indices, dump_values):
+                values[index] = value
+
+        self._cached_dump = dump
+        self._cached_values = values
+        return values
+
+    @property
+    def names(self) -> List[str]:
+        """The names of all the stats in the file."""
+        return list(self._names)
+
+    @property
+    def ticks(self) -> List[int]:
+        """The simulation tick of each dump."""
+        return list(self._ticks)
+
+    def __len__(self) -> int:
+        return len(self._dumps)
+
+    def __getitem__(self, dump: int) -> Dict[str, float]:
+        return self.dump(dump)
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for dump in range(len(self)):
+            yield self.dump(dump)
+
+    def dump(self, dump: int) -> Dict[str, float]:
+        """
+        Reconstruct a full stat dump.
+
+        Parameters
+        ----------
+
+        dump: int
+            The index of the dump in the file. Negative values count from
+            the last dump.
+
+        Returns
+        -------
+        Dict[str, float]
+            The value of every stat known at the time of the dump.
+        """
+
+        values = self._values_at(dump)
+        return {
+            name: value
+            for name, value in zip(self._names, values)
+            if value is not None
+        }
+
+    def value(self, dump: int, name: str) -> Optional[float]:
+        """
+        Get the value of a single stat in a dump, or None if the stat was not
+        known at the time of the dump.
+        """
+
+        index = self._index[name]
+        values = self._values_at(dump)
+        return values[index] if index < len(values) else None
+
+    def stat(self, name: str) -> List[Optional[float]]:
+        """
+        Get the value of a stat in every dump. This only needs to look at
+        the entries of each dump, rather than reconstructing every dump.
+        """
+
+        index = self._index[name]
+        result = []
+        value = None
+        for dump, (_, _, keyframe, _) in enumerate(self._dumps):
+            if keyframe:
+                value = None
+            indices, values = self._entries(dump)
+            try:
+                value = values[indices.index(index)]
+            except ValueError:
+                pass
+            result.append(value)
+        return result
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "DeltaBinReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -29,7 +29,18 @@ from .simstat import SimStat
 from .statistic import Scalar, Distribution, Accumulator, Statistic
 from .group import Group, Vector
 import json
-from typing import IO, Union
+import re
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
 
 class JsonLoader(json.JSONDecoder):
@@ -48,7 +59,7 @@ class JsonLoader(json.JSONDecoder):
     """
 
     def __init__(self):
-        super().__init__(self, object_hook=self.__json_to_simstat)
+        super().__init__(object_hook=self.__json_to_simstat)
 
     def __json_to_simstat(self, d: dict) -> Union[SimStat, Statistic, Group]:
         if "type" in d:
@@ -97,3 +108,284 @@ def load(json_file: IO) -> SimStat:
 
     simstat_object = json.load(json_file, cls=JsonLoader)
     return simstat_object
+
+
+# The Statistic types which can be translated from their JSON objects
+_statistic_types = {
+    "Scalar": Scalar,
+    "Distribution": Distribution,
+    "Accumulator": Accumulator,
+}
+_statistic_classes = frozenset(_statistic_types.values())
+
+
+class _JsonStream:
+    """
+    A minimal pull parser over a JSON text stream. Only a window of the
+    stream is kept in memory. Values are decoded with the stdlib JSON
+    decoder.
+    """
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+    # A member name, its colon and the first character of its value
+    _member = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*(.)')
+
+    def __init__(self, fp: IO[str], chunk_size: int = 1 << 17):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Read at least `size` more characters, unless at the end of the
+        stream. Returns False if nothing could be read."""
+
+        if self._eof:
+            return False
+        # Drop what has been consumed already
+        self._buf = self._buf[self._pos :]
+        self._pos = 0
+        chunk = self._fp.read(max(size, self._chunk_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or '' at the end."""
+        while True:
+            self._pos = self._whitespace.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(0):
+                return ""
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def member(self) -> Tuple[str, str]:
+        """
+        Read the name of the next object member and its colon. Returns the
+        name and the first character of the value.
+        """
+
+        match = self._member.match(self._buf, self._pos)
+        if match is None:
+            # Escaped names, or a member cut off by the end of the window
+            name = self.decode()
+            self.expect(":")
+            return name, self.peek()
+        self._pos = match.start(2)
+        return match.group(1), match.group(2)
+
+    def decode(self) -> Any:
+        """Decode the next value."""
+        self.peek()
+        lookahead = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except JSONDecodeError:
+                # The value may be cut off by the end of the window
+                if self._fill(lookahead):
+                    lookahead *= 2
+                    continue
+                raise
+            if end == len(self._buf) and self._fill(lookahead):
+                # A number may continue after the end of the window
+                continue
+            self._pos = end
+            return value
+
+    def decode_object(self, decoder: json.JSONDecoder, limit: int) -> Any:
+        """
+        Decode the object starting at the next character with decoder, if
+        all of it is in the window once at least limit characters are read
+        ahead. Returns None otherwise, in which case nothing is consumed.
+        """
+
+        self.peek()
+        while len(self._buf) - self._pos < limit and self._fill(limit):
+            pass
+        try:
+            value, end = decoder.raw_decode(self._buf, self._pos)
+        except JSONDecodeError:
+            if self._eof:
+                # The rest of the file is in the window
+                raise
+            return None
+        self._pos = end
+        return value
+
+
+# Objects are decoded in one go if they fit in the window with at least this
+# many characters read ahead, larger ones are walked member by member.
+_decode_limit = 1 << 16
+
+
+def _make_statistic(d: Dict[str, Any]) -> Statistic:
+    # The members are those of a decoded object, which can be consumed
+    return _statistic_types[d.pop("type")](**d)
+
+
+def _statistic_hook(d: Dict[str, Any]) -> Union[Statistic, Dict[str, Any]]:
+    cls = _statistic_types.get(d.get("type"))
+    if cls is None:
+        return d
+    del d["type"]
+    return cls(**d)
+
+
+def iterload(
+    json_file: IO[str],
+    regex: Optional[Union[str, Pattern]] = None,
+    paths: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[str, Statistic]]:
+    """
+    Incrementally parses a JSON stats file, yielding its statistics while
+    they are read. Unlike `load`, neither the whole file nor the whole
+    stats hierarchy is held in memory, and statistics which are filtered out
+    are never translated into Statistic objects.
+
+    Parameters
+    ----------
+    json_file: IO[str]
+        The JSON stats file.
+
+    regex: Optional[Union[str, Pattern]]
+        If given, only the statistics whose dot-separated path matches this
+        regular expression (with `re.match`) are yielded.
+
+    paths: Optional[Iterable[str]]
+        If given, only the statistics with one of these paths, or within one
+        of the groups with these paths, are yielded.
+
+    Returns
+    -------
+    Iterator[Tuple[str, Statistic]]
+        The path and Statistic object of every selected statistic, in file
+        order.
+
+    Usage
+    -----
+    ```
+    import m5.ext.pystats as pystats
+
+    with open(path) as f:
+        for name, stat in pystats.jsonloader.iterload(f, regex=r".*ipc$"):
+            print(name, stat.value)
+    ```
+    """
+
+    if isinstance(regex, str):
+        regex = re.compile(regex)
+    if paths is not None:
+        paths = tuple(paths)
+        prefixes = tuple(p + "." for p in paths)
+        # The groups on the way to the selected paths
+        ancestors = {p[:i] for p in paths for i, c in enumerate(p) if c == "."}
+
+    def selected(path: str) -> bool:
+        if regex is not None and not regex.match(path):
+            return False
+        if paths is not None:
+            return path in paths or path.startswith(prefixes)
+        return True
+
+    def wanted(path: str) -> bool:
+        # Whether an object may hold selected statistics
+        return (
+            paths is None
+            or path in ancestors
+            or path in paths
+            or path.startswith(prefixes)
+        )
+
+    select_all = regex is None and paths is None
+
+    def collect(path: str, members: Dict[str, Any], found: list) -> None:
+        # Walk a group that was decoded in one go. Its statistics were
+        # translated by the decoder, unless only some are selected by the
+        # regex, in which case they are translated here.
+        prefix = f"{path}." if path else ""
+        for key, member in members.items():
+            kind = type(member)
+            if kind is dict:
+                child = prefix + key
+                if member.get("type") in _statistic_types:
+                    if selected(child):
+                        found.append((child, _make_statistic(member)))
+                elif wanted(child):
+                    collect(child, member, found)
+            elif kind in _statistic_classes:
+                child = prefix + key
+                if select_all or selected(child):
+                    found.append((child, member))
+
+    stream = _JsonStream(json_file)
+    plain_decoder = json.JSONDecoder()
+    # Translating the statistics while decoding is the fastest, but only
+    # objects whose statistics are all selected are decoded this way.
+    statistic_decoder = json.JSONDecoder(object_hook=_statistic_hook)
+
+    def decoder(path: str) -> json.JSONDecoder:
+        if regex is None and (paths is None or selected(path)):
+            return statistic_decoder
+        return plain_decoder
+
+    # Each entry is the path of an object being parsed, its non-object
+    # members, and whether it may hold selected statistics. Objects are only
+    # known to be statistics once all their members (including "type") are
+    # read.
+    stack = []
+    stream.expect("{")
+    stack.append(("", {}, True))
+    while stack:
+        char = stream.peek()
+        if char == ",":
+            stream.advance()
+            continue
+        if char == "}":
+            stream.advance()
+            path, members, keep = stack.pop()
+            if (
+                keep
+                and members.get("type") in _statistic_types
+                and selected(path)
+            ):
+                yield path, _make_statistic(members)
+            continue
+
+        key, char = stream.member()
+        parent, members, keep = stack[-1]
+        path = f"{parent}.{key}" if parent else key
+        if char != "{":
+            value = stream.decode()
+            if keep:
+                members[key] = value
+            continue
+
+        keep = keep and wanted(path)
+        # Small objects, e.g., statistics or the groups of a core, are
+        # decoded with a single call into the stdlib JSON decoder. Those
+        # which are filtered out by path are dropped once decoded.
+        value = stream.decode_object(
+            decoder(path) if keep else plain_decoder, _decode_limit
+        )
+        if value is None:
+            stream.advance()
+            stack.append((path, {}, keep))
+        elif not keep:
+            continue
+        else:
+            found = []
+            collect(parent, {key: value}, found)
+            yield from found
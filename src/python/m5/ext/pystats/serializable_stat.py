@@ -25,8 +25,9 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from datetime import datetime
+from functools import lru_cache
 import json
-from typing import Dict, List, Union, Any, IO
+from typing import Dict, Iterator, List, Tuple, Union, Any, IO
 
 from .storagetype import StorageType
 
@@ -46,6 +47,25 @@ class SerializableStat:
     ```
     """
 
+    # Stats with a fixed set of attributes (e.g., `Statistic`) keep them in
+    # `__slots__` to save memory when loading large numbers of stats, others
+    # keep them in `__dict__`.
+    __slots__ = ()
+
+    def _stat_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterates over the (name, value) pairs of the attributes of this stat,
+        wherever they are stored.
+        """
+
+        for name in _slot_names(type(self)):
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                # Unset slot
+                pass
+        yield from getattr(self, "__dict__", {}).items()
+
     def to_json(self) -> Dict:
         """
         Translates the current object into a JSON dictionary.
@@ -57,7 +77,7 @@ class SerializableStat:
         """
 
         model_dct = {}
-        for key, value in self.__dict__.items():
+        for key, value in self._stat_items():
             new_value = self.__process_json_value(value)
             model_dct[key] = new_value
         return model_dct
@@ -166,3 +186,15 @@ class SerializableStat:
             kwargs["indent"] = 4
 
         json.dump(obj=self.to_json(), fp=fp, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """The names of the `__slots__` of a class and its bases, bases first."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(n for n in slots if n not in ("__dict__", "__weakref__"))
+    return tuple(names)
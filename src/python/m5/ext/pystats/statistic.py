@@ -36,6 +36,8 @@ class Statistic(ABC, AbstractStat):
     The abstract base class for all Python statistics.
     """
 
+    __slots__ = ("value", "type", "unit", "description", "datatype")
+
     value: Any
     type: Optional[str]
     unit: Optional[str]
@@ -65,6 +67,8 @@ class Scalar(Statistic):
     A scalar Python statistic type.
     """
 
+    __slots__ = ()
+
     value: Union[float, int]
 
     def __init__(
@@ -88,6 +92,8 @@ class BaseScalarVector(Statistic):
     An abstract base class for classes containing a vector of Scalar values.
     """
 
+    __slots__ = ()
+
     value: List[Union[int, float]]
 
     def __init__(
@@ -145,6 +151,18 @@ class Distribution(BaseScalarVector):
     It is assumed each bucket is of equal size.
     """
 
+    __slots__ = (
+        "min",
+        "max",
+        "num_bins",
+        "bin_size",
+        "sum",
+        "underflow",
+        "overflow",
+        "logs",
+        "sum_squared",
+    )
+
     min: Union[float, int]
     max: Union[float, int]
     num_bins: int
@@ -199,6 +217,8 @@ class Accumulator(BaseScalarVector):
     A statistical type representing an accumulator.
     """
 
+    __slots__ = ("_count", "min", "max", "sum_squared")
+
     _count: int
     min: Union[int, float]
     max: Union[int, float]
@@ -0,0 +1,356 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Query engine for the text stats files (`stats.txt`) written by the `text://`
+stat visitor.
+
+A file is memory-mapped and only the dump boundaries are located when it is
+opened. A dump is indexed the first time one of its stats is queried: a
+single regular expression pass over the dump extracts every stat name and
+value, and the values are converted to floats in one go. Later queries are
+answered from the index without reading the file again.
+
+Lines printed with the `oneline` stat flag, which hold several values, are
+not indexed.
+
+The module can also be run as a script to query all the `stats.txt` files of
+a directory of runs:
+
+```
+python -m m5.ext.pystats.statstxt runs/ --regex 'board.processor.*ipc'
+```
+"""
+
+import argparse
+import mmap
+import os
+import re
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Union
+
+try:
+    import numpy
+
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
+BEGIN = b"---------- Begin Simulation Statistics ----------"
+END = b"---------- End Simulation Statistics   ----------"
+
+# The name and value at the start of a stat line
+_stat_line = re.compile(
+    rb"^([^\s#-]\S*)[ \t]+"
+    rb"([-+]?(?:[0-9.]+(?:[eE][-+]?[0-9]+)?|nan|inf))(?=\s|$)",
+    re.MULTILINE,
+)
+
+
+def _to_floats(values: List[bytes]):
+    if _have_numpy:
+        return numpy.array(values, dtype=bytes).astype(numpy.float64)
+    return array("d", map(float, values))
+
+
+class _DumpIndex:
+    """The names and values of the stats of one dump."""
+
+    __slots__ = ("names", "values", "positions")
+
+    def __init__(self, data: bytes):
+        matches = _stat_line.findall(data)
+        if matches:
+            names, values = zip(*matches)
+            self.names = b"\n".join(names).decode("utf-8").split("\n")
+            self.values = _to_floats(values)
+        else:
+            self.names = []
+            self.values = _to_floats([])
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+
+class StatsTxtFile:
+    """
+    Reader for the `stats.txt` files written by the text stat visitor.
+    Values are returned as numpy arrays when numpy is available, and as
+    `array.array` otherwise.
+
+    Usage
+    -----
+    ```
+    from m5.ext.pystats.statstxt import StatsTxtFile
+
+    with StatsTxtFile("m5out/stats.txt") as stats:
+        ipc = stats.stat("board.processor.cores.core.ipc")
+        caches = stats.match(r".*cache.*missRate", dump=-1)
+    ```
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            # Empty files can't be memory mapped
+            self._map = b""
+
+        # (start, end) offsets of every dump
+        self._dumps = []
+        self._scan()
+        self._indices = [None] * len(self._dumps)
+
+    def _scan(self) -> None:
+        data = self._map
+        offset = data.find(BEGIN)
+        while offset >= 0:
+            start = offset + len(BEGIN)
+            end = data.find(END, start)
+            if end < 0:
+                # Unterminated dump, e.g., the simulation is still running.
+                # Only keep its complete lines.
+                end = data.rfind(b"\n", start) + 1
+                self._dumps.append((start, max(start, end)))
+                break
+            self._dumps.append((start, end))
+            offset = data.find(BEGIN, end + len(END))
+
+    def _dump_number(self, dump: int) -> int:
+        if dump < 0:
+            dump += len(self._dumps)
+        if not 0 <= dump < len(self._dumps):
+            raise IndexError(f"Dump index {dump} out of range")
+        return dump
+
+    def _index(self, dump: int) -> _DumpIndex:
+        dump = self._dump_number(dump)
+        index = self._indices[dump]
+        if index is None:
+            start, end = self._dumps[dump]
+            index = _DumpIndex(self._map[start:end])
+            self._indices[dump] = index
+        return index
+
+    def _find(self, dump: int, name: str) -> float:
+        # Look a single stat up without indexing the whole dump
+        start, end = self._dumps[dump]
+        offset = self._map.find(
+            b"\n" + name.encode("utf-8") + b" ", start, end
+        )
+        if offset >= 0:
+            line_end = self._map.find(b"\n", offset + 1, end)
+            match = _stat_line.match(
+                self._map[offset + 1 : line_end if line_end >= 0 else end]
+            )
+            if match and match.group(1).decode("utf-8") == name:
+                return float(match.group(2))
+        return float("nan")
+
+    def __len__(self) -> int:
+        """The number of dumps in the file."""
+        return len(self._dumps)
+
+    def __getitem__(self, name: str):
+        return self.stat(name)
+
+    def names(self, dump: int = 0) -> List[str]:
+        """
+        Get the names of the stats of a dump, in file order.
+
+        Parameters
+        ----------
+
+        dump: int
+            The index of the dump. Negative values count from the last dump.
+        """
+
+        return list(self._index(dump).names)
+
+    def dump(self, dump: int) -> Dict[str, float]:
+        """
+        Get the value of every stat in one dump.
+
+        Parameters
+        ----------
+
+        dump: int
+            The index of the dump. Negative values count from the last dump.
+        """
+
+        index = self._index(dump)
+        return dict(zip(index.names, index.values))
+
+    def stat(self, name: str):
+        """
+        Get the value of a stat in every dump.
+
+        Parameters
+        ----------
+
+        name: str
+            The name of the stat.
+
+        Returns
+        -------
+        The values of the stat, one per dump. The value is NaN in the dumps
+        which don't have the stat.
+        """
+
+        values = []
+        for dump, index in enumerate(self._indices):
+            if index is None:
+                values.append(self._find(dump, name))
+            else:
+                position = index.positions.get(name)
+                values.append(
+                    float("nan")
+                    if position is None
+                    else index.values[position]
+                )
+        if _have_numpy:
+            return numpy.array(values, dtype=numpy.float64)
+        return array("d", values)
+
+    def match(
+        self, regex: Union[str, Pattern], dump: int = -1
+    ) -> Dict[str, float]:
+        """
+        Get the stats of a dump whose names match a regular expression.
+
+        Parameters
+        ----------
+
+        regex: Union[str, Pattern]
+            The regular expression, matched against the start of the names
+            (with `re.match`).
+
+        dump: int
+            The index of the dump. Negative values count from the last dump.
+            Defaults to the last dump.
+        """
+
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        index = self._index(dump)
+        return {
+            name: index.values[i]
+            for i, name in enumerate(index.names)
+            if regex.match(name)
+        }
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "StatsTxtFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def find_stats_files(
+    paths: Sequence[str], filename: str = "stats.txt"
+) -> Iterator[str]:
+    """
+    Find the stats files in the given files and directories. Directories are
+    searched recursively for files called `filename`.
+    """
+
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            if filename in filenames:
+                yield os.path.join(dirpath, filename)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Query the stats.txt files of one or more gem5 runs. "
+        "Prints one tab-separated line per value: the stats file, the dump "
+        "index, the stat name and its value."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Stats files, or directories to search for stats files",
+    )
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        "--stat",
+        action="append",
+        help="Name of a stat to print. May be given more than once.",
+    )
+    query.add_argument(
+        "--regex",
+        help="Print the stats whose names match this regular expression",
+    )
+    parser.add_argument(
+        "--dump",
+        type=int,
+        default=None,
+        help="Only print this dump. Negative values count from the last "
+        "dump. By default, every dump is printed.",
+    )
+    parser.add_argument(
+        "--filename",
+        default="stats.txt",
+        help="Name of the stats files searched for in directories "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    regex = re.compile(args.regex) if args.regex else None
+    for path in find_stats_files(args.paths, args.filename):
+        with StatsTxtFile(path) as stats:
+            if args.dump is None:
+                dumps = range(len(stats))
+            elif -len(stats) <= args.dump < len(stats):
+                dumps = [args.dump % len(stats)]
+            else:
+                continue
+
+            if regex is None:
+                columns = {name: stats.stat(name) for name in args.stat}
+                for dump in dumps:
+                    for name, values in columns.items():
+                        print(f"{path}\t{dump}\t{name}\t{values[dump]}")
+            else:
+                for dump in dumps:
+                    for name, value in stats.match(regex, dump).items():
+                        print(f"{path}\t{dump}\t{name}\t{value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
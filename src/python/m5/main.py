@@ -242,6 +242,13 @@ def parse_options():
         help="Create DOT & pdf outputs of the DVFS configuration"
         + " [Default: %default]",
     )
+    option(
+        "--instantiate-profile",
+        metavar="FILE",
+        default=None,
+        help="Write a per-phase timing breakdown of m5.instantiate() to "
+        "FILE [Default: %default]",
+    )
 
     # Debugging options
     group("Debugging Options")
@@ -443,8 +450,12 @@ def main():
         debug.help()
 
     if options.list_sim_objects:
-        from . import SimObject
+        from . import (
+            SimObject,
+            objects,
+        )
 
+        objects.load_all()
         done = True
         print("SimObjects:")
         objects = list(SimObject.allClasses.keys())
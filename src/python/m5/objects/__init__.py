@@ -24,6 +24,84 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-for module in __spec__.loader_state:
-    if module.startswith("m5.objects."):
-        exec(f"from {module} import *")
+
+# The SimObject modules are imported lazily. The first time a name is looked
+# up, only the module it comes from is imported, as found in the index
+# generated at build time by sim_object_index.py. That's the SimObject module
+# defining it, or the module a SimObject module imports it from, e.g.,
+# m5.params for AddrRange. Every module is imported for names which aren't in
+# the index, for `from m5.objects import *`, and when there is no index.
+
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
+try:
+    from m5.objects._names import names as _names
+except ImportError:
+    _names = None
+
+_names_module = f"{__name__}._names"
+_loaded_all = False
+
+
+def load_all():
+    """Import every SimObject module into the m5.objects namespace."""
+    global _loaded_all
+    if _loaded_all:
+        return
+    _loaded_all = True
+    for module in __spec__.loader_state:
+        if module.startswith("m5.objects.") and module != _names_module:
+            exec(f"from {module} import *", globals())
+
+
+def __getattr__(name):
+    if name == "__all__":
+        # Used by `from m5.objects import *`, which gets everything
+        load_all()
+        return [n for n in globals() if n[0] != "_" and n != "load_all"]
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    modpath = _names.get(name) if _names else None
+    if modpath is not None:
+        try:
+            value = getattr(_importlib.import_module(modpath), name)
+        except AttributeError:
+            # e.g., a submodule which is only bound once it's imported
+            pass
+        else:
+            globals()[name] = value
+            return value
+
+    load_all()
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_names or ()))
+
+
+class _ObjectsModule(_types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to its name in this package, which
+        # would hide the SimObject it defines, e.g., m5.objects.BaseCPU.
+        if (
+            isinstance(value, _types.ModuleType)
+            and value.__name__ == f"{__name__}.{name}"
+            and name in _names
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+if _names is None:
+    load_all()
+else:
+    _sys.modules[__name__].__class__ = _ObjectsModule
@@ -183,8 +183,14 @@ class ParamDesc(object):
 
     def __getattr__(self, attr):
         if attr == "ptype":
-            from . import SimObject
+            from . import (
+                SimObject,
+                objects,
+            )
 
+            if self.ptype_str not in SimObject.allClasses:
+                # The module defining the class may not have been imported
+                getattr(objects, self.ptype_str, None)
             ptype = SimObject.allClasses[self.ptype_str]
             assert isSimObjectClass(ptype)
             self.ptype = ptype
@@ -307,6 +313,9 @@ class SimObjectVector(VectorParamValue):
             a.append(v.get_config_as_dict())
         return a
 
+    def get_config_digest(self, digests=None):
+        return [v.get_config_digest(digests) for v in self]
+
     # If we are replacing an item in the vector, make sure to set the
     # parent reference of the new SimObject to be the same as the parent
     # of the SimObject being replaced. Useful to have if we created
@@ -40,6 +40,7 @@
 import atexit
 import os
 import sys
+import time
 
 # import the wrapped C++ functions
 import _m5.drain
@@ -64,6 +65,27 @@ _drain_manager = _m5.drain.DrainManager.instance()
 
 _instantiated = False  # Has m5.instantiate() been called?
 
+
+class _PhaseProfile:
+    """Collect the wall-clock time spent in each phase of instantiate()."""
+
+    def __init__(self):
+        self._phases = []
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    def write(self, out):
+        total = sum(t for _, t in self._phases)
+        for phase, t in self._phases:
+            pct = 100.0 * t / total if total else 0.0
+            print(f"{phase:<24} {t:12.6f}s {pct:6.2f}%", file=out)
+        print(f"{'total':<24} {total:12.6f}s", file=out)
+
+
 # The final call to instantiate the SimObject graph and initialize the
 # system.
 def instantiate(ckpt_dir=None):
@@ -80,24 +102,37 @@ def instantiate(ckpt_dir=None):
     if not root:
         fatal("Need to instantiate Root() before calling instantiate()")
 
+    profile = _PhaseProfile()
+
     # we need to fix the global frequency
     ticks.fixGlobalFrequency()
 
     # Make sure SimObject-valued params are in the configuration
-    # hierarchy so we catch them with future descendants() walks
+    # hierarchy so we catch them with future descendants() walks. This
+    # walk has to use the live generator since adopting orphans adds
+    # children to the objects as they are visited.
     for obj in root.descendants():
         obj.adoptOrphanParams()
+    profile.mark("adoptOrphanParams")
+
+    # The hierarchy is normally fixed from here on, so all of the
+    # following passes share a single flattened walk. It is rebuilt
+    # automatically should any of the passes change the hierarchy.
+    root.descendants_list()
+    profile.mark("flatten")
 
     # Unproxy in sorted order for determinism
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.unproxyParams()
+    profile.mark("unproxyParams")
 
     if options.dump_config:
         ini_file = open(os.path.join(options.outdir, options.dump_config), "w")
         # Print ini sections in sorted order for easier diffing
-        for obj in sorted(root.descendants(), key=lambda o: o.path()):
+        for obj in sorted(root.descendants_list(), key=lambda o: o.path()):
             obj.print_ini(ini_file)
         ini_file.close()
+        profile.mark("print_ini")
 
     if options.json_config:
         try:
@@ -111,41 +146,50 @@ def instantiate(ckpt_dir=None):
             json_file.close()
         except ImportError:
             pass
+        profile.mark("json_config")
 
     if options.dot_config:
         do_dot(root, options.outdir, options.dot_config)
         do_ruby_dot(root, options.outdir, options.dot_config)
+        profile.mark("dot_config")
 
     # Initialize the global statistics
     stats.initSimStats()
 
     # Create the C++ sim objects and connect ports
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.createCCObject()
-    for obj in root.descendants():
+    profile.mark("createCCObject")
+    for obj in root.descendants_list():
         obj.connectPorts()
+    profile.mark("connectPorts")
 
     # Do a second pass to finish initializing the sim objects
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.init()
+    profile.mark("init")
 
     # Do a third pass to initialize statistics
     stats._bindStatHierarchy(root)
     root.regStats()
+    profile.mark("regStats")
 
     # Do a fourth pass to initialize probe points
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.regProbePoints()
+    profile.mark("regProbePoints")
 
     # Do a fifth pass to connect probe listeners
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.regProbeListeners()
+    profile.mark("regProbeListeners")
 
     # We want to generate the DVFS diagram for the system. This can only be
     # done once all of the CPP objects have been created and initialised so
     # that we are able to figure out which object belongs to which domain.
     if options.dot_dvfs_config:
         do_dvfs_dot(root, options.outdir, options.dot_dvfs_config)
+        profile.mark("dot_dvfs_config")
 
     # We're done registering statistics.  Enable the stats package now.
     stats.enable()
@@ -154,16 +198,24 @@ def instantiate(ckpt_dir=None):
     if ckpt_dir:
         _drain_manager.preCheckpointRestore()
         ckpt = _m5.core.getCheckpoint(ckpt_dir)
-        for obj in root.descendants():
+        for obj in root.descendants_list():
             obj.loadState(ckpt)
+        profile.mark("loadState")
     else:
-        for obj in root.descendants():
+        for obj in root.descendants_list():
             obj.initState()
+        profile.mark("initState")
 
     # Check to see if any of the stat events are in the past after resuming from
     # a checkpoint, If so, this call will shift them to be at a valid time.
     updateStatEvents()
 
+    if options.instantiate_profile:
+        with open(
+            os.path.join(options.outdir, options.instantiate_profile), "w"
+        ) as profile_file:
+            profile.write(profile_file)
+
 
 need_startup = True
 
@@ -177,7 +229,7 @@ def simulate(*args, **kwargs):
 
     if need_startup:
         root = objects.Root.getInstance()
-        for obj in root.descendants():
+        for obj in root.descendants_list():
             obj.startup()
         need_startup = False
 
@@ -299,12 +351,12 @@ def drain():
 
 
 def memWriteback(root):
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.memWriteback()
 
 
 def memInvalidate(root):
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.memInvalidate()
 
 
@@ -411,7 +463,7 @@ def switchCpus(system, cpuList, verbose=True):
 
 
 def notifyFork(root):
-    for obj in root.descendants():
+    for obj in root.descendants_list():
         obj.notifyFork()
 
 
@@ -42,7 +42,11 @@ import m5
 import _m5.stats
 from m5.objects import Root
 from m5.params import isNullPointer
-from .gem5stats import JsonOutputVistor
+from .gem5stats import (
+    JsonOutputVistor,
+    DeltaBinOutputVisitor,
+    ColumnarOutputVisitor,
+)
 from m5.util import attrdict, fatal
 
 # Stat exports
@@ -198,6 +202,50 @@ def _jsonFactory(fn):
     return JsonOutputVistor(fn)
 
 
+@_url_factory(["deltabin"])
+def _deltabinFactory(fn, keyframe=0):
+    """Output stats in a delta-encoded binary format.
+
+    Only the stats that changed since the previous dump are written,
+    which keeps frequent periodic dumps cheap. The first dump writes
+    every stat together with a schema naming them. Files can be read
+    with m5.ext.pystats.deltabin.DeltaBinReader.
+
+    Parameters:
+      * keyframe (unsigned): Write every stat each N dumps to speed up
+                             random access (default: 0, first dump only)
+
+    Example:
+      deltabin://stats.dlt?keyframe=100
+
+    """
+
+    return DeltaBinOutputVisitor(fn, keyframe)
+
+
+@_url_factory(["columnar"])
+def _columnarFactory(fn, rows_per_group=64):
+    """Output stats as a columnar time series.
+
+    Every stat is stored as a column and every dump as a row, with
+    consecutive dumps grouped together so that a single stat can be
+    read across all the dumps without reading the other stats. The
+    file uses a plain binary layout that can be memory-mapped, e.g.,
+    by numpy. Files can be read with
+    m5.ext.pystats.columnar.ColumnarStatsReader.
+
+    Parameters:
+      * rows_per_group (unsigned): Number of dumps buffered and written
+                                   together (default: 64)
+
+    Example:
+      columnar://stats.col?rows_per_group=256
+
+    """
+
+    return ColumnarOutputVisitor(fn, rows_per_group)
+
+
 def addStatVisitor(url):
     """Add a stat visitor specified using a URL string
 
@@ -414,7 +462,10 @@ def dump(roots=None):
         prepare()
 
     for output in outputList:
-        if isinstance(output, JsonOutputVistor):
+        if isinstance(
+            output,
+            (JsonOutputVistor, DeltaBinOutputVisitor, ColumnarOutputVisitor),
+        ):
             if not all_roots:
                 output.dump(Root.getInstance())
             else:
@@ -29,15 +29,20 @@ This serves as the bridge between the gem5 statistics exposed via PyBind11 and
 the Python Stats model.
 """
 
+import atexit
+import os
 from datetime import datetime
-from typing import IO, List, Union
+from typing import IO, List, Tuple, Union
 
 import _m5.stats
+from _m5.core import curTick
 from m5.objects import *
 from m5.ext.pystats.group import *
 from m5.ext.pystats.simstat import *
 from m5.ext.pystats.statistic import *
 from m5.ext.pystats.storagetype import *
+from m5.ext.pystats.columnar import ColumnarStatsWriter
+from m5.ext.pystats.deltabin import DeltaBinWriter
 
 
 class JsonOutputVistor:
@@ -84,6 +89,232 @@ class JsonOutputVistor:
             simstat.dump(fp=fp, **self.json_args)
 
 
+class _FlatStatsVisitor:
+    """
+    Base class of the Python stat visitors that write the stats as a flat
+    list of named values.
+    """
+
+    file: str
+
+    def __init__(self, file: str):
+        self.file = file
+        # The stat hierarchy is fixed once the stats are enabled, so the
+        # flattened stats of a set of roots are only computed once.
+        self._flattened = {}
+
+    def _open_output(self) -> IO[bytes]:
+        from m5 import options
+
+        return open(os.path.join(options.outdir, self.file), "wb")
+
+    def _flatten(
+        self, roots: List[SimObject]
+    ) -> Tuple[List[str], List[_m5.stats.Info]]:
+        key = tuple(id(r) for r in roots)
+        flattened = self._flattened.get(key)
+        if flattened is None:
+            names = []
+            infos = []
+            for r in roots:
+                if isinstance(r, Root):
+                    prefix = ""
+                else:
+                    prefix = ".".join(r.path_list()) + "."
+                _flatten_stats_group(r, prefix, names, infos)
+            flattened = (names, infos)
+            self._flattened[key] = flattened
+        return flattened
+
+    def _flat_values(
+        self, roots: Union[List[SimObject], Root]
+    ) -> Tuple[List[str], List[float]]:
+        if not isinstance(roots, list):
+            roots = [roots]
+        names, infos = self._flatten(roots)
+        values = []
+        for info in infos:
+            values.extend(_stat_values(info))
+        return names, values
+
+
+class DeltaBinOutputVisitor(_FlatStatsVisitor):
+    """
+    This is a helper vistor class used to include a delta-encoded binary
+    output via the stats API (`src/python/m5/stats/__init__.py`). Only the
+    stats whose value changed since the previous dump are written. The output
+    can be read with `m5.ext.pystats.deltabin.DeltaBinReader`.
+    """
+
+    keyframe: int
+
+    def __init__(self, file: str, keyframe: int = 0):
+        """
+        Parameters
+        ----------
+
+        file: str
+            The output file, relative to the simulation output directory.
+
+        keyframe: int
+            Write all the stats, rather than only the changed ones, every
+            `keyframe` dumps to speed up random access to dumps. 0 (the
+            default) only writes all the stats in the first dump.
+        """
+
+        super().__init__(file)
+        self.keyframe = keyframe
+        self._writer = None
+
+    def dump(self, roots: Union[List[SimObject], Root]) -> None:
+        """
+        Appends the stats of a simulation root (or list of roots) to the
+        output file.
+
+        WARNING: This dump assumes the statistics have already been prepared
+        for the target root.
+
+        Parameters
+        ----------
+
+        roots: Union[List[Root], Root]]
+            The Root, or List of roots, whose stats are are to be dumped.
+        """
+
+        if self._writer is None:
+            self._writer = DeltaBinWriter(self._open_output(), self.keyframe)
+        names, values = self._flat_values(roots)
+        self._writer.write_dump(curTick(), names, values)
+
+
+class ColumnarOutputVisitor(_FlatStatsVisitor):
+    """
+    This is a helper vistor class used to include a columnar time-series
+    output via the stats API (`src/python/m5/stats/__init__.py`). Every stat
+    is a column and every dump a row. The output can be read with
+    `m5.ext.pystats.columnar.ColumnarStatsReader`.
+
+    The columns are the stats of the first dump. Stats of later dumps that
+    are not part of the first one are dropped, and columns missing from a
+    dump are set to NaN.
+    """
+
+    rows_per_group: int
+
+    def __init__(self, file: str, rows_per_group: int = 64):
+        """
+        Parameters
+        ----------
+
+        file: str
+            The output file, relative to the simulation output directory.
+
+        rows_per_group: int
+            The number of dumps buffered in memory and written together.
+        """
+
+        super().__init__(file)
+        self.rows_per_group = rows_per_group
+        self._writer = None
+        self._columns = None
+        # Row groups are buffered, so make sure the last one is written.
+        # This is registered before the final stats dump is, so it runs
+        # after it.
+        atexit.register(self.flush)
+
+    def dump(self, roots: Union[List[SimObject], Root]) -> None:
+        """
+        Appends the stats of a simulation root (or list of roots) to the
+        output file.
+
+        WARNING: This dump assumes the statistics have already been prepared
+        for the target root.
+
+        Parameters
+        ----------
+
+        roots: Union[List[Root], Root]]
+            The Root, or List of roots, whose stats are are to be dumped.
+        """
+
+        names, values = self._flat_values(roots)
+        if self._writer is None:
+            self._columns = names
+            self._writer = ColumnarStatsWriter(
+                self._open_output(), names, self.rows_per_group
+            )
+        elif names is not self._columns:
+            row = dict(zip(names, values))
+            values = [row.get(name, float("nan")) for name in self._columns]
+        self._writer.write_row(curTick(), values)
+
+    def flush(self) -> None:
+        """Write out the dumps that have not been written yet."""
+        if self._writer is not None:
+            self._writer.flush()
+
+
+def _flatten_stats_group(
+    group: _m5.stats.Group,
+    prefix: str,
+    names: List[str],
+    infos: List[_m5.stats.Info],
+) -> None:
+    """
+    Collects the names of the values of all the stats below `group`, in the
+    same order as `_stat_values` returns them, and the stats themselves.
+    """
+
+    for stat in group.getStats():
+        name = prefix + stat.name
+        if isinstance(stat, _m5.stats.ScalarInfo):
+            names.append(name)
+        elif isinstance(stat, _m5.stats.DistInfo):
+            names.extend(f"{name}::{field}" for field in _dist_fields)
+            names.extend(f"{name}::bucket{i}" for i in range(len(stat.values)))
+        elif isinstance(stat, _m5.stats.VectorInfo):
+            for index in range(stat.size):
+                subname = str(stat.subnames[index]) if stat.subnames else ""
+                names.append(f"{name}::{subname or index}")
+        else:
+            continue
+        infos.append(stat)
+
+    for key, child in group.getStatGroups().items():
+        _flatten_stats_group(child, f"{prefix}{key}.", names, infos)
+
+
+_dist_fields = (
+    "min",
+    "max",
+    "bucket_size",
+    "sum",
+    "squares",
+    "underflow",
+    "overflow",
+    "logs",
+)
+
+
+def _stat_values(statistic: _m5.stats.Info) -> List[float]:
+    if isinstance(statistic, _m5.stats.ScalarInfo):
+        return [statistic.result]
+    elif isinstance(statistic, _m5.stats.DistInfo):
+        return [
+            statistic.min_val,
+            statistic.max_val,
+            statistic.bucket_size,
+            statistic.sum,
+            statistic.squares,
+            statistic.underflow,
+            statistic.overflow,
+            statistic.logs,
+        ] + list(statistic.values)
+    else:
+        # VectorInfo, including formulas
+        return list(statistic.result)
+
+
 def get_stats_group(group: _m5.stats.Group) -> Group:
     """
     Translates a gem5 Group object into a Python stats Group object. A Python
@@ -117,6 +348,91 @@ def get_stats_group(group: _m5.stats.Group) -> Group:
     return Group(**stats_dict)
 
 
+class LazyGroup(Group):
+    """
+    A stats Group which translates the gem5 statistics and sub-groups of a
+    gem5 Group object only when they are accessed. This avoids creating the
+    Python objects for the whole stats hierarchy when only a few stats are of
+    interest. The value of a statistic is read the first time it is accessed.
+
+    Operations that need every child (e.g., `children()`, `find()` and
+    `to_json()`) translate the whole sub-tree.
+
+    The group is not prepared for dumping: `preDumpStats()` recurses over the
+    whole sub-tree, so it is called once on the top-level group instead (see
+    `get_simstat`).
+    """
+
+    # Keep the bookkeeping out of `__dict__`, which holds the children.
+    __slots__ = ("_group", "_stats", "_complete")
+
+    def __init__(self, group: _m5.stats.Group):
+        self._group = group
+        self._stats = None
+        self._complete = False
+        super().__init__()
+
+    def _stats_by_name(self) -> Dict[str, _m5.stats.Info]:
+        if self._stats is None:
+            self._stats = {stat.name: stat for stat in self._group.getStats()}
+        return self._stats
+
+    def __getattr__(self, name: str):
+        # Only called when `name` has not been translated yet
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        value = _get_lazy_member(self, name)
+        if value is None:
+            raise AttributeError(f"'{name}' is not a stat or stat group")
+        setattr(self, name, value)
+        return value
+
+    def _translate_all(self) -> None:
+        if self._complete:
+            return
+        for name in list(self._stats_by_name()) + list(
+            self._group.getStatGroups()
+        ):
+            if name not in self.__dict__:
+                value = _get_lazy_member(self, name)
+                if value is not None:
+                    setattr(self, name, value)
+        self._complete = True
+
+    def _stat_items(self):
+        # The slots only hold bookkeeping, not stats
+        return iter(self.__dict__.items())
+
+    def children(self, *args, **kwargs) -> List[AbstractStat]:
+        self._translate_all()
+        return super().children(*args, **kwargs)
+
+    def to_json(self) -> Dict:
+        self._translate_all()
+        return super().to_json()
+
+
+def _get_lazy_member(
+    group: LazyGroup, name: str
+) -> Optional[Union[Statistic, Group]]:
+    """
+    Translates the statistic or sub-group `name` of a LazyGroup. Returns None
+    if there is no such statistic or sub-group, or if the statistic cannot be
+    translated.
+    """
+
+    info = group._stats_by_name().get(name)
+    if info is not None:
+        return __get_statistic(info)
+
+    sub_groups = group._group.getStatGroups()
+    if name in sub_groups:
+        return LazyGroup(sub_groups[name])
+
+    return None
+
+
 def __get_statistic(statistic: _m5.stats.Info) -> Optional[Statistic]:
     """
     Translates a _m5.stats.Info object into a Statistic object, to process
@@ -237,7 +553,9 @@ def _prepare_stats(group: _m5.stats.Group):
 
 
 def get_simstat(
-    root: Union[SimObject, List[SimObject]], prepare_stats: bool = True
+    root: Union[SimObject, List[SimObject]],
+    prepare_stats: bool = True,
+    lazy: bool = False,
 ) -> SimStat:
     """
     This function will return the SimStat object for a simulation given a
@@ -257,6 +575,15 @@ def get_simstat(
         Dictates whether the stats are to be prepared prior to creating the
         SimStat object. By default this is 'True'.
 
+    lazy: bool
+        If 'True', the groups of the returned SimStat are LazyGroup objects,
+        which only translate (and prepare) the statistics that are accessed.
+        The groups of each SimObject in `root` are still prepared for dumping
+        up front, once.
+        This is much cheaper when only a few statistics are needed, e.g.,
+        `get_simstat(root, lazy=True)["board.processor.cores0.core.ipc"]`.
+        By default this is 'False'.
+
     Returns
     -------
     SimStat
@@ -278,11 +605,23 @@ def get_simstat(
         if isinstance(r, Root):
             # The Root is a special case, we jump directly into adding its
             # constituent Groups.
+            if lazy:
+                if prepare_stats:
+                    # Recurses over every group
+                    r.preDumpStats()
+                for key, group in r.getStatGroups().items():
+                    stats_map[key] = LazyGroup(group)
+                continue
             if prepare_stats:
                 _prepare_stats(r)
             for key in r.getStatGroups():
                 stats_map[key] = get_stats_group(r.getStatGroups()[key])
         elif isinstance(r, SimObject):
+            if lazy:
+                if prepare_stats:
+                    r.preDumpStats()
+                stats_map[r.get_name()] = LazyGroup(r)
+                continue
             if prepare_stats:
                 _prepare_stats(r)
             stats_map[r.get_name()] = get_stats_group(r)
@@ -0,0 +1,680 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Streaming comparison of gem5 stats files (stats.txt and stats.json).
+
+The two files are read in lockstep, one stat (or, for JSON files, one small
+subtree of stats) at a time, so the memory used doesn't grow with the size
+of the files. Stats are compared numerically,
+with optional relative and absolute tolerances per stat, and the comparison
+can stop after the first few mismatches.
+"""
+
+import collections
+import filecmp
+import json
+import math
+import re
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+Regex = Union[str, Pattern]
+
+# How much of a stats.txt file is read at once.
+_block_size = 1 << 20
+
+_dump_begin = b"---------- Begin Simulation Statistics ----------"
+
+
+class Mismatch(object):
+    """A stat which differs between the trusted and the test file."""
+
+    def __init__(self, name: str, trusted, test, dump: int = 0):
+        """
+        :param name: The name of the stat.
+        :param trusted: The value in the trusted file, or None if the stat is
+        missing from it.
+        :param test: The value in the test file, or None if the stat is
+        missing from it.
+        :param dump: The index of the stats dump the stat belongs to, for
+        stats.txt files with several dumps.
+        """
+        self.name = name
+        self.trusted = trusted
+        self.test = test
+        self.dump = dump
+
+    def __str__(self):
+        name = self.name
+        if self.dump:
+            name += f" (dump {self.dump})"
+        if self.trusted is None:
+            return f"{name}: not in the trusted stats"
+        if self.test is None:
+            return f"{name}: missing"
+        return f"{name}: trusted_value: {self.trusted}, " + (
+            f"test_value: {self.test}"
+        )
+
+
+class StatsComparator(object):
+    """
+    Compares a test stats file with a trusted one.
+
+    Usage
+    -----
+    ```
+    comparator = StatsComparator(
+        rel_tol=1e-6,
+        tolerances=[(r"\\.numCycles$", 0.01, 0)],
+        exclude=[r"^host"],
+        max_mismatches=10,
+    )
+    mismatches = comparator.compare_txt("trusted/stats.txt", "m5out/stats.txt")
+    ```
+    """
+
+    def __init__(
+        self,
+        rel_tol: float = 0.0,
+        abs_tol: float = 0.0,
+        tolerances: Sequence[Tuple[Regex, float, float]] = (),
+        include: Iterable[Regex] = (),
+        exclude: Iterable[Regex] = (),
+        max_mismatches: Optional[int] = None,
+        allow_extra: bool = False,
+        reorder_window: int = 1 << 16,
+    ):
+        """
+        :param rel_tol: The relative tolerance of numeric values.
+        :param abs_tol: The absolute tolerance of numeric values.
+        :param tolerances: (regex, rel_tol, abs_tol) tuples overriding the
+        tolerances of the stats whose name matches the regex. The first
+        matching regex is used.
+        :param include: If given, only the stats whose name matches one of
+        these regexes are compared.
+        :param exclude: The stats whose name matches one of these regexes are
+        not compared.
+        :param max_mismatches: Stop comparing after this many mismatches. All
+        the stats are compared if None.
+        :param allow_extra: If True, the test file may have stats the trusted
+        file doesn't have.
+        :param reorder_window: If extra stats are allowed, how many stats of
+        the test file not found in the trusted file yet are kept. A stat
+        listed more than this many stats earlier in the test file than in the
+        trusted file is reported as missing.
+        """
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.tolerances = [
+            (re.compile(regex), rel, abs_) for regex, rel, abs_ in tolerances
+        ]
+        self.include = [re.compile(regex) for regex in include]
+        self.exclude = [re.compile(regex) for regex in exclude]
+        self.max_mismatches = max_mismatches
+        self.allow_extra = allow_extra
+        self.reorder_window = reorder_window
+
+    def selected(self, name: str) -> bool:
+        """Whether the stat with this name is to be compared."""
+        if self.include and not any(r.search(name) for r in self.include):
+            return False
+        return not any(r.search(name) for r in self.exclude)
+
+    def _tolerance(self, name: str) -> Tuple[float, float]:
+        for regex, rel_tol, abs_tol in self.tolerances:
+            if regex.search(name):
+                return rel_tol, abs_tol
+        return self.rel_tol, self.abs_tol
+
+    def values_match(self, name: str, trusted, test) -> bool:
+        """
+        Whether the values of a stat match. Values are either a number, a
+        string, or a tuple of those (e.g., the columns of a stats.txt line).
+        """
+        if isinstance(trusted, tuple) or isinstance(test, tuple):
+            if not (isinstance(trusted, tuple) and isinstance(test, tuple)):
+                return False
+            if len(trusted) != len(test):
+                return False
+            return all(
+                self.values_match(name, a, b) for a, b in zip(trusted, test)
+            )
+        if _is_number(trusted) and _is_number(test):
+            if trusted == test:
+                return True
+            if math.isnan(trusted) or math.isnan(test):
+                return math.isnan(trusted) and math.isnan(test)
+            rel_tol, abs_tol = self._tolerance(name)
+            return math.isclose(
+                trusted, test, rel_tol=rel_tol, abs_tol=abs_tol
+            )
+        return trusted == test
+
+    def compare_txt(self, trusted_path: str, test_path: str) -> List[Mismatch]:
+        """
+        Compare two stats.txt files.
+
+        :returns: The mismatches found, at most `max_mismatches` of them.
+        """
+        if filecmp.cmp(trusted_path, test_path, shallow=False):
+            return []
+        with open(trusted_path, "rb") as trusted:
+            with open(test_path, "rb") as test:
+                return self._compare(_txt_stats(trusted), _txt_stats(test))
+
+    def compare_json(
+        self, trusted_path: str, test_path: str
+    ) -> List[Mismatch]:
+        """
+        Compare two JSON stats files. Every leaf value of the JSON documents
+        is a stat, named by the keys (and list indices) leading to it, joined
+        with dots.
+
+        :returns: The mismatches found, at most `max_mismatches` of them.
+        """
+        if filecmp.cmp(trusted_path, test_path, shallow=False):
+            return []
+        with open(trusted_path, encoding="utf-8") as trusted:
+            with open(test_path, encoding="utf-8") as test:
+                return self._compare(
+                    *_json_differences(
+                        _json_chunks(trusted),
+                        _json_chunks(test),
+                        self.allow_extra,
+                    )
+                )
+
+    def _compare(
+        self,
+        trusted: Iterator[Tuple[object, object]],
+        test: Iterator[Tuple[object, object]],
+    ) -> List[Mismatch]:
+        mismatches = []
+        # Stats seen in one file but not yet in the other, for when the
+        # files don't list the stats in the same order.
+        pending_trusted = {}
+        pending_test = collections.OrderedDict()
+
+        def add_test(key, value):
+            pending_test[key] = value
+            # Extra stats are only kept for as long as a stat listed in a
+            # different order may still be matched with them.
+            if self.allow_extra and len(pending_test) > self.reorder_window:
+                pending_test.popitem(last=False)
+
+        def check(key, trusted_value, test_value):
+            """Returns True when the comparison is to stop."""
+            if trusted_value == test_value:
+                # Most stats are identical, skip parsing them
+                return False
+            dump, name = _split_key(key)
+            if not self.selected(name):
+                return False
+            trusted_value = _parsed(trusted_value)
+            test_value = _parsed(test_value)
+            if self.values_match(name, trusted_value, test_value):
+                return False
+            mismatches.append(Mismatch(name, trusted_value, test_value, dump))
+            return len(mismatches) == self.max_mismatches
+
+        def missing(key, trusted_value, test_value):
+            dump, name = _split_key(key)
+            if not self.selected(name):
+                return False
+            mismatches.append(
+                Mismatch(
+                    name, _parsed(trusted_value), _parsed(test_value), dump
+                )
+            )
+            return len(mismatches) == self.max_mismatches
+
+        for trusted_stat in trusted:
+            test_stat = next(test, None)
+            key, value = trusted_stat
+            if test_stat is not None and test_stat[0] == key:
+                if check(key, value, test_stat[1]):
+                    return mismatches
+                continue
+
+            if key in pending_test:
+                if check(key, value, pending_test.pop(key)):
+                    return mismatches
+            else:
+                pending_trusted[key] = value
+            if test_stat is not None:
+                key, value = test_stat
+                if key in pending_trusted:
+                    if check(key, pending_trusted.pop(key), value):
+                        return mismatches
+                else:
+                    add_test(key, value)
+
+        # The trusted file is done: the rest of the test file only needs to
+        # be kept if extra stats are reported.
+        for key, value in test:
+            if key in pending_trusted:
+                if check(key, pending_trusted.pop(key), value):
+                    return mismatches
+            elif not self.allow_extra:
+                pending_test[key] = value
+            elif not pending_trusted:
+                break
+
+        for key, value in pending_trusted.items():
+            if missing(key, value, None):
+                return mismatches
+        if not self.allow_extra:
+            for key, value in pending_test.items():
+                if missing(key, None, value):
+                    return mismatches
+        return mismatches
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _split_key(key) -> Tuple[int, str]:
+    """The (dump, name) of a stat, stats.txt keys hold both."""
+    if isinstance(key, tuple):
+        return key
+    return 0, key
+
+
+def _parsed(value):
+    if isinstance(value, _TxtValue):
+        return value.parse()
+    return value
+
+
+def _lines(file) -> Iterator[bytes]:
+    """The lines of a binary file, read in large blocks."""
+    tail = b""
+    while True:
+        block = file.read(_block_size)
+        if not block:
+            break
+        lines = (tail + block).split(b"\n")
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def _parse_value(token: str):
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _txt_stats(file) -> Iterator[Tuple[str, object]]:
+    """
+    Yields the ((dump, name), value) of every stat of a stats.txt file, dump
+    being the index of the stats dump in the file.
+
+    To make comparing identical lines cheap, the value is the raw line until
+    it is parsed by :func:`_parse_txt_value`.
+    """
+    dump = -1
+    for line in _lines(file):
+        if not line or line.startswith(b"----------"):
+            if line.startswith(_dump_begin):
+                dump += 1
+            continue
+        name, _, _ = line.partition(b" ")
+        yield (dump, name.decode()), _TxtValue(line)
+
+
+class _TxtValue(object):
+    """
+    The value of a line of a stats.txt file. The line is only parsed when
+    it differs from the line of the other file.
+    """
+
+    __slots__ = ("line",)
+
+    def __init__(self, line: bytes):
+        self.line = line
+
+    def __eq__(self, other):
+        return isinstance(other, _TxtValue) and self.line == other.line
+
+    def parse(self):
+        # The values are between the name and the description
+        values = self.line.partition(b"#")[0].split()[1:]
+        values = tuple(_parse_value(v.decode()) for v in values)
+        return values[0] if len(values) == 1 else values
+
+
+# JSON objects and arrays up to this many characters are decoded in one go,
+# larger ones are walked value by value.
+_json_chunk_limit = 1 << 16
+
+# How many chunks of a JSON document are kept while they can't be matched
+# with those of the other document.
+_json_pending_chunks = 64
+
+_json_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+class _JsonReader(object):
+    """
+    A window over a JSON text file, from which values are decoded with the
+    stdlib JSON decoder.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size: int) -> bool:
+        """
+        Read until at least `size` characters are ahead of the position.
+        Returns False if the end of the file was reached first.
+        """
+        while len(self.buf) - self.pos < size:
+            if self.eof:
+                return False
+            # Reads are kept small, as a container which is too large to be
+            # decoded in one go is only found to be so at the end of the
+            # window.
+            block = self.file.read(max(_json_chunk_limit, size))
+            if not block:
+                self.eof = True
+                return False
+            self.buf = self.buf[self.pos :] + block
+            self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end."""
+        while True:
+            self.pos = _json_whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill(1):
+                return ""
+
+    def decode(self):
+        """Decode the next value."""
+        while True:
+            ahead = len(self.buf) - self.pos
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # The value may be cut off by the end of the window
+                if self.fill(2 * ahead):
+                    continue
+                raise
+            if end == len(self.buf) and self.fill(ahead + 1):
+                # A number may continue after the end of the window
+                continue
+            self.pos = end
+            return value
+
+    def decode_container(self, limit: int):
+        """
+        Decode the object or array starting at the next character if it is
+        at most `limit` characters long, which makes where documents are cut
+        into chunks only depend on their contents. Returns None otherwise,
+        in which case nothing is consumed.
+        """
+        self.fill(limit)
+        try:
+            value, end = self.decoder.raw_decode(self.buf, self.pos)
+        except json.JSONDecodeError:
+            if self.eof:
+                # The rest of the file is in the window
+                raise
+            return None
+        if end - self.pos > limit:
+            return None
+        self.pos = end
+        return value
+
+
+def _json_chunks(file) -> Iterator[Tuple[Tuple[str, ...], object]]:
+    """
+    Yields the (path, value) of the values of a JSON document which are
+    decoded in one go, in document order: the objects and arrays of at most
+    `_json_chunk_limit` characters which aren't in such a smaller container,
+    and the other values of larger ones. The path is the tuple of keys (and
+    list indices) leading to the value.
+    """
+    reader = _JsonReader(file)
+    # The key (or index) of the current value of every open container, and
+    # whether the container is an array
+    path = []
+    arrays = []
+    while True:
+        char = reader.peek()
+        if char == ",":
+            reader.pos += 1
+            if arrays[-1]:
+                path[-1] += 1
+            continue
+        if char in ("}", "]"):
+            reader.pos += 1
+            path.pop()
+            arrays.pop()
+            if not path:
+                break
+            continue
+        if path and not arrays[-1]:
+            if char != '"':
+                raise ValueError(f"Invalid JSON: {char!r} instead of a key")
+            path[-1] = reader.decode()
+            if reader.peek() != ":":
+                raise ValueError(f"Invalid JSON: no colon after {path[-1]!r}")
+            reader.pos += 1
+            char = reader.peek()
+        if not char:
+            raise ValueError("Invalid JSON: unexpected end of file")
+
+        if char in ("{", "["):
+            value = reader.decode_container(_json_chunk_limit)
+            if value is None:
+                reader.pos += 1
+                arrays.append(char == "[")
+                path.append(0 if char == "[" else None)
+                continue
+        else:
+            value = reader.decode()
+        yield tuple(str(key) for key in path), value
+        if not path:
+            break
+    if reader.peek():
+        raise ValueError("Invalid JSON: data after the document")
+
+
+def _flatten(path: Tuple[str, ...], value, leaves) -> None:
+    """Append the (name, value) of every leaf of a decoded value to leaves."""
+    if type(value) is dict:
+        for key, member in value.items():
+            _flatten(path + (key,), member, leaves)
+    elif type(value) is list:
+        for index, member in enumerate(value):
+            _flatten(path + (str(index),), member, leaves)
+    else:
+        leaves.append((".".join(path), value))
+
+
+def _json_stats(file) -> Iterator[Tuple[str, object]]:
+    """
+    Yields the (name, value) of every leaf of a JSON document, reading it a
+    block at a time.
+    """
+    for path, value in _json_chunks(file):
+        leaves = []
+        _flatten(path, value, leaves)
+        yield from leaves
+
+
+def _json_differences(
+    trusted: Iterator[Tuple[Tuple[str, ...], object]],
+    test: Iterator[Tuple[Tuple[str, ...], object]],
+    allow_extra: bool,
+) -> Tuple[Iterator[Tuple[str, object]], Iterator[Tuple[str, object]]]:
+    """
+    Returns iterators over the (name, value) leaves of two JSON documents,
+    given as chunks (see :func:`_json_chunks`), leaving out the subtrees
+    which are equal in both. Chunks at the same path are compared with a
+    single comparison of their decoded values, so that the leaves of (most)
+    identical stats are never named one by one. Chunks which can't be
+    matched are flattened as a whole, and left to the caller to match.
+
+    :param allow_extra: Whether the leaves only found in the test document
+    can be left out.
+    """
+    trusted_leaves = collections.deque()
+    test_leaves = collections.deque()
+    # Chunks split into their members, to be matched before the next ones
+    trusted_split = []
+    test_split = []
+    # Chunks not matched yet, e.g., after a group only in one document
+    trusted_pending = collections.OrderedDict()
+    test_pending = collections.OrderedDict()
+
+    def next_chunk(split, chunks):
+        return split.pop() if split else next(chunks, None)
+
+    def split(stack, path, value) -> None:
+        if type(value) is dict:
+            members = ((path + (k,), v) for k, v in value.items())
+        else:
+            members = ((path + (str(i),), v) for i, v in enumerate(value))
+        stack.extend(reversed(list(members)))
+
+    def splittable(path, value, other_path) -> bool:
+        # Whether the chunk is a container holding the other one
+        return (
+            len(path) < len(other_path)
+            and other_path[: len(path)] == path
+            and type(value) in (dict, list)
+        )
+
+    def park(pending, path, value, queue) -> None:
+        pending[path] = value
+        if len(pending) > _json_pending_chunks:
+            _flatten(*pending.popitem(last=False), queue)
+
+    def diff(path, trusted_value, test_value) -> None:
+        if trusted_value == test_value:
+            return
+        kind = type(trusted_value)
+        if kind is dict and type(test_value) is dict:
+            for key, value in trusted_value.items():
+                if key in test_value:
+                    diff(path + (key,), value, test_value[key])
+                else:
+                    _flatten(path + (key,), value, trusted_leaves)
+            if not allow_extra:
+                for key, value in test_value.items():
+                    if key not in trusted_value:
+                        _flatten(path + (key,), value, test_leaves)
+        elif (
+            kind is list
+            and type(test_value) is list
+            and len(trusted_value) == len(test_value)
+        ):
+            for index, (a, b) in enumerate(zip(trusted_value, test_value)):
+                diff(path + (str(index),), a, b)
+        else:
+            _flatten(path, trusted_value, trusted_leaves)
+            _flatten(path, test_value, test_leaves)
+
+    def advance() -> bool:
+        """
+        Match the next chunks of both documents, queuing the leaves which
+        differ. Returns False once both documents are done.
+        """
+        trusted_chunk = next_chunk(trusted_split, trusted)
+        test_chunk = next_chunk(test_split, test)
+        while trusted_chunk is not None and test_chunk is not None:
+            trusted_path, trusted_value = trusted_chunk
+            test_path, test_value = test_chunk
+            if trusted_path == test_path:
+                diff(trusted_path, trusted_value, test_value)
+                return True
+            # A document may be cut into larger chunks than the other
+            if splittable(trusted_path, trusted_value, test_path):
+                split(trusted_split, trusted_path, trusted_value)
+                trusted_chunk = next_chunk(trusted_split, trusted)
+            elif splittable(test_path, test_value, trusted_path):
+                split(test_split, test_path, test_value)
+                test_chunk = next_chunk(test_split, test)
+            else:
+                break
+        if trusted_chunk is not None:
+            path, value = trusted_chunk
+            if path in test_pending:
+                diff(path, value, test_pending.pop(path))
+            else:
+                park(trusted_pending, path, value, trusted_leaves)
+        if test_chunk is not None:
+            path, value = test_chunk
+            if path in trusted_pending:
+                diff(path, trusted_pending.pop(path), value)
+            else:
+                park(test_pending, path, value, test_leaves)
+        if trusted_chunk is not None or test_chunk is not None:
+            return True
+        # The chunks which were never matched are left to the caller
+        for pending, queue in (
+            (trusted_pending, trusted_leaves),
+            (test_pending, test_leaves),
+        ):
+            for path, value in pending.items():
+                _flatten(path, value, queue)
+        flushed = bool(trusted_pending or test_pending)
+        trusted_pending.clear()
+        test_pending.clear()
+        return flushed
+
+    def leaves(queue):
+        while queue or advance():
+            while queue:
+                yield queue.popleft()
+
+    return leaves(trusted_leaves), leaves(test_leaves)
@@ -42,12 +42,14 @@ Built in test cases that verify particular details about a gem5 run.
 """
 import re
 import os
-import json
+from typing import Iterable, Sequence, Tuple, Union
 
 from testlib import test_util
 from testlib.configuration import constants
 from testlib.helper import joinpath, diff_out_file
 
+from .stats_comparison import StatsComparator
+
 
 class Verifier(object):
     def __init__(self, fixtures=tuple()):
@@ -189,10 +191,67 @@ class MatchStderr(DerivedGoldStandard):
 
 
 class MatchStats(DerivedGoldStandard):
-    # TODO: Likely will want to change this verifier since we have the weird
-    # perl script right now. A simple diff probably isn't going to work.
+    """
+    Compares the stats.txt file of a test with a trusted one, stat by stat.
+    Numeric values are compared with the given tolerances rather than
+    textually.
+    """
+
     _file = constants.gem5_simulation_stats
-    _default_ignore_regex = []
+    _default_ignore_regex = [re.compile(r"^host")]
+
+    def __init__(
+        self,
+        standard_filename,
+        rel_tol=0.0,
+        abs_tol=0.0,
+        tolerances=(),
+        include=(),
+        exclude=(),
+        max_mismatches=20,
+        **kwargs,
+    ):
+        """
+        :param standard_filename: The path of the trusted stats.txt file.
+        :param ignore_regex: A string, compiled regex, or iterable containing
+        either. The stats whose name matches one of them are not compared.
+        By default the host stats (e.g., `hostSeconds`) are ignored.
+        :param rel_tol: The relative tolerance of numeric stats.
+        :param abs_tol: The absolute tolerance of numeric stats.
+        :param tolerances: (regex, rel_tol, abs_tol) tuples overriding the
+        tolerances of the stats whose name matches the regex.
+        :param include: A string, compiled regex, or iterable containing
+        either. If given, only the stats whose name matches one of them are
+        compared.
+        :param exclude: Like `ignore_regex`, but in addition to it rather
+        than replacing the default.
+        :param max_mismatches: Stop comparing after this many mismatches.
+        """
+        super(MatchStats, self).__init__(standard_filename, **kwargs)
+        self.comparator = StatsComparator(
+            rel_tol=rel_tol,
+            abs_tol=abs_tol,
+            tolerances=tolerances,
+            include=_iterable_regex(include),
+            exclude=list(self.ignore_regex) + list(_iterable_regex(exclude)),
+            max_mismatches=max_mismatches,
+        )
+
+    def test(self, params):
+        fixtures = params.fixtures
+        tempdir = fixtures[constants.tempdir_fixture_name].path
+        test_filename = joinpath(tempdir, self.test_filename)
+
+        mismatches = self.comparator.compare_txt(
+            self.standard_filename, test_filename
+        )
+        if mismatches:
+            test_util.fail(
+                _mismatch_report(
+                    self.standard_filename, test_filename, mismatches
+                )
+                + f"\nSee {tempdir} for full results"
+            )
 
 
 class MatchConfigINI(DerivedGoldStandard):
@@ -284,50 +343,64 @@ class MatchJSONStats(Verifier):
         truth_name: str,
         test_name: str,
         test_name_in_outdir: bool = False,
+        rel_tol: float = 0.0,
+        abs_tol: float = 0.0,
+        tolerances: Sequence[Tuple[str, float, float]] = (),
+        include: Union[str, Iterable[str]] = (),
+        exclude: Union[str, Iterable[str]] = (),
+        max_mismatches: int = 20,
     ):
         """
-        :param truth_dir: The path to the directory including the trusted_stats
-        for this test.
-        :param test_name_in_m5out: True if the 'test_name' dir is to found in
+        :param truth_name: The path to the trusted stats JSON file. Only the
+        stats it holds are checked: the test file may hold more.
+        :param test_name: The path to the JSON file output by the test.
+        :param test_name_in_outdir: True if the 'test_name' dir is to found in
         the `m5.options.outdir`.
+        :param rel_tol: The relative tolerance of numeric stats.
+        :param abs_tol: The absolute tolerance of numeric stats.
+        :param tolerances: (regex, rel_tol, abs_tol) tuples overriding the
+        tolerances of the stats whose name matches the regex.
+        :param include: A string, compiled regex, or iterable containing
+        either. If given, only the stats whose name matches one of them are
+        compared.
+        :param exclude: A string, compiled regex, or iterable containing
+        either. The stats whose name matches one of them are not compared.
+        :param max_mismatches: Stop comparing after this many mismatches.
         """
         super(MatchJSONStats, self).__init__()
         self.truth_name = truth_name
         self.test_name = test_name
         self.test_name_in_outdir = test_name_in_outdir
-
-    def _compare_stats(self, trusted_file, test_file):
-        trusted_stats = json.load(trusted_file)
-        test_stats = json.load(test_file)
-        is_subset = trusted_stats.items() <= test_stats.items()
-        if is_subset:
-            err = (
-                "Following differences found between "
-                + f"{self.truth_name} and {self.test_name}.\n"
-            )
-            diffs = set(trusted_stats.items()) - set(test_stats.items())
-            for diff in diffs:
-                trusted_value = trusted_stats[diff[0]]
-                test_value = None
-                if diff[0] in test_stats.keys():
-                    test_value = test_stats[diff[0]]
-                err += f"{diff[0]}:\n"
-                err += (
-                    f"trusted_value: {trusted_value}, "
-                    + f"test_value: {test_value}"
-                )
-            test_util.fail(err)
+        self.comparator = StatsComparator(
+            rel_tol=rel_tol,
+            abs_tol=abs_tol,
+            tolerances=tolerances,
+            include=_iterable_regex(include),
+            exclude=_iterable_regex(exclude),
+            max_mismatches=max_mismatches,
+            allow_extra=True,
+        )
 
     def test(self, params):
-        trusted_file = open(self.truth_name, "r")
+        test_name = self.test_name
         if self.test_name_in_outdir:
             fixtures = params.fixtures
             tempdir = fixtures[constants.tempdir_fixture_name].path
-            test_file = open(joinpath(tempdir, self.test_name), "r")
-        else:
-            test_file = open(self.test_name, "r")
+            test_name = joinpath(tempdir, self.test_name)
 
-        return self._compare_stats(trusted_file, test_file)
+        mismatches = self.comparator.compare_json(self.truth_name, test_name)
+        if mismatches:
+            test_util.fail(
+                _mismatch_report(self.truth_name, test_name, mismatches)
+            )
+
+
+def _mismatch_report(trusted_name, test_name, mismatches):
+    return (
+        "Following differences found between "
+        + f"{trusted_name} and {test_name}.\n"
+        + "\n".join(str(mismatch) for mismatch in mismatches)
+    )
 
 
 _re_type = type(re.compile(""))
@@ -0,0 +1,97 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import tempfile
+import unittest
+
+from m5.ext.pystats.columnar import (
+    ColumnarStatsReader,
+    ColumnarStatsWriter,
+    load,
+)
+
+
+class ColumnarTestSuite(unittest.TestCase):
+    """Test cases for m5.ext.pystats.columnar"""
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp(suffix=".col")
+        os.close(fd)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def _write(self, names, rows, rows_per_group):
+        with open(self.path, "wb") as fp:
+            writer = ColumnarStatsWriter(fp, names, rows_per_group)
+            for tick, values in rows:
+                writer.write_row(tick, values)
+            writer.flush()
+
+    def test_roundTrip(self) -> None:
+        names = ["a", "bb", "ccc"]
+        rows = [(t * 10, [float(t), t * 2.0, t * 3.0]) for t in range(10)]
+        # 10 rows in groups of 4 leaves a partial last group
+        self._write(names, rows, rows_per_group=4)
+
+        with ColumnarStatsReader(self.path) as reader:
+            self.assertEqual(names, reader.names)
+            self.assertEqual(10, len(reader))
+            self.assertIn("bb", reader)
+            self.assertEqual(list(range(0, 100, 10)), list(reader.ticks))
+            self.assertEqual([t * 2.0 for t in range(10)], list(reader["bb"]))
+            self.assertEqual(
+                {"a": 5.0, "bb": 10.0, "ccc": 15.0}, reader.dump(5)
+            )
+            self.assertEqual(9.0, reader.dump(-1)["a"])
+            with self.assertRaises(IndexError):
+                reader.dump(10)
+
+    def test_load(self) -> None:
+        self._write(["x", "y"], [(0, [1.0, 2.0]), (1, [3.0, 4.0])], 64)
+        stats = load(self.path)
+        self.assertEqual([1.0, 3.0], list(stats["x"]))
+        self.assertEqual([2.0, 4.0], list(stats["y"]))
+
+    def test_truncatedGroupIgnored(self) -> None:
+        self._write(["x"], [(t, [float(t)]) for t in range(6)], 4)
+        with open(self.path, "r+b") as fp:
+            fp.truncate(os.path.getsize(self.path) - 8)
+        with ColumnarStatsReader(self.path) as reader:
+            self.assertEqual([0.0, 1.0, 2.0, 3.0], list(reader["x"]))
+
+    def test_wrongRowLength(self) -> None:
+        with open(self.path, "wb") as fp:
+            writer = ColumnarStatsWriter(fp, ["x", "y"])
+            with self.assertRaises(ValueError):
+                writer.write_row(0, [1.0])
+
+    def test_notColumnar(self) -> None:
+        with open(self.path, "wb") as fp:
+            fp.write(b"---------- Begin Simulation Statistics")
+        with self.assertRaises(ValueError):
+            ColumnarStatsReader(self.path)
@@ -0,0 +1,111 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import math
+import os
+import tempfile
+import unittest
+
+from m5.ext.pystats.deltabin import DeltaBinReader, DeltaBinWriter
+
+
+class DeltaBinTestSuite(unittest.TestCase):
+    """Test cases for m5.ext.pystats.deltabin"""
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp(suffix=".dlt")
+        os.close(fd)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def _write(self, dumps, keyframe_interval=0):
+        with open(self.path, "wb") as fp:
+            writer = DeltaBinWriter(fp, keyframe_interval)
+            for tick, names, values in dumps:
+                writer.write_dump(tick, names, values)
+
+    def test_roundTrip(self) -> None:
+        names = ["a", "b", "c"]
+        dumps = [
+            (100, names, [1.0, 2.0, 3.0]),
+            (200, names, [1.0, 5.0, 3.0]),
+            (300, names, [4.0, 5.0, 3.0]),
+        ]
+        self._write(dumps)
+
+        with DeltaBinReader(self.path) as reader:
+            self.assertEqual(names, reader.names)
+            self.assertEqual([100, 200, 300], reader.ticks)
+            self.assertEqual(3, len(reader))
+            for i, (_, _, values) in enumerate(dumps):
+                self.assertEqual(dict(zip(names, values)), reader.dump(i))
+            self.assertEqual({"a": 4.0, "b": 5.0, "c": 3.0}, reader[-1])
+            self.assertEqual([2.0, 5.0, 5.0], reader.stat("b"))
+            self.assertEqual(1.0, reader.value(1, "a"))
+
+    def test_onlyChangesWritten(self) -> None:
+        names = [f"stat{i}" for i in range(1000)]
+        values = [float(i) for i in range(1000)]
+        self._write([(0, names, values)])
+        first_size = os.path.getsize(self.path)
+
+        dumps = [(tick, names, values) for tick in range(10)]
+        self._write(dumps)
+        # Nine dumps without changes should be a lot smaller than one
+        # full dump.
+        self.assertLess(os.path.getsize(self.path), first_size + 200)
+
+    def test_nanNotRewritten(self) -> None:
+        names = ["nan"]
+        self._write([(t, names, [float("nan")]) for t in range(3)])
+        with DeltaBinReader(self.path) as reader:
+            self.assertTrue(math.isnan(reader.dump(2)["nan"]))
+
+    def test_keyframes(self) -> None:
+        names = ["a", "b"]
+        dumps = [(t, names, [float(t), 7.0]) for t in range(10)]
+        self._write(dumps, keyframe_interval=3)
+        with DeltaBinReader(self.path) as reader:
+            # Random access in both directions
+            for i in (9, 2, 5, 4, 0, 8):
+                self.assertEqual({"a": float(i), "b": 7.0}, reader.dump(i))
+            self.assertEqual([7.0] * 10, reader.stat("b"))
+
+    def test_schemaExtension(self) -> None:
+        dumps = [(0, ["a"], [1.0]), (1, ["a", "b"], [1.0, 2.0])]
+        self._write(dumps)
+        with DeltaBinReader(self.path) as reader:
+            self.assertEqual(["a", "b"], reader.names)
+            self.assertEqual({"a": 1.0}, reader.dump(0))
+            self.assertEqual({"a": 1.0, "b": 2.0}, reader.dump(1))
+            self.assertEqual([None, 2.0], reader.stat("b"))
+
+    def test_notDeltaBin(self) -> None:
+        with open(self.path, "wb") as fp:
+            fp.write(b"---------- Begin Simulation Statistics")
+        with self.assertRaises(ValueError):
+            DeltaBinReader(self.path)
@@ -0,0 +1,204 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+
+from m5.ext.pystats import jsonloader
+from m5.ext.pystats.group import Group, Vector
+from m5.ext.pystats.jsonloader import iterload, load
+from m5.ext.pystats.simstat import SimStat
+from m5.ext.pystats.statistic import Distribution, Scalar
+
+
+def _synthetic_stats(num_cores: int, stats_per_core: int) -> str:
+    """A JSON stats file with num_cores * (stats_per_core + 3) stats."""
+    cores = {}
+    for c in range(num_cores):
+        stats = {
+            f"stat{s}": Scalar(value=c * stats_per_core + s, unit="Count")
+            for s in range(stats_per_core)
+        }
+        stats["ipc"] = Scalar(value=c + 0.5, unit="Ratio")
+        stats["vec"] = Vector({"read": Scalar(value=c), "write": Scalar(1)})
+        stats["lat"] = Distribution(
+            value=[c, 1, 2],
+            min=0,
+            max=29,
+            num_bins=3,
+            bin_size=10,
+            sum=3,
+        )
+        cores[f"cores{c}"] = Group(core=Group(**stats))
+    simstat = SimStat(board=Group(processor=Group(**cores)))
+    return simstat.dumps()
+
+
+class _SmallReads(io.StringIO):
+    """Reads at most 7 characters at a time."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 7))
+
+
+class JsonLoaderTestSuite(unittest.TestCase):
+    """Test cases for m5.ext.pystats.jsonloader"""
+
+    def test_iterloadAll(self) -> None:
+        text = _synthetic_stats(num_cores=4, stats_per_core=10)
+        loaded = load(io.StringIO(text))
+        streamed = dict(iterload(io.StringIO(text)))
+
+        # 10 stats, the ipc, the two vector elements and the distribution
+        self.assertEqual(4 * 14, len(streamed))
+        for path, stat in streamed.items():
+            self.assertEqual(stat.to_json(), loaded[path].to_json())
+
+    def test_iterloadRegex(self) -> None:
+        text = _synthetic_stats(num_cores=4, stats_per_core=10)
+        streamed = list(iterload(io.StringIO(text), regex=r".*\.ipc$"))
+        self.assertEqual(
+            [
+                (f"board.processor.cores{c}.core.ipc", c + 0.5)
+                for c in range(4)
+            ],
+            [(path, stat.value) for path, stat in streamed],
+        )
+
+    def test_iterloadPaths(self) -> None:
+        text = _synthetic_stats(num_cores=4, stats_per_core=10)
+        streamed = dict(
+            iterload(
+                io.StringIO(text),
+                paths=[
+                    "board.processor.cores1.core.vec",
+                    "board.processor.cores2.core.lat",
+                ],
+            )
+        )
+        self.assertEqual(
+            {
+                "board.processor.cores1.core.vec.read",
+                "board.processor.cores1.core.vec.write",
+                "board.processor.cores2.core.lat",
+            },
+            set(streamed),
+        )
+        self.assertEqual(
+            [2, 1, 2], streamed["board.processor.cores2.core.lat"].value
+        )
+
+    def test_smallWindow(self) -> None:
+        # Values and keys spanning the read window must still be decoded
+        text = _synthetic_stats(num_cores=2, stats_per_core=3)
+        expected = dict(iterload(io.StringIO(text)))
+
+        streamed = dict(iterload(_SmallReads(text)))
+        self.assertEqual(
+            {k: v.to_json() for k, v in expected.items()},
+            {k: v.to_json() for k, v in streamed.items()},
+        )
+
+    def test_largeGroups(self) -> None:
+        # Objects which don't fit in the window are walked member by member,
+        # down to the statistics.
+        text = _synthetic_stats(num_cores=4, stats_per_core=10)
+        loaded = load(io.StringIO(text))
+        for limit in (1, 200):
+            with mock.patch.object(jsonloader, "_decode_limit", limit):
+                streamed = dict(iterload(_SmallReads(text)))
+                self.assertEqual(4 * 14, len(streamed))
+                for path, stat in streamed.items():
+                    self.assertEqual(stat.to_json(), loaded[path].to_json())
+
+                streamed = dict(
+                    iterload(
+                        _SmallReads(text),
+                        paths=["board.processor.cores1"],
+                        regex=r".*\.vec\.",
+                    )
+                )
+                self.assertEqual(
+                    {
+                        "board.processor.cores1.core.vec.read",
+                        "board.processor.cores1.core.vec.write",
+                    },
+                    set(streamed),
+                )
+
+    def test_memoryAndTime(self) -> None:
+        # Compare the streaming loader, filtering stats, with the loader
+        # building the whole SimStat.
+        # A file is used since a StringIO copies its whole text on reads.
+        stats_file = tempfile.TemporaryFile("w+")
+        self.addCleanup(stats_file.close)
+        stats_file.write(_synthetic_stats(num_cores=200, stats_per_core=100))
+
+        def measure(func):
+            elapsed = float("inf")
+            for _ in range(3):
+                stats_file.seek(0)
+                start = time.perf_counter()
+                func()
+                elapsed = min(elapsed, time.perf_counter() - start)
+            # Measured separately as tracing slows allocations down
+            stats_file.seek(0)
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return elapsed, peak
+
+        full_time, full_peak = measure(lambda: load(stats_file))
+        for kwargs in (
+            {"paths": ["board.processor.cores7.core.ipc"]},
+            {"regex": r".*\.ipc$"},
+        ):
+            with self.subTest(**kwargs):
+                stream_time, stream_peak = measure(
+                    lambda: list(iterload(stats_file, **kwargs))
+                )
+                self.assertLess(stream_peak, full_peak / 4)
+                self.assertLess(stream_time, full_time)
+
+    def test_slots(self) -> None:
+        # Statistics don't need a __dict__ per object
+        self.assertFalse(hasattr(Scalar(value=1), "__dict__"))
+        self.assertEqual(
+            {
+                "value": 1,
+                "type": "Scalar",
+                "unit": None,
+                "description": None,
+                "datatype": None,
+            },
+            Scalar(value=1).to_json(),
+        )
@@ -0,0 +1,81 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import inspect
+import unittest
+
+import m5.objects
+import m5.params
+import m5.proxy
+from m5.SimObject import SimObject
+
+
+class ObjectsTestSuite(unittest.TestCase):
+    """Test cases for the lazily populated m5.objects namespace"""
+
+    def test_attribute(self) -> None:
+        self.assertTrue(inspect.isclass(m5.objects.Root))
+        self.assertTrue(issubclass(m5.objects.Root, SimObject))
+
+    def test_fromImport(self) -> None:
+        from m5.objects import ClockedObject
+
+        self.assertIs(ClockedObject, m5.objects.ClockedObject)
+
+    def test_submoduleDoesNotShadow(self) -> None:
+        from m5.objects.ClockedObject import ClockedObject
+
+        import m5.objects.ClockedObject
+
+        self.assertIs(ClockedObject, m5.objects.ClockedObject)
+
+    def test_reexported(self) -> None:
+        # Names the SimObject modules import come from where they're defined
+        from m5.objects._names import names
+
+        self.assertEqual("m5.params", names["AddrRange"])
+        self.assertEqual("m5.params", names["Port"])
+        self.assertEqual("m5.proxy", names["Parent"])
+        self.assertEqual("m5.SimObject", names["SimObject"])
+        self.assertIs(m5.params.AddrRange, m5.objects.AddrRange)
+        self.assertIs(m5.params.NULL, m5.objects.NULL)
+        self.assertIs(m5.proxy.Parent, m5.objects.Parent)
+        self.assertIs(SimObject, m5.objects.SimObject)
+
+    def test_dir(self) -> None:
+        self.assertIn("Root", dir(m5.objects))
+
+    def test_missing(self) -> None:
+        self.assertFalse(hasattr(m5.objects, "NotASimObject"))
+        with self.assertRaises(ImportError):
+            from m5.objects import NotASimObject
+
+    def test_starImport(self) -> None:
+        namespace = {}
+        exec("from m5.objects import *", namespace)
+        self.assertIs(namespace["Root"], m5.objects.Root)
+        self.assertIs(namespace["Param"], m5.objects.Param)
+        self.assertNotIn("load_all", namespace)
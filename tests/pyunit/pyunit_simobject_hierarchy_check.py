@@ -0,0 +1,251 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from m5.params import NULL, Param, isNullPointer
+from m5.proxy import isproxy
+from m5.SimObject import SimObject, isSimObject
+
+
+class HierarchyCheckMemory(SimObject):
+    type = "HierarchyCheckMemory"
+    cxx_header = "sim/sim_object.hh"
+    cxx_class = "gem5::SimObject"
+
+
+class HierarchyCheckCpu(SimObject):
+    type = "HierarchyCheckCpu"
+    cxx_header = "sim/sim_object.hh"
+    cxx_class = "gem5::SimObject"
+
+    memory = Param.HierarchyCheckMemory(NULL, "The memory of the CPU")
+
+
+class HierarchyCheckNode(SimObject):
+    type = "HierarchyCheckNode"
+    cxx_header = "sim/sim_object.hh"
+    cxx_class = "gem5::SimObject"
+
+
+_types = (
+    SimObject,
+    HierarchyCheckMemory,
+    HierarchyCheckCpu,
+    HierarchyCheckNode,
+)
+
+
+# The recursive walks SimObject.find_any() and find_all() did before the
+# configuration tree was indexed
+def _walk_find_any(obj, ptype):
+    if isinstance(obj, ptype):
+        return obj, True
+
+    found_obj = None
+    for child in obj._children.values():
+        if isinstance(child, ptype):
+            if found_obj != None and child != found_obj:
+                raise AttributeError("parent.any matched more than one")
+            found_obj = child
+    for pname, pdesc in obj._params.items():
+        if issubclass(pdesc.ptype, ptype):
+            match_obj = obj._values[pname]
+            if found_obj != None and found_obj != match_obj:
+                raise AttributeError("parent.any matched more than one")
+            found_obj = match_obj
+    return found_obj, found_obj != None
+
+
+def _walk_find_all(obj, ptype):
+    all = {}
+    for child in obj._children.values():
+        children = child if isinstance(child, list) else [child]
+        for child in children:
+            if (
+                isinstance(child, ptype)
+                and not isproxy(child)
+                and not isNullPointer(child)
+            ):
+                all[child] = True
+            if isSimObject(child):
+                all.update(dict.fromkeys(_walk_find_all(child, ptype)[0]))
+    for pname, pdesc in obj._params.items():
+        if issubclass(pdesc.ptype, ptype):
+            match_obj = obj._values[pname]
+            if not isproxy(match_obj) and not isNullPointer(match_obj):
+                all[match_obj] = True
+    return sorted(all.keys(), key=lambda o: o.path()), True
+
+
+def _find_any(obj, ptype):
+    # The result of find_any(), or the type of the exception it raised
+    try:
+        return obj.find_any(ptype)
+    except AttributeError:
+        return AttributeError
+
+
+def _walk_any(obj, ptype):
+    try:
+        return _walk_find_any(obj, ptype)
+    except AttributeError:
+        return AttributeError
+
+
+class SimObjectHierarchyTestSuite(unittest.TestCase):
+    """
+    Test cases for the index of the configuration tree resolving
+    SimObject.find_any() and find_all(), checked against the recursive walk
+    they replaced, and for the cached SimObject.descendants_list().
+    """
+
+    def setUp(self) -> None:
+        # top
+        #   memory
+        #   cpus[0]: memory -> top.memory
+        #   cpus[1]: memory -> cpus[1].memory (a child)
+        #   node
+        #     cpu: memory -> top.memory
+        #     node
+        #       memories[0], memories[1]
+        self.top = HierarchyCheckNode()
+        self.top.memory = HierarchyCheckMemory()
+        self.top.cpus = [
+            HierarchyCheckCpu(memory=self.top.memory),
+            HierarchyCheckCpu(memory=HierarchyCheckMemory()),
+        ]
+        self.top.node = HierarchyCheckNode()
+        self.top.node.cpu = HierarchyCheckCpu(memory=self.top.memory)
+        self.top.node.node = HierarchyCheckNode()
+        self.top.node.node.memories = [
+            HierarchyCheckMemory(),
+            HierarchyCheckMemory(),
+        ]
+
+    def _assert_matches_walk(self) -> None:
+        for obj in self.top.descendants():
+            for ptype in _types:
+                with self.subTest(obj=obj.path(), ptype=ptype.__name__):
+                    self.assertEqual(
+                        _walk_find_all(obj, ptype), obj.find_all(ptype)
+                    )
+                    self.assertEqual(
+                        _walk_any(obj, ptype), _find_any(obj, ptype)
+                    )
+
+    def test_tree(self) -> None:
+        self._assert_matches_walk()
+
+    def test_vectorChildren(self) -> None:
+        memories = self.top.node.node.memories
+        self.assertEqual(
+            ([memories[0], memories[1]], True),
+            self.top.node.node.find_all(HierarchyCheckMemory),
+        )
+
+    def test_params(self) -> None:
+        # top.memory is only a parameter of top.node.cpu, not a child of
+        # top.node
+        cpu = self.top.node.cpu
+        found, _ = self.top.node.find_all(HierarchyCheckMemory)
+        self.assertIn(self.top.memory, found)
+        self.assertEqual(3, len(found))
+        self.assertEqual(
+            (self.top.memory, True), cpu.find_any(HierarchyCheckMemory)
+        )
+
+    def test_ambiguousAny(self) -> None:
+        # Two children, of which one is also a parameter
+        cpu = self.top.cpus[0]
+        cpu.cache = HierarchyCheckMemory()
+        with self.assertRaisesRegex(AttributeError, "more than one"):
+            cpu.find_any(HierarchyCheckMemory)
+        # A parameter, and a child which isn't its value
+        cpu = self.top.cpus[1]
+        cpu.memory = self.top.memory
+        with self.assertRaisesRegex(AttributeError, "more than one"):
+            cpu.find_any(HierarchyCheckMemory)
+        self._assert_matches_walk()
+
+    def test_treeChanges(self) -> None:
+        node = self.top.node
+        memory = self.top.node.node.memories[0]
+        node.find_all(HierarchyCheckMemory)
+
+        # A subtree moved from one parent to another
+        self.top.node.clear_child("node")
+        self.assertNotIn(memory, node.find_all(HierarchyCheckMemory)[0])
+        self.top.cpus[0].add_child("node", memory._parent)
+        self.assertIn(
+            memory, self.top.cpus[0].find_all(HierarchyCheckMemory)[0]
+        )
+        self._assert_matches_walk()
+
+        # A parameter changed to an object out of the tree, which becomes
+        # a child
+        self.top.node.cpu.memory = HierarchyCheckMemory()
+        self.assertEqual(
+            (self.top.node.cpu.memory, True),
+            self.top.node.cpu.find_any(HierarchyCheckMemory),
+        )
+        self._assert_matches_walk()
+
+        # A child added through a vector
+        self.top.nodes = [HierarchyCheckNode(), HierarchyCheckNode()]
+        self.top.nodes[1].cpu = HierarchyCheckCpu()
+        self._assert_matches_walk()
+
+    def test_descendantsList(self) -> None:
+        node = self.top.node
+
+        def check():
+            for obj in (self.top, node):
+                self.assertEqual(
+                    list(obj.descendants()), obj.descendants_list()
+                )
+
+        check()
+        # The walk is only done again once the tree has changed
+        self.assertIs(self.top.descendants_list(), self.top.descendants_list())
+
+        node.cache = HierarchyCheckMemory()
+        check()
+        subtree = node.node
+        node.clear_child("node")
+        check()
+        self.top.cpus[1].add_child("node", subtree)
+        check()
+        self.top.cpus = [HierarchyCheckCpu()]
+        check()
+        # A parameter set to an object out of the tree adopts it
+        node.cpu.memory = HierarchyCheckMemory()
+        check()
+        self.assertIn(node.cpu.memory, node.descendants_list())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from m5.ext.pystats.group import Group, Vector
+from m5.ext.pystats.simstat import SimStat
+from m5.ext.pystats.statistic import Scalar
+
+
+class StatPathTestSuite(unittest.TestCase):
+    """Test cases for path-based access to pystats objects"""
+
+    def setUp(self) -> None:
+        self.ipc = Scalar(value=1.5)
+        core = Group(ipc=self.ipc, **{"cache.misses": Scalar(value=3)})
+        vector = Vector({"read": Scalar(value=1), "write": Scalar(value=2)})
+        self.simstat = SimStat(
+            board=Group(processor=Group(cores0=Group(core=core, vec=vector)))
+        )
+
+    def test_path(self) -> None:
+        self.assertIs(
+            self.ipc, self.simstat["board.processor.cores0.core.ipc"]
+        )
+        self.assertEqual(
+            2, self.simstat["board.processor.cores0.vec.write"].value
+        )
+
+    def test_relativePath(self) -> None:
+        processor = self.simstat["board.processor"]
+        self.assertIs(self.ipc, processor["cores0.core.ipc"])
+
+    def test_nameWithDots(self) -> None:
+        stat = self.simstat["board.processor.cores0.core.cache.misses"]
+        self.assertEqual(3, stat.value)
+
+    def test_missing(self) -> None:
+        with self.assertRaises(KeyError):
+            self.simstat["board.processor.cores1.core.ipc"]
+
+    def test_notAStat(self) -> None:
+        for path in (
+            "board.children",
+            "board.to_json",
+            "board.processor.cores0.core.ipc.value",
+            "board.processor.cores0.core.ipc.unit",
+        ):
+            with self.subTest(path=path):
+                with self.assertRaises(KeyError):
+                    self.simstat[path]
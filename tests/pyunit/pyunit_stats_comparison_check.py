@@ -0,0 +1,331 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# tests/gem5 isn't a package which can be imported here, as its name is the
+# same as the stdlib's.
+_spec = importlib.util.spec_from_file_location(
+    "stats_comparison",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        os.pardir,
+        "gem5",
+        "stats_comparison.py",
+    ),
+)
+stats_comparison = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stats_comparison)
+
+StatsComparator = stats_comparison.StatsComparator
+
+_begin = "---------- Begin Simulation Statistics ----------"
+_end = "---------- End Simulation Statistics   ----------"
+
+
+def _txt(*stats) -> str:
+    lines = [_begin]
+    lines += [f"{name} {value} # A stat" for name, value in stats]
+    lines += [_end, ""]
+    return "\n".join(lines)
+
+
+class StatsComparisonTestSuite(unittest.TestCase):
+    """Test cases for tests/gem5/stats_comparison.py"""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def _file(self, name: str, contents: str) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+
+    def _compare_txt(self, trusted, test, **kwargs):
+        return StatsComparator(**kwargs).compare_txt(
+            self._file("trusted.txt", trusted), self._file("test.txt", test)
+        )
+
+    def _compare_json(self, trusted, test, chunk_limit=1 << 16, **kwargs):
+        with mock.patch.object(
+            stats_comparison, "_json_chunk_limit", chunk_limit
+        ):
+            return StatsComparator(**kwargs).compare_json(
+                self._file("trusted.json", json.dumps(trusted)),
+                self._file("test.json", json.dumps(test)),
+            )
+
+    def test_identical(self) -> None:
+        stats = _txt(("a", 1), ("b", 2.5))
+        self.assertEqual([], self._compare_txt(stats, stats))
+
+    def test_reordered(self) -> None:
+        trusted = _txt(("a", 1), ("b", 2), ("c", 3), ("d", 4))
+        test = _txt(("c", 3), ("a", 1), ("d", 4), ("b", 2))
+        self.assertEqual([], self._compare_txt(trusted, test))
+
+    def test_tolerances(self) -> None:
+        trusted = _txt(("sim.cycles", 1000), ("sim.insts", 1000))
+        test = _txt(("sim.cycles", 1005), ("sim.insts", 1005))
+        self.assertEqual(2, len(self._compare_txt(trusted, test)))
+        self.assertEqual([], self._compare_txt(trusted, test, rel_tol=0.01))
+        self.assertEqual([], self._compare_txt(trusted, test, abs_tol=5))
+
+        mismatches = self._compare_txt(
+            trusted, test, tolerances=[(r"\.cycles$", 0.01, 0)]
+        )
+        self.assertEqual(["sim.insts"], [m.name for m in mismatches])
+        self.assertEqual(
+            (1000, 1005), (mismatches[0].trusted, mismatches[0].test)
+        )
+
+    def test_nan(self) -> None:
+        trusted = _txt(("a", "nan"), ("b", "nan"))
+        test = _txt(("a", "nan"), ("b", 1))
+        mismatches = self._compare_txt(trusted, test, rel_tol=1)
+        self.assertEqual(["b"], [m.name for m in mismatches])
+
+    def test_missingAndExtra(self) -> None:
+        trusted = _txt(("a", 1), ("b", 2))
+        test = _txt(("a", 1), ("c", 3))
+        mismatches = self._compare_txt(trusted, test)
+        self.assertEqual(
+            ["b: missing", "c: not in the trusted stats"],
+            sorted(str(m) for m in mismatches),
+        )
+
+        mismatches = self._compare_txt(trusted, test, allow_extra=True)
+        self.assertEqual(["b: missing"], [str(m) for m in mismatches])
+
+    def test_maxMismatches(self) -> None:
+        trusted = _txt(*((f"s{i}", i) for i in range(10)))
+        test = _txt(*((f"s{i}", i + 1) for i in range(10)))
+        self.assertEqual(
+            3, len(self._compare_txt(trusted, test, max_mismatches=3))
+        )
+
+    def test_jsonOneLine(self) -> None:
+        # json.dumps() writes the whole document on one line, which is read
+        # in blocks splitting every token, and every object is walked.
+        trusted = {
+            "system": {
+                "cpu": {"numCycles": {"value": 1000, "unit": "Cycle"}},
+                "names": ["a", 'b "quoted", {}'],
+            },
+            "ok": True,
+        }
+        with mock.patch.object(stats_comparison, "_json_chunk_limit", 3):
+            stats = list(
+                stats_comparison._json_stats(io.StringIO(json.dumps(trusted)))
+            )
+            self.assertEqual(
+                [
+                    ("system.cpu.numCycles.value", 1000),
+                    ("system.cpu.numCycles.unit", "Cycle"),
+                    ("system.names.0", "a"),
+                    ("system.names.1", 'b "quoted", {}'),
+                    ("ok", True),
+                ],
+                stats,
+            )
+
+        test = json.loads(json.dumps(trusted))
+        test["system"]["cpu"]["numCycles"]["value"] = 1001
+        mismatches = self._compare_json(trusted, test, chunk_limit=3)
+        self.assertEqual(
+            ["system.cpu.numCycles.value"], [m.name for m in mismatches]
+        )
+
+    def test_invalidJson(self) -> None:
+        for document in ('{"a": "b', '{"a": 1', '{"a" 1}', "[1, 2] 3"):
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    list(stats_comparison._json_stats(io.StringIO(document)))
+
+    def test_jsonChunks(self) -> None:
+        # Whichever way the documents are cut into chunks, and even if they
+        # are cut differently, the same mismatches are found.
+        trusted = {
+            "sim": {"seconds": 1.5, "ticks": 1500},
+            "cpu": {
+                "ipc": {"value": float("nan"), "unit": "Count"},
+                "cycles": {"value": 1000, "unit": "Cycle"},
+                "hist": {"value": [1, 2, 3], "unit": "Count"},
+                "latency": {"value": [4, 5], "unit": "Tick"},
+                "kind": {"value": "o3"},
+            },
+            "empty": {},
+            "gone": {"value": 1},
+        }
+        test = json.loads(json.dumps(trusted))
+        test["cpu"]["cycles"]["value"] = 1001
+        test["cpu"]["hist"]["value"][2] = 4
+        test["cpu"]["latency"]["value"].append(6)
+        test["cpu"]["kind"] = "o3"
+        test["cpu"]["extra"] = {"value": 1}
+        del test["gone"]
+        expected = [
+            "cpu.cycles.value: trusted_value: 1000, test_value: 1001",
+            "cpu.extra.value: not in the trusted stats",
+            "cpu.hist.value.2: trusted_value: 3, test_value: 4",
+            "cpu.kind.value: missing",
+            "cpu.kind: not in the trusted stats",
+            "cpu.latency.value.2: not in the trusted stats",
+            "gone.value: missing",
+        ]
+
+        for chunk_limit in (1, 20, 60, 1 << 16):
+            for pending in (0, 64):
+                with self.subTest(chunk_limit=chunk_limit, pending=pending):
+                    with mock.patch.object(
+                        stats_comparison, "_json_pending_chunks", pending
+                    ):
+                        mismatches = self._compare_json(
+                            trusted, test, chunk_limit=chunk_limit
+                        )
+                    self.assertEqual(expected, sorted(map(str, mismatches)))
+
+        # Only the test document is larger than the chunk limit
+        test["cpu"]["padding"] = {"value": "x" * 200}
+        mismatches = self._compare_json(
+            trusted, test, chunk_limit=200, allow_extra=True
+        )
+        self.assertEqual(
+            [s for s in expected if "not in the trusted" not in s],
+            sorted(map(str, mismatches)),
+        )
+
+    def test_jsonSpeed(self) -> None:
+        # A large stats file differing by a single stat near its end, which
+        # isn't found by comparing the files byte by byte. Comparing them
+        # takes about as long as decoding them both with the stdlib.
+        cores = {
+            f"cpu{i}": {
+                f"stat{j}": {
+                    "value": i * j,
+                    "type": "Scalar",
+                    "unit": "Count",
+                    "description": f"Statistic {j} of every core",
+                }
+                for j in range(100)
+            }
+            for i in range(200)
+        }
+        trusted = self._file("trusted.json", json.dumps({"system": cores}))
+        cores["cpu199"]["stat90"]["value"] = -1
+        test = self._file("test.json", json.dumps({"system": cores}))
+
+        def best_time(function) -> float:
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                function()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        def load() -> None:
+            for path in (trusted, test):
+                with open(path) as f:
+                    json.load(f)
+
+        mismatches = StatsComparator().compare_json(trusted, test)
+        self.assertEqual(
+            ["system.cpu199.stat90.value"], [m.name for m in mismatches]
+        )
+        compare_time = best_time(
+            lambda: StatsComparator().compare_json(trusted, test)
+        )
+        self.assertLess(compare_time, best_time(load) * 2)
+
+    def test_extraStats(self) -> None:
+        # The trusted stats are a subset of the test stats, with two of them
+        # in a different order.
+        trusted = {"a": 1, "c": 3, "b": 2, "z": 26}
+        test = {"a": 1, "b": 2, "c": 3}
+        test.update((f"extra{i}", i) for i in range(1000))
+        test["z"] = 26
+        # The documents are walked stat by stat
+        self.assertEqual(
+            [],
+            self._compare_json(
+                trusted,
+                test,
+                chunk_limit=1,
+                allow_extra=True,
+                reorder_window=4,
+            ),
+        )
+
+    def test_reorderWindow(self) -> None:
+        # The test file lists "b" 10 extra stats before the trusted stats
+        # which come before it in the trusted file.
+        trusted = {f"s{i}": i for i in range(10)}
+        trusted["b"] = 2
+        test = {"b": 2}
+        test.update((f"extra{i}", i) for i in range(10))
+        test.update((f"s{i}", i) for i in range(10))
+
+        self.assertEqual(
+            [],
+            self._compare_json(trusted, test, chunk_limit=1, allow_extra=True),
+        )
+        # Extra stats are only kept for the last 4 stats, once the stats
+        # which couldn't be matched as they were read are flattened
+        with mock.patch.object(stats_comparison, "_json_pending_chunks", 0):
+            mismatches = self._compare_json(
+                trusted,
+                test,
+                chunk_limit=1,
+                allow_extra=True,
+                reorder_window=4,
+            )
+        self.assertEqual(["b: missing"], [str(m) for m in mismatches])
+        self.assertEqual(
+            [],
+            self._compare_json(
+                trusted,
+                test,
+                chunk_limit=1,
+                allow_extra=True,
+                reorder_window=4,
+            ),
+        )
+        # Or if the documents are decoded whole, and matched key by key
+        self.assertEqual(
+            [],
+            self._compare_json(
+                trusted, test, allow_extra=True, reorder_window=4
+            ),
+        )
@@ -0,0 +1,157 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import contextlib
+import io
+import math
+import os
+import tempfile
+import unittest
+
+from m5.ext.pystats.statstxt import StatsTxtFile, main
+
+
+def _dump(tick: int, ipc: float, extra: bool = False) -> str:
+    lines = [
+        "",
+        "---------- Begin Simulation Statistics ----------",
+        f"simTicks {tick:>40} # Number of ticks simulated (Tick)",
+        f"system.cpu.ipc {ipc:>34.6f} # IPC (Count/Cycle)",
+        "system.cpu.ipc_total 1.000000 # Not the IPC (Count/Cycle)",
+        "system.cpu.dist::samples 10 # Latency (Cycle)",
+        "system.cpu.dist::0-9 4 40.00% 40.00% # Latency (Cycle)",
+        "system.cpu.dist::10-19 6 60.00% 100.00% # Latency (Cycle)",
+        "system.cpu.vec | 1 50.00% 50.00% | 1 50.00% 100.00% # Oneline",
+        "system.cpu.nanStat nan # Not a number (Ratio)",
+    ]
+    if extra:
+        lines.append("system.cpu.extra 7 # Only in this dump (Count)")
+    lines += ["", "---------- End Simulation Statistics   ----------", ""]
+    return "\n".join(lines)
+
+
+class StatsTxtTestSuite(unittest.TestCase):
+    """Test cases for m5.ext.pystats.statstxt"""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def _write(self, text: str, *path: str) -> str:
+        path = os.path.join(self.dir.name, *path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_dumps(self) -> None:
+        path = self._write(
+            _dump(100, 0.5) + _dump(200, 1.5, extra=True) + _dump(300, 2.5),
+            "stats.txt",
+        )
+        with StatsTxtFile(path) as stats:
+            self.assertEqual(3, len(stats))
+            self.assertEqual(
+                [
+                    "simTicks",
+                    "system.cpu.ipc",
+                    "system.cpu.ipc_total",
+                    "system.cpu.dist::samples",
+                    "system.cpu.dist::0-9",
+                    "system.cpu.dist::10-19",
+                    "system.cpu.nanStat",
+                ],
+                stats.names(0),
+            )
+            dump = stats.dump(1)
+            self.assertEqual(200, dump["simTicks"])
+            self.assertEqual(7, dump["system.cpu.extra"])
+            self.assertEqual(6, dump["system.cpu.dist::10-19"])
+            self.assertTrue(math.isnan(dump["system.cpu.nanStat"]))
+
+    def test_stat(self) -> None:
+        path = self._write(
+            _dump(100, 0.5) + _dump(200, 1.5, extra=True) + _dump(300, 2.5),
+            "stats.txt",
+        )
+        with StatsTxtFile(path) as stats:
+            # Before and after the dumps are indexed
+            for _ in range(2):
+                self.assertEqual(
+                    [0.5, 1.5, 2.5], list(stats["system.cpu.ipc"])
+                )
+                extra = list(stats.stat("system.cpu.extra"))
+                self.assertTrue(math.isnan(extra[0]))
+                self.assertEqual(7, extra[1])
+                self.assertTrue(math.isnan(extra[2]))
+                stats.dump(0)
+                stats.dump(1)
+
+    def test_match(self) -> None:
+        path = self._write(_dump(100, 0.5) + _dump(200, 1.5), "stats.txt")
+        with StatsTxtFile(path) as stats:
+            self.assertEqual({"system.cpu.ipc": 1.5}, stats.match(r".*\.ipc$"))
+            self.assertEqual(
+                {"system.cpu.ipc": 0.5, "system.cpu.ipc_total": 1.0},
+                stats.match("system.cpu.ipc", dump=0),
+            )
+            with self.assertRaises(IndexError):
+                stats.match(".*", dump=2)
+
+    def test_unterminated(self) -> None:
+        # The last dump of a running simulation is partially written
+        first = _dump(100, 0.5)
+        second = _dump(200, 1.5)
+        text = first + second[: second.index("system.cpu.dist::0-9") + 5]
+        path = self._write(text, "stats.txt")
+        with StatsTxtFile(path) as stats:
+            self.assertEqual(2, len(stats))
+            self.assertEqual([0.5, 1.5], list(stats.stat("system.cpu.ipc")))
+            self.assertEqual(4, len(stats.names(1)))
+
+    def test_main(self) -> None:
+        self._write(_dump(100, 0.5) + _dump(200, 1.5), "run0", "stats.txt")
+        self._write(_dump(300, 2.5), "run1", "stats.txt")
+        self._write("not stats", "run1", "other.txt")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([self.dir.name, "--regex", r".*ipc$", "--dump", "-1"])
+        self.assertEqual(
+            [
+                [os.path.join(self.dir.name, "run0", "stats.txt"), "1"],
+                [os.path.join(self.dir.name, "run1", "stats.txt"), "0"],
+            ],
+            [line.split("\t")[:2] for line in output.getvalue().splitlines()],
+        )
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([self.dir.name, "--stat", "simTicks"])
+        self.assertEqual(
+            ["100.0", "200.0", "300.0"],
+            [line.split("\t")[3] for line in output.getvalue().splitlines()],
+        )
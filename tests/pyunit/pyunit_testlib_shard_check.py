@@ -0,0 +1,107 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "ext"
+    ),
+)
+
+from testlib.runner import longest_first, shard
+
+
+class _Item:
+    def __init__(self, uid: str) -> None:
+        self.uid = uid
+
+
+class TestlibShardTestSuite(unittest.TestCase):
+    """Test cases for testlib.runner.shard and longest_first"""
+
+    def setUp(self) -> None:
+        self.items = [_Item(f"suite{i}") for i in range(6)]
+
+    def _shards(self, durations: dict, count: int) -> list:
+        return [
+            [item.uid for item in shard(self.items, durations, i, count)]
+            for i in range(1, count + 1)
+        ]
+
+    def _assert_partition(self, shards: list) -> None:
+        self.assertEqual(
+            sorted(item.uid for item in self.items),
+            sorted(uid for uids in shards for uid in uids),
+        )
+
+    def test_no_history(self) -> None:
+        shards = self._shards({}, 3)
+        self._assert_partition(shards)
+        self.assertEqual([2, 2, 2], [len(uids) for uids in shards])
+
+    def test_zero_durations(self) -> None:
+        durations = {item.uid: 0.0 for item in self.items}
+        shards = self._shards(durations, 3)
+        self._assert_partition(shards)
+        self.assertEqual([2, 2, 2], [len(uids) for uids in shards])
+
+    def test_balanced_by_duration(self) -> None:
+        durations = {
+            "suite0": 10.0,
+            "suite1": 5.0,
+            "suite2": 3.0,
+            "suite3": 1.0,
+            "suite4": 1.0,
+        }
+        shards = self._shards(durations, 2)
+        self._assert_partition(shards)
+        # suite5 has no duration so is expected to take as long as suite0.
+        self.assertEqual(
+            [["suite0", "suite1"], ["suite2", "suite3", "suite4", "suite5"]],
+            shards,
+        )
+
+    def test_more_shards_than_items(self) -> None:
+        shards = self._shards({}, 8)
+        self._assert_partition(shards)
+        self.assertEqual([1] * 6 + [0] * 2, [len(uids) for uids in shards])
+
+    def test_bad_index(self) -> None:
+        with self.assertRaises(ValueError):
+            shard(self.items, {}, 0, 3)
+        with self.assertRaises(ValueError):
+            shard(self.items, {}, 4, 3)
+
+    def test_longest_first(self) -> None:
+        durations = {"suite0": 1.0, "suite1": 3.0, "suite2": 2.0}
+        self.assertEqual(
+            ["suite1", "suite3", "suite4", "suite5", "suite2", "suite0"],
+            [item.uid for item in longest_first(self.items, durations)],
+        )
@@ -0,0 +1,192 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import importlib
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+_tests = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(_tests, os.pardir, "ext"))
+
+# tests/gem5 isn't a package which can be imported here, as its name is the
+# same as the stdlib's: it is imported under another name, without running
+# its __init__.py.
+_package = types.ModuleType("_gem5_tests")
+_package.__path__ = [os.path.join(_tests, "gem5")]
+sys.modules.setdefault("_gem5_tests", _package)
+verifier = importlib.import_module("_gem5_tests.verifier")
+
+_begin = "---------- Begin Simulation Statistics ----------"
+_end = "---------- End Simulation Statistics   ----------"
+
+
+class _Failure(Exception):
+    """Raised by test_util.fail() in place of testlib's own exception."""
+
+
+def _fail(message: str) -> None:
+    raise _Failure(message)
+
+
+class VerifierTestSuite(unittest.TestCase):
+    """Test cases for the stats verifiers of tests/gem5/verifier.py"""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.params = SimpleNamespace(
+            fixtures={
+                verifier.constants.tempdir_fixture_name: SimpleNamespace(
+                    path=self.dir.name
+                )
+            }
+        )
+        patcher = mock.patch.object(
+            verifier.test_util,
+            "fail",
+            _fail,
+            create=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _file(self, name: str, contents: str) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+
+    def _mismatches(self, stats_verifier) -> str:
+        """The report of the failed verification, or None if it passed."""
+        try:
+            stats_verifier.test(self.params)
+        except _Failure as failure:
+            return failure.args[0]
+        return None
+
+    def _match_stats(self, **kwargs):
+        def txt(*stats):
+            lines = [_begin]
+            lines += [f"{name} {value} # A stat" for name, value in stats]
+            return "\n".join(lines + [_end, ""])
+
+        trusted = self._file(
+            "trusted.txt",
+            txt(
+                ("sim.cycles", 1000),
+                ("sim.insts", 1000),
+                ("cpu.ipc", 1.0),
+                ("hostSeconds", 1),
+            ),
+        )
+        self._file(
+            verifier.constants.gem5_simulation_stats,
+            txt(
+                ("sim.cycles", 1005),
+                ("sim.insts", 1000),
+                ("cpu.ipc", 0.5),
+                ("hostSeconds", 2),
+            ),
+        )
+        return self._mismatches(verifier.MatchStats(trusted, **kwargs))
+
+    def _match_json_stats(self, **kwargs):
+        trusted = self._file(
+            "trusted.json",
+            json.dumps(
+                {
+                    "sim": {"cycles": 1000, "insts": 1000},
+                    "cpu": {"ipc": 1.0},
+                }
+            ),
+        )
+        test = self._file(
+            "test.json",
+            json.dumps(
+                {
+                    "sim": {"cycles": 1005, "insts": 1000},
+                    "cpu": {"ipc": 0.5},
+                    "host": {"seconds": 2},
+                }
+            ),
+        )
+        return self._mismatches(
+            verifier.MatchJSONStats(trusted, test, **kwargs)
+        )
+
+    def test_matchStats(self) -> None:
+        report = self._match_stats()
+        self.assertIn("sim.cycles: trusted_value: 1000", report)
+        self.assertIn("cpu.ipc: trusted_value: 1.0", report)
+        # The host stats are ignored by default
+        self.assertNotIn("hostSeconds", report)
+
+        report = self._match_stats(tolerances=[(r"\.cycles$", 0.01, 0)])
+        self.assertNotIn("sim.cycles", report)
+        self.assertIn("cpu.ipc", report)
+
+        self.assertIsNone(
+            self._match_stats(
+                tolerances=[(r"\.cycles$", 0.01, 0)], exclude=r"^cpu\."
+            )
+        )
+        self.assertIsNone(self._match_stats(include=[r"^sim\.insts$"]))
+        report = self._match_stats(include=r"^sim\.")
+        self.assertIn("sim.cycles", report)
+        self.assertNotIn("cpu.ipc", report)
+        # The default ignored stats are still ignored with more excluded
+        self.assertIsNone(self._match_stats(exclude=[r"^sim", r"^cpu"]))
+
+    def test_matchJSONStats(self) -> None:
+        report = self._match_json_stats()
+        self.assertIn("sim.cycles: trusted_value: 1000", report)
+        self.assertIn("cpu.ipc: trusted_value: 1.0", report)
+        # The test file may hold more stats than the trusted one
+        self.assertNotIn("host", report)
+
+        report = self._match_json_stats(tolerances=[(r"\.cycles$", 0.01, 0)])
+        self.assertNotIn("sim.cycles", report)
+        self.assertIn("cpu.ipc", report)
+
+        self.assertIsNone(
+            self._match_json_stats(
+                tolerances=[(r"\.cycles$", 0.01, 0)], exclude=r"^cpu\."
+            )
+        )
+        self.assertIsNone(self._match_json_stats(include=[r"^sim\.insts$"]))
+        report = self._match_json_stats(include=r"^sim\.")
+        self.assertIn("sim.cycles", report)
+        self.assertNotIn("cpu.ipc", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
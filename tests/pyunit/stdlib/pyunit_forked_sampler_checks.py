@@ -0,0 +1,308 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from gem5.simulate import sampling
+from gem5.simulate.exit_event import ExitEvent
+from gem5.simulate.sampling import ForkedSampler
+
+
+class _ChildExit(Exception):
+    """Raised instead of ending the process when a child exits."""
+
+    def __init__(self, code: int) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+class _Processor:
+    """Stands in for a SimpleSwitchableProcessor."""
+
+    def __init__(self) -> None:
+        self.switches = 0
+
+    def switch(self) -> None:
+        self.switches += 1
+
+
+class _Simpoint:
+    """Stands in for a SimpointResource."""
+
+    def __init__(self, starts, warmups, weights, interval=100) -> None:
+        self._starts = starts
+        self._warmups = warmups
+        self._weights = weights
+        self._interval = interval
+
+    def get_simpoint_start_insts(self):
+        return self._starts
+
+    def get_warmup_list(self):
+        return self._warmups
+
+    def get_weight_list(self):
+        return self._weights
+
+    def get_simpoint_interval(self):
+        return self._interval
+
+
+class _Board:
+    def __init__(self, simpoint: _Simpoint) -> None:
+        self._processor = _Processor()
+        self._simpoint = simpoint
+
+    def get_processor(self) -> _Processor:
+        return self._processor
+
+    def get_simpoint(self) -> _Simpoint:
+        return self._simpoint
+
+    def get_looppoint(self):
+        raise Exception("No LoopPoint workload")
+
+
+class _Simulator:
+    """
+    Stands in for the Simulator, running a scripted sequence of exit events
+    through the exit event generators until one of them returns True.
+    """
+
+    def __init__(self, board, on_exit_event) -> None:
+        self.on_exit_event = on_exit_event
+        self.events = []
+        self.max_insts = []
+
+    def run(self) -> None:
+        while self.events:
+            if next(self.on_exit_event[self.events.pop(0)]):
+                return
+
+    def schedule_max_insts(self, insts: int) -> None:
+        self.max_insts.append(insts)
+
+    def get_simstats(self):
+        return SimpleNamespace(
+            to_json=lambda: {
+                "board": {
+                    "cycles": {"value": 30, "unit": "Cycle"},
+                    "name": {"value": "board"},
+                }
+            }
+        )
+
+
+class ForkedSamplerTestSuite(unittest.TestCase):
+    """
+    Test cases for gem5.simulate.sampling.ForkedSampler, with m5.fork() and
+    os.waitpid() standing in for the forked children.
+    """
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.options = SimpleNamespace(outdir=self.dir.name)
+        self.stats = mock.Mock()
+        self.warn = mock.Mock()
+
+        # The region the first fork() is in the child of, if any
+        self.child_region = None
+        # The exit status of each child, by region id, 0 by default
+        self.statuses = {}
+        self.forked = []
+        self.children = []
+
+        for target, name, value in (
+            (sampling.m5, "options", self.options),
+            (sampling.m5, "stats", self.stats),
+            (sampling.m5, "fork", self._fork),
+            (sampling.m5, "disableAllListeners", mock.Mock()),
+            (sampling.core, "doExitCleanup", mock.Mock()),
+            (sampling.os, "waitpid", self._waitpid),
+            (sampling.os, "_exit", self._exit),
+            (sampling, "warn", self.warn),
+            (sampling, "Simulator", _Simulator),
+            (sampling, "SwitchableProcessor", _Processor),
+        ):
+            patcher = mock.patch.object(target, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _fork(self, outdir: str) -> int:
+        region_id = os.path.basename(outdir)[len("region") :]
+        self.forked.append(region_id)
+        if region_id == self.child_region:
+            # As the child's output directory is changed by fork()
+            self.options.outdir = outdir.replace(
+                "%(parent)s", self.options.outdir
+            )
+            os.makedirs(self.options.outdir)
+            return 0
+        pid = 1000 + len(self.forked)
+        self.children.append((pid, region_id))
+        return pid
+
+    def _waitpid(self, pid: int, options: int):
+        self.assertEqual((-1, 0), (pid, options))
+        pid, region_id = self.children.pop(0)
+        status = self.statuses.get(region_id, 0)
+        if status == 0:
+            outdir = os.path.join(self.options.outdir, f"region{region_id}")
+            os.makedirs(outdir)
+            with open(os.path.join(outdir, "sampling.json"), "w") as f:
+                json.dump({"insts": 10 * (int(region_id) + 1)}, f)
+        return pid, status
+
+    def _exit(self, code: int) -> None:
+        raise _ChildExit(code)
+
+    def _sampler(self, simpoint: _Simpoint, events, **kwargs):
+        sampler = ForkedSampler(board=_Board(simpoint), **kwargs)
+        sampler.get_simulator().events = list(events)
+        return sampler
+
+    def _results(self):
+        with open(os.path.join(self.dir.name, "sampling.json")) as f:
+            return json.load(f)
+
+    def test_duplicateStarts(self) -> None:
+        # Two SimPoints start at the same instruction. gem5 only exits once
+        # there, and a child is forked for each.
+        sampler = self._sampler(
+            _Simpoint([300, 100, 300], [0, 0, 0], [0.25, 0.5, 0.25]),
+            [ExitEvent.SIMPOINT_BEGIN] * 2 + [ExitEvent.EXIT],
+            max_children=2,
+        )
+        weighted = sampler.run()
+
+        self.assertEqual(["1", "0", "2"], self.forked)
+        self.assertEqual([], self.children)
+        # The parent stops once every region is forked
+        self.assertEqual([ExitEvent.EXIT], sampler.get_simulator().events)
+        self.assertEqual(
+            {0: {"insts": 10}, 1: {"insts": 20}, 2: {"insts": 30}},
+            sampler.get_region_stats(),
+        )
+        self.assertEqual({"insts": 0.25 * 10 + 0.5 * 20 + 0.25 * 30}, weighted)
+        self.assertEqual(weighted, self._results()["weighted"])
+        self.assertEqual(0.5, self._results()["regions"]["1"]["weight"])
+        # The parent neither switches cores nor schedules MAX_INSTS exits
+        self.assertEqual(0, sampler._processor.switches)
+        self.assertEqual([], sampler.get_simulator().max_insts)
+        self.warn.assert_not_called()
+
+    def test_duplicateStartChild(self) -> None:
+        # The child of the first SimPoint at a start doesn't fork the others
+        self.child_region = "0"
+        sampler = self._sampler(
+            _Simpoint([300, 100, 300], [0, 0, 0], [0.25, 0.5, 0.25]),
+            [ExitEvent.SIMPOINT_BEGIN] * 2 + [ExitEvent.MAX_INSTS],
+        )
+        self.assertEqual(0, self._run_child(sampler))
+        self.assertEqual(["1", "0"], self.forked)
+        self.assertEqual([100], sampler.get_simulator().max_insts)
+
+    def _run_child(self, sampler: ForkedSampler) -> int:
+        with self.assertRaises(_ChildExit) as cm:
+            sampler.run()
+        with open(os.path.join(self.options.outdir, "sampling.json")) as f:
+            self.assertEqual({"board.cycles": 30}, json.load(f))
+        return cm.exception.code
+
+    def test_warmupRegion(self) -> None:
+        self.child_region = "0"
+        sampler = self._sampler(
+            _Simpoint([100, 300], [50, 50], [0.5, 0.5]),
+            [ExitEvent.SIMPOINT_BEGIN] + [ExitEvent.MAX_INSTS] * 2,
+        )
+        self.assertEqual(0, self._run_child(sampler))
+
+        self.assertEqual(
+            os.path.join(self.dir.name, "region0"), self.options.outdir
+        )
+        self.assertEqual(1, sampler._processor.switches)
+        # The warmup, then the region
+        self.assertEqual([50, 100], sampler.get_simulator().max_insts)
+        self.assertEqual(2, self.stats.reset.call_count)
+        self.assertEqual(1, self.stats.dump.call_count)
+        sampling.core.doExitCleanup.assert_called_once_with()
+        self.warn.assert_not_called()
+
+    def test_noWarmupRegion(self) -> None:
+        self.child_region = "0"
+        sampler = self._sampler(
+            _Simpoint([100, 300], [0, 50], [0.5, 0.5]),
+            [ExitEvent.SIMPOINT_BEGIN] + [ExitEvent.MAX_INSTS] * 2,
+        )
+        self.assertEqual(0, self._run_child(sampler))
+
+        # The region ends on the first MAX_INSTS exit
+        self.assertEqual([ExitEvent.MAX_INSTS], sampler.get_simulator().events)
+        self.assertEqual([100], sampler.get_simulator().max_insts)
+        self.assertEqual(1, self.stats.reset.call_count)
+        self.assertEqual(1, self.stats.dump.call_count)
+
+    def test_childFails(self) -> None:
+        # One child exits with an error, another is killed by a signal
+        self.statuses = {"1": 1 << 8, "2": 9}
+        sampler = self._sampler(
+            _Simpoint([100, 200, 300], [0, 0, 0], [0.5, 0.25, 0.25]),
+            [ExitEvent.SIMPOINT_BEGIN] * 3,
+        )
+        with self.assertRaisesRegex(Exception, "regions failed: 1, 2$"):
+            sampler.run()
+        # The other children are still waited for
+        self.assertEqual([], self.children)
+        self.assertEqual({0: {"insts": 10}}, sampler.get_region_stats())
+
+    def test_workloadEndsEarly(self) -> None:
+        sampler = self._sampler(
+            _Simpoint([100, 300, 500], [0, 0, 0], [0.5, 0.25, 0.25]),
+            [ExitEvent.SIMPOINT_BEGIN, ExitEvent.EXIT],
+        )
+        weighted = sampler.run()
+
+        self.assertEqual(["0"], self.forked)
+        self.assertIn("before 2 of", self.warn.call_args[0][0])
+        self.assertEqual({"insts": 0.5 * 10}, weighted)
+        self.assertEqual(["0"], list(self._results()["regions"]))
+
+    def test_workloadEndsInRegion(self) -> None:
+        self.child_region = "0"
+        sampler = self._sampler(
+            _Simpoint([100, 300], [0, 0], [0.5, 0.5]),
+            [ExitEvent.SIMPOINT_BEGIN, ExitEvent.EXIT],
+        )
+        # The child still writes the stats of the partial region
+        self.assertEqual(0, self._run_child(sampler))
+        self.assertIn("ended in region 0", self.warn.call_args[0][0])
+        self.assertEqual(1, self.stats.dump.call_count)
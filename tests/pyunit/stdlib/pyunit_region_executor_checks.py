@@ -0,0 +1,126 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import m5
+
+from gem5.simulate.region_executor import RegionExecutor, SampledRegion
+
+
+def simulate(board_builder, region: SampledRegion, outdir: str) -> str:
+    """
+    Stands in for the simulation of a region, behaving as its id says.
+    """
+    first = os.path.basename(outdir) == f"region{region.region_id}"
+    if region.region_id == "crash" or (region.region_id == "flaky" and first):
+        # As fatal() does
+        os._exit(1)
+    if region.region_id == "abort":
+        # As panic() does
+        os.abort()
+    if region.region_id == "hang" or (region.region_id == "slow" and first):
+        time.sleep(3600)
+    return json.dumps({"ticks": {"value": len(str(region.region_id))}})
+
+
+class ForkedRegionExecutor(RegionExecutor):
+    _process_class = multiprocessing.get_context("fork").Process
+    _simulate = staticmethod(simulate)
+
+
+class RegionExecutorTestSuite(unittest.TestCase):
+    """Test cases for gem5.simulate.region_executor.RegionExecutor"""
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        outdir = m5.options.outdir
+        self.addCleanup(setattr, m5.options, "outdir", outdir)
+        m5.options.outdir = self.dir.name
+
+    def _run(self, region_ids, **kwargs) -> RegionExecutor:
+        regions = [
+            SampledRegion(
+                region_id=region_id,
+                checkpoint=Path("cpt"),
+                weight=0.5,
+                expected_length=length,
+            )
+            for length, region_id in enumerate(region_ids)
+        ]
+        self.done = []
+        executor = ForkedRegionExecutor(None, regions, **kwargs)
+        self.weighted = executor.run(
+            on_result=lambda result: self.done.append(
+                (result.region.region_id, result.attempt)
+            )
+        )
+        return executor
+
+    def test_regions(self) -> None:
+        executor = self._run(["a", "bb", "ccc"], processes=1)
+        self.assertEqual([], executor.get_failed())
+        self.assertEqual({"a", "bb", "ccc"}, set(executor.get_results()))
+        # The longest regions are started first
+        self.assertEqual([("ccc", 1), ("bb", 1), ("a", 1)], self.done)
+        self.assertEqual({"ticks": 3.0}, self.weighted)
+        with open(os.path.join(self.dir.name, "regions.json")) as f:
+            self.assertEqual(self.weighted, json.load(f)["weighted"])
+
+    def test_retry(self) -> None:
+        executor = self._run(["flaky", "ok"], retries=1)
+        self.assertEqual([], executor.get_failed())
+        self.assertEqual(2, executor.get_results()["flaky"].attempt)
+        self.assertEqual(1, executor.get_results()["ok"].attempt)
+
+    def test_crash(self) -> None:
+        executor = self._run(["crash", "abort", "ok"], retries=2)
+        self.assertEqual({"crash", "abort"}, set(executor.get_failed()))
+        self.assertEqual({"ok"}, set(executor.get_results()))
+        self.assertEqual({"ticks": 1.0}, self.weighted)
+        # The first attempt and both retries
+        self.assertTrue(
+            os.path.isdir(os.path.join(self.dir.name, "regioncrash.retry2"))
+        )
+
+    def test_timeout(self) -> None:
+        executor = self._run(["slow", "ok"], processes=1, retries=1, timeout=1)
+        self.assertEqual([], executor.get_failed())
+        self.assertEqual(2, executor.get_results()["slow"].attempt)
+
+    def test_hang(self) -> None:
+        start = time.time()
+        executor = self._run(["hang", "ok"], processes=1, retries=1, timeout=1)
+        self.assertEqual(["hang"], executor.get_failed())
+        self.assertEqual({"ok"}, set(executor.get_results()))
+        self.assertLess(time.time() - start, 60)
@@ -0,0 +1,138 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import enum
+import tempfile
+import unittest
+from pathlib import Path
+
+from gem5.simulate.result_cache import (
+    FingerprintError,
+    ResultCache,
+    generator_fingerprint,
+)
+
+
+def exit_generator(count: int, path: Path):
+    for _ in range(count):
+        yield False
+    yield True
+
+
+def other_exit_generator(count: int, path: Path):
+    for _ in range(count + 1):
+        yield False
+    yield True
+
+
+def object_exit_generator(state):
+    yield True
+
+
+class _State:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+class _Mode(enum.Enum):
+    FAST = 1
+    SLOW = 2
+
+
+class ResultCacheTestSuite(unittest.TestCase):
+    """Test cases for gem5.simulate.result_cache"""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.cache = ResultCache(self.dir / "cache")
+        self.outdir = self.dir / "m5out"
+        self.outdir.mkdir()
+
+    def test_storeAndLoad(self) -> None:
+        (self.outdir / "stats.txt").write_text("Some stats")
+        (self.outdir / "fs").mkdir()
+        self.assertIsNone(self.cache.load("0123"))
+
+        self.cache.store("0123", {"tick": 10}, str(self.outdir))
+        self.assertEqual(10, self.cache.load("0123")["tick"])
+        self.assertIsNone(self.cache.load("4567"))
+
+        # Existing entries are kept
+        self.cache.store("0123", {"tick": 20}, str(self.outdir))
+        self.assertEqual(10, self.cache.load("0123")["tick"])
+
+    def test_restoreOutputs(self) -> None:
+        (self.outdir / "stats.txt").write_text("Some stats")
+        (self.outdir / "simout").write_text("Some output")
+        self.cache.store("0123", {}, str(self.outdir))
+
+        restored = self.dir / "restored"
+        restored.mkdir()
+        (restored / "stats.txt").write_text("")
+        (restored / "simout").write_text("Current output")
+        self.cache.restore_outputs("0123", str(restored), skip=["simout"])
+        self.assertEqual("Some stats", (restored / "stats.txt").read_text())
+        self.assertEqual("Current output", (restored / "simout").read_text())
+
+    def test_generatorFingerprint(self) -> None:
+        path = Path("checkpoints")
+        self.assertEqual(
+            generator_fingerprint(exit_generator(2, path)),
+            generator_fingerprint(exit_generator(2, path)),
+        )
+        # Different arguments or code give different fingerprints
+        self.assertNotEqual(
+            generator_fingerprint(exit_generator(2, path)),
+            generator_fingerprint(exit_generator(3, path)),
+        )
+        self.assertNotEqual(
+            generator_fingerprint(exit_generator(2, path)),
+            generator_fingerprint(exit_generator(2, Path("other"))),
+        )
+        self.assertNotEqual(
+            generator_fingerprint(exit_generator(2, path))[1],
+            generator_fingerprint(other_exit_generator(2, path))[1],
+        )
+
+    def test_generatorFingerprintValues(self) -> None:
+        self.assertNotEqual(
+            generator_fingerprint(object_exit_generator(_Mode.FAST)),
+            generator_fingerprint(object_exit_generator(_Mode.SLOW)),
+        )
+        self.assertEqual(
+            generator_fingerprint(object_exit_generator({"b", "a", "c"})),
+            generator_fingerprint(object_exit_generator({"c", "b", "a"})),
+        )
+
+    def test_generatorFingerprintUnknownValue(self) -> None:
+        # Objects of the same type may hold different states, so they can't
+        # be fingerprinted by their type.
+        with self.assertRaises(FingerprintError):
+            generator_fingerprint(object_exit_generator(_State(1)))
+        with self.assertRaises(FingerprintError):
+            generator_fingerprint(object_exit_generator([1, _State(1)]))
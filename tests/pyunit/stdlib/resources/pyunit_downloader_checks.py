@@ -0,0 +1,186 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+from unittest import mock
+
+from gem5.resources.downloader import _download
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves `server.data`, honoring single Range requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            fail = server.fail_after is not None and (
+                server.requests > server.fail_after
+            )
+            # Requests after the probe may be cut short
+            drop = server.requests > 1 and server.drops > 0
+            if drop:
+                server.drops -= 1
+        if fail:
+            self.send_error(503)
+            return
+
+        data = server.data
+        match = re.fullmatch(
+            r"bytes=(\d+)-(\d+)", self.headers.get("Range", "")
+        )
+        if match is None or not server.ranges:
+            self.send_response(200)
+            body = data
+        else:
+            start, end = int(match.group(1)), int(match.group(2))
+            if start >= len(data):
+                self.send_error(416)
+                return
+            body = data[start : end + 1]
+            self.send_response(206)
+            if server.content_range:
+                self.send_header(
+                    "Content-Range",
+                    f"bytes {start}-{start + len(body) - 1}/{len(data)}",
+                )
+            self.send_header("ETag", '"test"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if drop:
+            # The connection is closed in the middle of the body
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class DownloaderTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.downloader._download()"""
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.daemon_threads = True
+        self.server.data = os.urandom(1000 * 1000 + 17)
+        self.server.ranges = True
+        self.server.fail_after = None
+        self.server.drops = 0
+        self.server.content_range = True
+        self.server.requests = 0
+        self.server.connections = set()
+        self.server.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/file"
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.download_to = os.path.join(self.dir.name, "file")
+
+    def _check_downloaded(self, md5: str) -> None:
+        with open(self.download_to, "rb") as f:
+            self.assertEqual(self.server.data, f.read())
+        self.assertEqual(hashlib.md5(self.server.data).hexdigest(), md5)
+        self.assertEqual(
+            [], [p for p in os.listdir(self.dir.name) if p != "file"]
+        )
+
+    def test_rangeDownload(self) -> None:
+        md5 = _download(
+            self.url, self.download_to, connections=4, chunk_size=64 * 1024
+        )
+        self._check_downloaded(md5)
+        # One probe and 16 chunks, over at most one connection per thread
+        # plus the probe's.
+        self.assertEqual(17, self.server.requests)
+        self.assertLessEqual(len(self.server.connections), 5)
+
+    def test_noRangeSupport(self) -> None:
+        self.server.ranges = False
+        md5 = _download(self.url, self.download_to, chunk_size=64 * 1024)
+        self._check_downloaded(md5)
+        self.assertEqual(1, self.server.requests)
+
+    def test_resume(self) -> None:
+        # The server fails after the probe and 5 chunks.
+        self.server.fail_after = 6
+        with self.assertRaises(Exception):
+            _download(
+                self.url,
+                self.download_to,
+                max_attempts=1,
+                connections=1,
+                chunk_size=64 * 1024,
+            )
+        with open(f"{self.download_to}.part.json") as f:
+            self.assertEqual(list(range(5)), json.load(f)["done"])
+
+        self.server.fail_after = None
+        self.server.requests = 0
+        md5 = _download(
+            self.url, self.download_to, connections=2, chunk_size=64 * 1024
+        )
+        self._check_downloaded(md5)
+        # Only the missing chunks are downloaded again
+        self.assertEqual(1 + 16 - 5, self.server.requests)
+
+    def test_noContentRange(self) -> None:
+        # Without Content-Range, the size of the file isn't known
+        self.server.content_range = False
+        md5 = _download(self.url, self.download_to, chunk_size=64 * 1024)
+        self._check_downloaded(md5)
+
+    @mock.patch("gem5.resources.downloader.time.sleep")
+    def test_connectionDropped(self, sleep) -> None:
+        # A chunk is retried once on a new connection, so dropping it twice
+        # fails the attempt, which resumes after a backoff.
+        self.server.drops = 2
+        md5 = _download(
+            self.url, self.download_to, connections=1, chunk_size=64 * 1024
+        )
+        self._check_downloaded(md5)
+        self.assertEqual(1, sleep.call_count)
+        # The probe and the dropped chunk twice, maybe the chunk the thread
+        # started next, then the probe and every chunk.
+        self.assertIn(self.server.requests, (1 + 2 + 1 + 16, 1 + 3 + 1 + 16))
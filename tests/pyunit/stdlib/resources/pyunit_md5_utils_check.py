@@ -114,3 +114,31 @@ class MD5DirTestSuite(unittest.TestCase):
         shutil.rmtree(dir2)
 
         self.assertEquals(first_md5, second_md5)
+
+    def test_md5DirThreadsConsistency(self) -> None:
+        # Reading files ahead with multiple threads must not change the value
+        # recorded for gem5-resources entries.
+
+        dir = self._create_temp_directory()
+        with open(os.path.join(dir, "dir2", "large"), "wb") as f:
+            f.write(bytes(range(256)) * 8192)
+        open(os.path.join(dir, "empty"), "w").close()
+
+        expected = md5_dir(dir)
+        for threads in (1, 2, 8):
+            self.assertEqual(expected, md5_dir(dir, threads=threads))
+        shutil.rmtree(dir)
+
+    def test_md5DirPerFile(self) -> None:
+        # The per-file value does not depend on the number of threads, and
+        # differs from the single stream value.
+
+        dir = self._create_temp_directory()
+        md5 = md5_dir(dir, legacy=False)
+        self.assertEqual(md5, md5_dir(dir, threads=4, legacy=False))
+        self.assertNotEqual(md5_dir(dir), md5)
+
+        with open(os.path.join(dir, "dir2", "file1"), "w") as f:
+            f.write("Changed data")
+        self.assertNotEqual(md5, md5_dir(dir, threads=4, legacy=False))
+        shutil.rmtree(dir)
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gem5.resources import cache as cache_module
+from gem5.resources.cache import ResourceCache, mark_in_use, parse_size
+from gem5.resources.md5_utils import md5_dir, md5_file
+from gem5.utils.filelock import FileLock
+
+
+class ResourceCacheTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.cache.ResourceCache"""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.cache = ResourceCache(str(self.dir))
+
+    def _write(self, name: str, data: str) -> Path:
+        path = self.dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data)
+        return path
+
+    def test_verifiedMd5Cached(self) -> None:
+        path = self._write("file", "Some test data here")
+        with mock.patch.object(
+            cache_module, "md5_file", wraps=md5_file
+        ) as hashed:
+            self.assertEqual(md5_file(path), self.cache.verified_md5(path))
+            self.assertEqual(md5_file(path), self.cache.verified_md5(path))
+            # Unchanged files are only hashed once
+            self.assertEqual(1, hashed.call_count)
+
+            path.write_text("Other data")
+            self.assertEqual(md5_file(path), self.cache.verified_md5(path))
+            self.assertEqual(2, hashed.call_count)
+
+    def test_verifiedMd5Directory(self) -> None:
+        self._write("dir/file1", "Some test data here")
+        self._write("dir/sub/file2", "Yet more data")
+        path = self.dir / "dir"
+        with mock.patch.object(
+            cache_module, "md5_dir", wraps=md5_dir
+        ) as hashed:
+            self.assertEqual(md5_dir(path), self.cache.verified_md5(path))
+            self.assertEqual(md5_dir(path), self.cache.verified_md5(path))
+            self.assertEqual(1, hashed.call_count)
+
+            # Adding a file anywhere in the directory invalidates the entry
+            self._write("dir/sub/file3", "")
+            self.assertEqual(md5_dir(path), self.cache.verified_md5(path))
+            self.assertEqual(2, hashed.call_count)
+
+    def test_recordAndFind(self) -> None:
+        path = self._write("file", "Some test data here")
+        self.cache.record(path, "0123")
+        with mock.patch.object(cache_module, "md5_file") as hashed:
+            self.assertEqual("0123", self.cache.verified_md5(path))
+            self.assertEqual(path, self.cache.find("0123"))
+            hashed.assert_not_called()
+        self.assertIsNone(self.cache.find("4567"))
+
+    def test_evict(self) -> None:
+        paths = []
+        for i in range(4):
+            paths.append(self._write(f"file{i}", "x" * 100))
+            self.cache.verified_md5(paths[-1])
+            time.sleep(0.01)
+        # file0 is now the most recently used
+        self.cache.verified_md5(paths[0])
+        self.assertEqual(400, self.cache.total_size())
+
+        self.cache.evict(300, keep=[paths[1]])
+        self.assertEqual(
+            [True, True, False, True], [p.exists() for p in paths]
+        )
+        self.assertEqual(300, self.cache.total_size())
+
+        # Resources being obtained are locked, and are never evicted
+        with FileLock(f"{paths[3]}.lock"):
+            self.cache.evict(0, keep=[paths[1]])
+        self.assertEqual(
+            [False, True, False, True], [p.exists() for p in paths]
+        )
+
+    def test_evictInUse(self) -> None:
+        paths = []
+        for i in range(3):
+            paths.append(self._write(f"dir{i}/file", "x" * 100).parent)
+            self.cache.verified_md5(paths[-1])
+            time.sleep(0.01)
+        # Resources used by any gem5 process, including this one, are never
+        # evicted, even if they are the least recently used.
+        mark_in_use(paths[0])
+        self.cache.evict(100)
+        self.assertEqual([True, False, False], [p.exists() for p in paths])
+        self.assertEqual(100, self.cache.total_size())
+
+    def test_hardLinks(self) -> None:
+        path = self._write("file", "x" * 100)
+        os.link(path, self.dir / "link")
+        self.cache.verified_md5(path)
+        time.sleep(0.01)
+        self.cache.verified_md5(self.dir / "link")
+        self._write("other", "y" * 100)
+        time.sleep(0.01)
+        self.cache.verified_md5(self.dir / "other")
+        # The hard links are only counted once
+        self.assertEqual(200, self.cache.total_size())
+
+        # Evicting one of the links frees nothing, so the other goes too
+        self.cache.evict(100)
+        self.assertFalse(path.exists())
+        self.assertFalse((self.dir / "link").exists())
+        self.assertTrue((self.dir / "other").exists())
+        self.assertEqual(100, self.cache.total_size())
+
+    def test_parseSize(self) -> None:
+        self.assertEqual(1000, parse_size("1000"))
+        self.assertEqual(512 * 2**20, parse_size("512M"))
+        self.assertEqual(20 * 2**30, parse_size("20GiB"))
+        self.assertEqual(2**39, parse_size("0.5T"))
+        with self.assertRaises(ValueError):
+            parse_size("lots")
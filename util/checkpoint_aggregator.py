@@ -28,9 +28,27 @@
 
 from configparser import ConfigParser
 import gzip
+import multiprocessing
+import shutil
+import time
 
 import sys, re, os
 
+# Assume x86 ISA.  Any other ISAs would need extra stuff in this script
+# to appropriately parse their page tables and understand page sizes.
+page_size = 1 << 12
+
+# Memory is copied in blocks of this many bytes
+block_size = 1 << 24
+
+# Holes are left in the uncompressed output for zero runs of this size
+hole_size = 1 << 16
+
+# Zero padding past the checkpoints is compressed in parts of this size
+padding_part_size = 1 << 30
+
+mem_file_name = "system.physmem.store0.pmem"
+
 
 class myCP(ConfigParser):
     def __init__(self):
@@ -40,114 +58,229 @@ class myCP(ConfigParser):
         return optionstr
 
 
-def aggregate(output_dir, cpts, no_compress, memory_size):
-    merged_config = None
-    page_ptr = 0
-
-    output_path = output_dir
-    if not os.path.isdir(output_path):
-        os.system("mkdir -p " + output_path)
-
-    agg_mem_file = open(output_path + "/system.physmem.store0.pmem", "wb+")
-    agg_config_file = open(output_path + "/m5.cpt", "wb+")
-
-    if not no_compress:
-        merged_mem = gzip.GzipFile(fileobj=agg_mem_file, mode="wb")
+def open_mem(path):
+    """Opens the memory file of a checkpoint, gzipped or not."""
+    f = open(path, "rb")
+    if f.read(2) == b"\x1f\x8b":
+        f.seek(0)
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    f.seek(0)
+    return f
+
+
+def read_blocks(path, size):
+    """
+    Yields the first size bytes of a memory file (all zeros if path is
+    None), a block at a time.
+    """
+    if path is None:
+        zeros = bytes(min(block_size, size))
+        while size:
+            yield zeros[: min(block_size, size)]
+            size -= min(block_size, size)
+        return
+
+    with open_mem(path) as mem:
+        while size:
+            block = mem.read(min(block_size, size))
+            if not block:
+                raise IOError(f"{path} is smaller than its checkpoint says")
+            size -= len(block)
+            yield block
+
+
+def copy_sparse(job):
+    """
+    Copies a memory file to its place in the uncompressed output, leaving
+    holes where the memory is zero.
+    """
+    path, size, offset, output, _ = job
+    start = time.time()
+    zeros = bytes(hole_size)
+    fd = os.open(output, os.O_WRONLY)
+    try:
+        for block in read_blocks(path, size):
+            view = memoryview(block)
+            for pos in range(0, len(block), hole_size):
+                chunk = view[pos : pos + hole_size]
+                if chunk != zeros[: len(chunk)]:
+                    os.pwrite(fd, chunk, offset + pos)
+            offset += len(block)
+    finally:
+        os.close(fd)
+    return path, size, time.time() - start
+
+
+def copy_compressed(job):
+    """
+    Compresses a memory file into a gzip member of its own. The members are
+    concatenated into the output once they are all written.
+    """
+    path, size, _, part, compress_level = job
+    start = time.time()
+    with open(part, "wb") as f:
+        with gzip.GzipFile(
+            fileobj=f, mode="wb", compresslevel=compress_level, mtime=0
+        ) as out:
+            for block in read_blocks(path, size):
+                out.write(block)
+    return path, size, time.time() - start
+
+
+def merge_config(i, config, page_ptr, num_digits, last):
+    """
+    The sections of a checkpoint's config in the aggregated checkpoint. The
+    CPUs are renamed after the index of the checkpoint, and the physical
+    addresses of the pages moved after the ones of the previous
+    checkpoints. The other sections are kept from the last checkpoint.
+    """
+    merged_config = myCP()
+    for sec in config.sections():
+        if re.compile("cpu").search(sec):
+            newsec = re.sub("cpu", "cpu" + str(i).zfill(num_digits), sec)
+            merged_config.add_section(newsec)
+
+            items = config.items(sec)
+            for item in items:
+                if item[0] == "paddr":
+                    merged_config.set(
+                        newsec,
+                        item[0],
+                        str(int(item[1]) + page_ptr * page_size),
+                    )
+                    continue
+                merged_config.set(newsec, item[0], item[1])
+
+            if re.compile("workload.FdMap256$").search(sec):
+                merged_config.set(newsec, "M5_pid", str(i))
+
+        elif sec == "system":
+            pass
+        elif sec == "Globals":
+            pass
+        else:
+            if last:
+                merged_config.add_section(sec)
+                for item in config.items(sec):
+                    merged_config.set(sec, item[0], item[1])
+    return merged_config
+
+
+def aggregate(
+    output_dir, cpts, no_compress, memory_size, jobs=None, compress_level=6
+):
+    start = time.time()
+    os.makedirs(output_dir, exist_ok=True)
+
+    # The configs are small: read them all first, to know where the memory
+    # of every checkpoint goes in the output.
+    configs = []
+    for cpt in cpts:
+        config = myCP()
+        with open(os.path.join(cpt, "m5.cpt")) as f:
+            config.read_file(f)
+        configs.append(config)
 
+    page_ptrs = []
+    page_ptr = 0
     max_curtick = 0
-    num_digits = len(str(len(cpts) - 1))
+    for config in configs:
+        page_ptrs.append(page_ptr)
+        page_ptr += int(config.get("system", "pagePtr"))
+        max_curtick = max(max_curtick, config.getint("Globals", "curTick"))
+
+    used_size = page_ptr * page_size
+    padding_pages = 0
+    if memory_size and memory_size > used_size:
+        padding_pages = -(-(memory_size - used_size) // page_size)
+
+    # The memory of every checkpoint, then the zero padding, as
+    # (input, size, offset) parts of the output
+    parts = [
+        (
+            os.path.join(cpt, mem_file_name),
+            int(config.get("system", "pagePtr")) * page_size,
+            ptr * page_size,
+        )
+        for cpt, config, ptr in zip(cpts, configs, page_ptrs)
+    ]
+    num_pages = page_ptr + padding_pages
+    mem_path = os.path.join(output_dir, mem_file_name)
+
+    if no_compress:
+        # Sparse output: the padding is a hole
+        with open(mem_path, "wb") as f:
+            f.truncate(num_pages * page_size)
+        work = [
+            (path, size, offset, mem_path, None)
+            for path, size, offset in parts
+        ]
+        copy = copy_sparse
+    else:
+        padding_size = padding_pages * page_size
+        offset = used_size
+        while padding_size:
+            size = min(padding_size, padding_part_size)
+            parts.append((None, size, offset))
+            padding_size -= size
+            offset += size
+        work = [
+            (path, size, offset, f"{mem_path}.part{i}", compress_level)
+            for i, (path, size, offset) in enumerate(parts)
+        ]
+        copy = copy_compressed
+
+    # Start with the largest inputs, so that a large one doesn't start last
+    order = sorted(range(len(work)), key=lambda i: -work[i][1])
+    with multiprocessing.Pool(jobs) as pool:
+        for path, size, seconds in pool.imap_unordered(
+            copy, [work[i] for i in order]
+        ):
+            print(
+                f"{path or 'zero padding'}: {size >> 20} MiB in "
+                f"{seconds:.1f}s ({size / max(seconds, 1e-6) / 2**20:.0f} "
+                "MiB/s)"
+            )
 
-    for (i, arg) in enumerate(cpts):
-        print(arg)
-        merged_config = myCP()
-        config = myCP()
-        config.readfp(open(cpts[i] + "/m5.cpt"))
-
-        for sec in config.sections():
-            if re.compile("cpu").search(sec):
-                newsec = re.sub("cpu", "cpu" + str(i).zfill(num_digits), sec)
-                merged_config.add_section(newsec)
-
-                items = config.items(sec)
-                for item in items:
-                    if item[0] == "paddr":
-                        merged_config.set(
-                            newsec, item[0], int(item[1]) + (page_ptr << 12)
-                        )
-                        continue
-                    merged_config.set(newsec, item[0], item[1])
-
-                if re.compile("workload.FdMap256$").search(sec):
-                    merged_config.set(newsec, "M5_pid", i)
-
-            elif sec == "system":
-                pass
-            elif sec == "Globals":
-                tick = config.getint(sec, "curTick")
-                if tick > max_curtick:
-                    max_curtick = tick
-            else:
-                if i == len(cpts) - 1:
-                    merged_config.add_section(sec)
-                    for item in config.items(sec):
-                        merged_config.set(sec, item[0], item[1])
-
-        if i != len(cpts) - 1:
+    if not no_compress:
+        # A file of concatenated gzip members is itself a valid gzip file
+        with open(mem_path, "wb") as out:
+            for job in work:
+                part = job[3]
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out, block_size)
+                os.remove(part)
+
+    with open(os.path.join(output_dir, "m5.cpt"), "w") as agg_config_file:
+        num_digits = len(str(len(cpts) - 1))
+        for i, (config, ptr) in enumerate(zip(configs, page_ptrs)):
+            last = i == len(cpts) - 1
+            merged_config = merge_config(i, config, ptr, num_digits, last)
+            if last:
+                merged_config.add_section("system")
+                merged_config.set("system", "pagePtr", str(page_ptr))
+                merged_config.set("system", "nextPID", str(len(cpts)))
+                merged_config.set(
+                    "system.physmem.store0",
+                    "range_size",
+                    str(num_pages * page_size),
+                )
+                merged_config.add_section("Globals")
+                merged_config.set("Globals", "curTick", str(max_curtick))
             merged_config.write(agg_config_file)
 
-        ### memory stuff
-        pages = int(config.get("system", "pagePtr"))
-        page_ptr = page_ptr + pages
-        print("pages to be read: ", pages)
-
-        f = open(cpts[i] + "/system.physmem.store0.pmem", "rb")
-        gf = gzip.GzipFile(fileobj=f, mode="rb")
-
-        x = 0
-        while x < pages:
-            bytesRead = gf.read(1 << 12)
-            if not no_compress:
-                merged_mem.write(bytesRead)
-            else:
-                agg_mem_file.write(bytesRead)
-            x += 1
-
-        gf.close()
-        f.close()
-
-    merged_config.add_section("system")
-    merged_config.set("system", "pagePtr", page_ptr)
-    merged_config.set("system", "nextPID", len(cpts))
-
-    file_size = page_ptr * 4 * 1024
-    dummy_data = "".zfill(4096)
-    while file_size < memory_size:
-        if not no_compress:
-            merged_mem.write(dummy_data)
-        else:
-            agg_mem_file.write(dummy_data)
-        file_size += 4 * 1024
-        page_ptr += 1
-
     print("WARNING: ")
     print(
         "Make sure the simulation using this checkpoint has at least ", end=" "
     )
-    print(page_ptr, "x 4K of memory")
-    merged_config.set(
-        "system.physmem.store0", "range_size", page_ptr * 4 * 1024
-    )
+    print(num_pages, "x 4K of memory")
 
-    merged_config.add_section("Globals")
-    merged_config.set("Globals", "curTick", max_curtick)
-
-    merged_config.write(agg_config_file)
-
-    if not no_compress:
-        merged_mem.close()
-        agg_mem_file.close()
-    else:
-        agg_mem_file.close()
+    seconds = time.time() - start
+    print(
+        f"Aggregated {len(cpts)} checkpoints ({used_size >> 20} MiB of "
+        f"memory) in {seconds:.1f}s "
+        f"({used_size / max(seconds, 1e-6) / 2**20:.0f} MiB/s)"
+    )
 
 
 if __name__ == "__main__":
@@ -160,12 +293,28 @@ if __name__ == "__main__":
     parser.add_argument(
         "-o", "--output-dir", action="store", help="Output directory"
     )
-    parser.add_argument("-c", "--no-compress", action="store_true")
+    parser.add_argument(
+        "-c",
+        "--no-compress",
+        action="store_true",
+        help="Write the memory uncompressed, as a sparse file",
+    )
     parser.add_argument("--cpts", nargs="+")
     parser.add_argument("--memory-size", action="store", type=int)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of checkpoints copied in parallel (default: number "
+        "of CPUs)",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=6,
+        help="gzip compression level of the memory",
+    )
 
-    # Assume x86 ISA.  Any other ISAs would need extra stuff in this script
-    # to appropriately parse their page tables and understand page sizes.
     options = parser.parse_args()
     print(options.cpts, len(options.cpts))
     if len(options.cpts) <= 1:
@@ -179,4 +328,6 @@ if __name__ == "__main__":
         options.cpts,
         options.no_compress,
         options.memory_size,
+        options.jobs,
+        options.compress_level,
     )
@@ -43,10 +43,11 @@ import protolib
 import subprocess
 import sys
 
-util_dir = os.path.dirname(os.path.realpath(__file__))
-# Make sure the proto definitions are up to date.
-subprocess.check_call(["make", "--quiet", "-C", util_dir, "packet_pb2.py"])
-import packet_pb2
+try:
+    # Decodes the packets in bulk, without the protobuf classes
+    import packet_trace
+except ImportError:
+    packet_trace = None
 
 
 def main():
@@ -54,20 +55,92 @@ def main():
         print("Usage: ", sys.argv[0], " <protobuf input> <ASCII output>")
         exit(-1)
 
-    # Open the file in read mode
-    proto_in = protolib.openFileRd(sys.argv[1])
-
     try:
         ascii_out = open(sys.argv[2], "w")
     except IOError:
         print("Failed to open ", sys.argv[2], " for writing")
         exit(-1)
 
+    if packet_trace:
+        decode_bulk(sys.argv[1], ascii_out)
+    else:
+        decode(sys.argv[1], ascii_out)
+
+    # We're done
+    ascii_out.close()
+
+
+def decode_bulk(in_file, ascii_out):
+    try:
+        reader = packet_trace.PacketTraceReader(in_file)
+    except ValueError:
+        print("Unrecognized file", in_file)
+        exit(-1)
+
+    print("Parsing packet header")
+    header = reader.header
+
+    print("Object id:", header.obj_id)
+    print("Tick frequency:", header.tick_freq)
+
+    for key, value in header.id_strings.items():
+        print("Master id %d: %s" % (key, value))
+
+    print("Parsing packets")
+
+    num_packets = 0
+    with reader:
+        for packets in reader.blocks():
+            num_packets += len(packets)
+            columns = [
+                packets[name].tolist()
+                for name in (
+                    "cmd",
+                    "addr",
+                    "size",
+                    "flags",
+                    "tick",
+                    "pkt_id",
+                    "pc",
+                    "present",
+                )
+            ]
+            lines = []
+            for cmd, addr, size, flags, tick, pkt_id, pc, present in zip(
+                *columns
+            ):
+                # ReadReq is 1 and WriteReq is 4 in src/mem/packet.hh
+                # Command enum
+                cmd = "r" if cmd == 1 else ("w" if cmd == 4 else "u")
+                line = (
+                    f"{pkt_id}," if present & packet_trace.HAS_PKT_ID else ""
+                )
+                if present & packet_trace.HAS_FLAGS:
+                    line += f"{cmd},{addr},{size},{flags},{tick}"
+                else:
+                    line += f"{cmd},{addr},{size},{tick}"
+                if present & packet_trace.HAS_PC:
+                    line += f",{pc}"
+                lines.append(line + "\n")
+            ascii_out.write("".join(lines))
+
+    print("Parsed packets:", num_packets)
+
+
+def decode(in_file, ascii_out):
+    util_dir = os.path.dirname(os.path.realpath(__file__))
+    # Make sure the proto definitions are up to date.
+    subprocess.check_call(["make", "--quiet", "-C", util_dir, "packet_pb2.py"])
+    import packet_pb2
+
+    # Open the file in read mode
+    proto_in = protolib.openFileRd(in_file)
+
     # Read the magic number in 4-byte Little Endian
     magic_number = proto_in.read(4).decode()
 
     if magic_number != "gem5":
-        print("Unrecognized file", sys.argv[1])
+        print("Unrecognized file", in_file)
         exit(-1)
 
     print("Parsing packet header")
@@ -107,8 +180,6 @@ def main():
 
     print("Parsed packets:", num_packets)
 
-    # We're done
-    ascii_out.close()
     proto_in.close()
 
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Copies the packets of a packet trace matching some criteria to a new
+# packet trace, without decoding them to text. For example, to keep the
+# reads of the first millisecond of a trace (the tick frequency is in the
+# trace header):
+#
+#   filter_packet_trace.py --cmd 1 --tick-range 0:1000000000 \
+#       system.monitor.trace.gz reads.trace.gz
+
+import argparse
+
+import numpy as np
+
+import packet_trace
+
+
+def parse_range(text):
+    """Parses a START:END range, END being optional."""
+    start, _, end = text.partition(":")
+    start = int(start, 0) if start else 0
+    end = int(end, 0) if end else None
+    if end is not None and end < start:
+        raise argparse.ArgumentTypeError(f"invalid range '{text}'")
+    return start, end
+
+
+def in_range(values, value_range):
+    start, end = value_range
+    selected = values >= start
+    if end is not None:
+        selected &= values < end
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Filter and slice gem5 packet traces."
+    )
+    parser.add_argument("input", help="packet trace to read")
+    parser.add_argument(
+        "output", help="packet trace to write, gzipped if it ends in .gz"
+    )
+    parser.add_argument(
+        "--tick-range",
+        type=parse_range,
+        metavar="START:END",
+        help="keep the packets with START <= tick < END",
+    )
+    parser.add_argument(
+        "--addr-range",
+        type=parse_range,
+        metavar="START:END",
+        help="keep the packets with START <= addr < END",
+    )
+    parser.add_argument(
+        "--cmd",
+        type=int,
+        action="append",
+        help="keep the packets with this command (e.g., 1 for ReadReq and "
+        "4 for WriteReq), can be repeated",
+    )
+    parser.add_argument(
+        "--skip",
+        type=int,
+        default=0,
+        help="skip the first SKIP matching packets",
+    )
+    parser.add_argument(
+        "--count", type=int, help="keep at most COUNT matching packets"
+    )
+    args = parser.parse_args()
+
+    to_skip = args.skip
+    to_keep = args.count
+    num_read = 0
+    num_written = 0
+    with packet_trace.PacketTraceReader(args.input) as reader:
+        with packet_trace.PacketTraceWriter(
+            args.output, reader.header
+        ) as writer:
+            for packets, data, offsets in reader.raw_blocks():
+                num_read += len(packets)
+                selected = np.ones(len(packets), bool)
+                if args.tick_range:
+                    selected &= in_range(packets["tick"], args.tick_range)
+                if args.addr_range:
+                    selected &= in_range(packets["addr"], args.addr_range)
+                if args.cmd:
+                    selected &= np.isin(packets["cmd"], args.cmd)
+
+                # Slice the matching packets
+                matching = np.flatnonzero(selected)
+                if to_skip:
+                    skipped = matching[:to_skip]
+                    selected[skipped] = False
+                    matching = matching[to_skip:]
+                    to_skip -= len(skipped)
+                if to_keep is not None:
+                    selected[matching[to_keep:]] = False
+                    to_keep -= min(len(matching), to_keep)
+
+                writer.write_selected(data, offsets, selected)
+                num_written += int(selected.sum())
+                if to_keep == 0:
+                    break
+
+    print(f"Read {num_read} packets, wrote {num_written}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Time the ISA parser on the ISA descriptions in src/arch.
+
+For each ISA, a cold run (no cached lexer/parser tables or split ##include
+files) and a warm run (with the cache of the cold run) are timed. Then all
+the ISAs are parsed one after the other and `--jobs` at a time, as the
+build does with -j. Each run is done in a fresh Python process with an
+empty output directory, so the outputs are always regenerated.
+
+Usage
+-----
+
+```
+python3 util/isa_parser_benchmark.py [-j JOBS] [isa ...]
+```
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+gem5_root = Path(__file__).resolve().parent.parent
+
+parser = argparse.ArgumentParser(
+    description="Time cold, warm and parallel runs of the ISA parser."
+)
+parser.add_argument(
+    "isas",
+    nargs="*",
+    help="The ISAs to time (e.g., x86 riscv). All of them by default.",
+)
+parser.add_argument(
+    "-n",
+    "--repeat",
+    type=int,
+    default=1,
+    help="The number of warm runs per ISA. The best time is reported.",
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="The number of ISAs parsed at the same time.",
+)
+parser.add_argument(
+    "--timing",
+    action="store_true",
+    help="Print the time of each phase of the warm runs.",
+)
+
+args = parser.parse_args()
+
+isas = args.isas or sorted(
+    path.parent.parent.name
+    for path in (gem5_root / "src" / "arch").glob("*/isa/main.isa")
+)
+parser_env = dict(
+    os.environ,
+    PYTHONPATH=os.pathsep.join(
+        [
+            str(gem5_root / "src" / "arch"),
+            str(gem5_root / "build_tools"),
+            str(gem5_root / "ext" / "ply"),
+        ]
+    ),
+)
+
+
+def time_run(isa, table_dir, timing=False):
+    isa_desc = str(gem5_root / "src" / "arch" / isa / "isa" / "main.isa")
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-m", "isa_parser", isa_desc, output_dir]
+            + ["--table-dir", table_dir]
+            + (["--timing"] if timing else []),
+            check=True,
+            capture_output=True,
+            text=True,
+            env=parser_env,
+            # Some descriptions import files relative to the gem5 root.
+            cwd=gem5_root,
+        )
+        elapsed = time.perf_counter() - start
+    if timing:
+        output = result.stdout
+        print(output[output.index("ISA parser phases") :], end="")
+    return elapsed
+
+
+with tempfile.TemporaryDirectory() as table_dir:
+    print(f"{'ISA':<10}{'cold (s)':>12}{'warm (s)':>12}")
+    for isa in isas:
+        isa_table_dir = os.path.join(table_dir, isa)
+        cold = time_run(isa, isa_table_dir)
+        warm = min(
+            time_run(isa, isa_table_dir, args.timing)
+            for _ in range(args.repeat)
+        )
+        print(f"{isa:<10}{cold:>12.2f}{warm:>12.2f}")
+
+    for jobs in (1, args.jobs):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(jobs) as executor:
+            list(
+                executor.map(
+                    lambda isa: time_run(isa, os.path.join(table_dir, isa)),
+                    isas,
+                )
+            )
+        elapsed = time.perf_counter() - start
+        print(f"All ISAs, {jobs} at a time: {elapsed:.2f}s")
@@ -25,6 +25,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import argparse
+import time
 from pathlib import Path
 from gem5.resources.md5_utils import md5_file, md5_dir
 
@@ -36,15 +37,53 @@ parser = argparse.ArgumentParser(
 
 parser.add_argument("path", type=str, help="The path to the file/directory.")
 
+parser.add_argument(
+    "-j",
+    "--threads",
+    type=int,
+    default=1,
+    help="The number of threads used to hash a directory.",
+)
+
+parser.add_argument(
+    "--per-file",
+    action="store_true",
+    help="Hash each file of a directory separately and combine the file "
+    "digests. This is faster with multiple threads, but the value does not "
+    "correspond to the gem5-resources entries.",
+)
+
+parser.add_argument(
+    "--benchmark",
+    action="store_true",
+    help="Time the ways of hashing a directory with the given number of "
+    "threads.",
+)
+
 args = parser.parse_args()
 
 path = Path(args.path)
 
+if args.benchmark:
+    if not path.is_dir():
+        print("Input path is not a directory.")
+        exit(1)
+    for description, threads, legacy in (
+        ("single stream, 1 thread", 1, True),
+        (f"single stream, {args.threads} threads", args.threads, True),
+        (f"per file, {args.threads} threads", args.threads, False),
+    ):
+        start = time.perf_counter()
+        value = md5_dir(path, threads=threads, legacy=legacy)
+        elapsed = time.perf_counter() - start
+        print(f"{description}: {value} in {elapsed:.3f}s")
+    exit(0)
+
 if path.is_file():
     print(md5_file(path))
     exit(0)
 elif path.is_dir():
-    print(md5_dir(path))
+    print(md5_dir(path, threads=args.threads, legacy=not args.per_file))
     exit(0)
 
 print("Input path is neither a file nor directory.")
@@ -38,9 +38,15 @@
 # Pipeline activity viewer for the O3 CPU model.
 
 import argparse
+import bisect
+import heapq
+import mmap
 import os
+import struct
 import sys
 import copy
+import tempfile
+from array import array
 
 # Temporary storage for instructions. The queue is filled in out-of-order
 # until it reaches 'max_threshold' number of instructions. It is then
@@ -97,7 +103,7 @@ def process_trace(
             line = trace.readline()
             if not line:
                 return
-            fields = line.split(":")
+            fields = line.split(":", 6)
             if fields[0] != "O3PipeView":
                 continue
             if int(fields[2]) >= start_tick:
@@ -107,7 +113,7 @@ def process_trace(
             line = trace.readline()
             if not line:
                 return
-            fields = line.split(":")
+            fields = line.split(":", 6)
             if fields[0] != "O3PipeView":
                 continue
             if fields[1] == "fetch" and int(fields[5]) >= start_sn:
@@ -116,40 +122,16 @@ def process_trace(
         line = trace.readline()
         if not line:
             return
-        fields = line.split(":")
+        fields = line.split(":", 6)
 
     # Skip lines up to next instruction fetch
     while fields[0] != "O3PipeView" or fields[1] != "fetch":
         line = trace.readline()
         if not line:
             return
-        fields = line.split(":")
+        fields = line.split(":", 6)
 
-    # Print header
-    outfile.write(
-        "// f = fetch, d = decode, n = rename, p = dispatch, "
-        "i = issue, c = complete, r = retire"
-    )
-
-    if store_completions:
-        outfile.write(", s = store-complete")
-    outfile.write("\n\n")
-
-    outfile.write(
-        " "
-        + "timeline".center(width)
-        + "   "
-        + "tick".center(15)
-        + "  "
-        + "pc.upc".center(12)
-        + "  "
-        + "disasm".ljust(25)
-        + "  "
-        + "seq_num".center(10)
-    )
-    if timestamps:
-        outfile.write("timestamps".center(25))
-    outfile.write("\n")
+    print_header(outfile, width, timestamps, store_completions)
 
     # Region of interest
     curr_inst = {}
@@ -176,7 +158,9 @@ def process_trace(
                     return
                 (curr_inst["pc"], curr_inst["upc"]) = fields[3:5]
                 curr_inst["sn"] = int(fields[5])
-                curr_inst["disasm"] = " ".join(fields[6][:-1].split())
+                # The disassembly may hold colons, e.g., x86 segment
+                # prefixes
+                curr_inst["disasm"] = " ".join(fields[6].split())
             elif fields[1] == "retire":
                 if curr_inst["retire"] == 0:
                     curr_inst["disasm"] = "-----" + curr_inst["disasm"]
@@ -204,7 +188,35 @@ def process_trace(
                 0,
             )
             return
-        fields = line.split(":")
+        fields = line.split(":", 6)
+
+
+# Prints the legend and the column titles
+def print_header(outfile, width, timestamps, store_completions):
+    outfile.write(
+        "// f = fetch, d = decode, n = rename, p = dispatch, "
+        "i = issue, c = complete, r = retire"
+    )
+
+    if store_completions:
+        outfile.write(", s = store-complete")
+    outfile.write("\n\n")
+
+    outfile.write(
+        " "
+        + "timeline".center(width)
+        + "   "
+        + "tick".center(15)
+        + "  "
+        + "pc.upc".center(12)
+        + "  "
+        + "disasm".ljust(25)
+        + "  "
+        + "seq_num".center(10)
+    )
+    if timestamps:
+        outfile.write("timestamps".center(25))
+    outfile.write("\n")
 
 
 # Puts new instruction into the print queue.
@@ -431,6 +443,418 @@ def print_inst(
             outfile.write("...".center(12) + "\n")
 
 
+# Binary index of a trace
+#
+# Parsing a multi-GB text trace takes minutes, even just to skip to the
+# requested range. The index holds one fixed-width record per instruction,
+# sorted by sequence number, and is memory-mapped by the viewer so any
+# window can be rendered without reading the rest of the trace. Layout
+# (little-endian):
+#
+# * Header: see INDEX_HEADER. The size and modification time of the trace
+#   are kept to tell whether the index is up to date.
+# * Records: see INDEX_RECORD, the ticks are 0 for stages the instruction
+#   didn't reach.
+# * Sparse index: for every block of 'block_size' records, the sequence
+#   number of its first record, the largest fetch tick up to the end of the
+#   block and the smallest fetch tick from its start on.
+# * Disassembly table: the offset of every distinct disassembly string
+#   (records refer to them by index), followed by the UTF-8 strings.
+INDEX_MAGIC = b"gem5o3pv"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<8sIIQQQQQ")
+# sn, pc, upc, disasm, fetch, decode, rename, dispatch, issue, complete,
+# retire, store
+INDEX_RECORD = struct.Struct("<QQIIQQQQQQQQ")
+INDEX_BLOCK = struct.Struct("<QQQ")
+
+index_stages = (
+    "fetch",
+    "decode",
+    "rename",
+    "dispatch",
+    "issue",
+    "complete",
+    "retire",
+    "store",
+)
+
+
+# Default path of the index of a trace
+def index_path(trace_path):
+    return trace_path + ".idx"
+
+
+# Yields the records of the instructions of a trace, in trace order
+def parse_trace(trace, disasms):
+    stage_ids = {
+        name.encode(): i + 4 for i, name in enumerate(index_stages[:-1])
+    }
+    record = None
+    for line in trace:
+        if not line.startswith(b"O3PipeView:"):
+            continue
+        fields = line.rstrip(b"\n").split(b":", 6)
+        stage = fields[1]
+        if stage == b"fetch":
+            disasm = " ".join(fields[6].decode(errors="replace").split())
+            disasm_id = disasms.setdefault(disasm, len(disasms))
+            record = [
+                int(fields[5]),
+                int(fields[3], 16),
+                int(fields[4]),
+                disasm_id,
+                int(fields[2]),
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                0,
+            ]
+        elif record is None:
+            continue
+        else:
+            record[stage_ids[stage]] = int(fields[2])
+            if stage == b"retire":
+                if len(fields) > 4:
+                    record[11] = int(fields[4])
+                yield tuple(record)
+                record = None
+
+
+# Sorts the records by sequence number. Instructions are only a little out
+# of order in the trace, but no assumption is made: they are sorted in runs
+# of 'run_size' records, which are then merged.
+def sorted_records(records, run_size, tmpdir):
+    runs = []
+    while True:
+        run = []
+        for record in records:
+            run.append(record)
+            if len(run) == run_size:
+                break
+        run.sort()
+        if not runs and len(run) < run_size:
+            yield from run
+            return
+        if run:
+            run_file = tempfile.TemporaryFile(dir=tmpdir)
+            for record in run:
+                run_file.write(INDEX_RECORD.pack(*record))
+            run_file.seek(0)
+            runs.append(run_file)
+        if len(run) < run_size:
+            break
+
+    def read_run(run_file):
+        with run_file:
+            while True:
+                data = run_file.read(INDEX_RECORD.size * 4096)
+                if not data:
+                    return
+                yield from INDEX_RECORD.iter_unpack(data)
+
+    yield from heapq.merge(*[read_run(f) for f in runs])
+
+
+# Converts a text trace to a binary index
+def build_index(trace_path, out_path, block_size=1024, run_size=1 << 18):
+    disasms = {}
+    blocks = []
+    num_records = 0
+    first_sn = 0
+    max_fetch = 0
+    block_min_fetch = []
+    stat = os.stat(trace_path)
+
+    # The index is written to a temporary file which replaces the old one
+    # once complete, so an interrupted build doesn't leave a broken index.
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(out_path) + ".", dir=out_dir
+    )
+    try:
+        with os.fdopen(fd, "wb") as out, open(trace_path, "rb") as trace:
+            out.write(bytes(INDEX_HEADER.size))
+            records = sorted_records(
+                parse_trace(trace, disasms),
+                run_size,
+                out_dir,
+            )
+            buf = []
+            for record in records:
+                if num_records % block_size == 0:
+                    first_sn = record[0]
+                    min_fetch = record[4]
+                max_fetch = max(max_fetch, record[4])
+                min_fetch = min(min_fetch, record[4])
+                buf.append(INDEX_RECORD.pack(*record))
+                num_records += 1
+                if num_records % block_size == 0:
+                    blocks.append([first_sn, max_fetch, 0])
+                    block_min_fetch.append(min_fetch)
+                    out.write(b"".join(buf))
+                    buf = []
+            if buf:
+                blocks.append([first_sn, max_fetch, 0])
+                block_min_fetch.append(min_fetch)
+                out.write(b"".join(buf))
+
+            # Smallest fetch tick from the start of each block on
+            min_fetch = None
+            for block, block_min in zip(
+                reversed(blocks), reversed(block_min_fetch)
+            ):
+                if min_fetch is None or block_min < min_fetch:
+                    min_fetch = block_min
+                block[2] = min_fetch
+            for block in blocks:
+                out.write(INDEX_BLOCK.pack(*block))
+
+            strings_offset = out.tell()
+            encoded = [disasm.encode() for disasm in disasms]
+            offsets = array("Q")
+            offset = 0
+            for string in encoded:
+                offsets.append(offset)
+                offset += len(string)
+            offsets.append(offset)
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            out.write(offsets.tobytes())
+            out.write(b"".join(encoded))
+
+            out.seek(0)
+            out.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC,
+                    INDEX_VERSION,
+                    block_size,
+                    num_records,
+                    len(disasms),
+                    strings_offset,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                )
+            )
+        # mkstemp() only lets the owner read the file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return num_records
+
+
+# Memory-mapped index written by build_index()
+class TraceIndex:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            # mmap() raises ValueError for empty files
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            if len(self._map) < INDEX_HEADER.size:
+                raise ValueError(f"'{path}' is not an O3 pipeline index")
+            (
+                magic,
+                version,
+                self.block_size,
+                self.num_records,
+                self.num_disasms,
+                self._strings_offset,
+                self.trace_size,
+                self.trace_mtime_ns,
+            ) = INDEX_HEADER.unpack_from(self._map, 0)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"'{path}' is not an O3 pipeline index")
+            if len(self._map) < (
+                self._strings_offset + (self.num_disasms + 1) * 8
+            ):
+                raise ValueError(f"'{path}' is truncated")
+        except:
+            self.close()
+            raise
+
+        num_blocks = -(-self.num_records // self.block_size)
+        blocks_offset = (
+            INDEX_HEADER.size + self.num_records * INDEX_RECORD.size
+        )
+        blocks = array("Q")
+        blocks.frombytes(
+            self._map[
+                blocks_offset : blocks_offset + num_blocks * INDEX_BLOCK.size
+            ]
+        )
+        if sys.byteorder != "little":
+            blocks.byteswap()
+        self._block_sn = blocks[0::3]
+        self._block_max_fetch = blocks[1::3]
+        self._block_min_fetch = blocks[2::3]
+        self._disasms_offset = (
+            self._strings_offset + (self.num_disasms + 1) * 8
+        )
+
+    @classmethod
+    def is_index(cls, path):
+        with open(path, "rb") as f:
+            return f.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+
+    # Whether the index was built from the current version of a trace
+    def matches(self, trace_path):
+        stat = os.stat(trace_path)
+        return (
+            stat.st_size == self.trace_size
+            and stat.st_mtime_ns == self.trace_mtime_ns
+        )
+
+    def close(self):
+        if hasattr(self, "_map"):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _sn(self, pos):
+        return struct.unpack_from(
+            "<Q", self._map, INDEX_HEADER.size + pos * INDEX_RECORD.size
+        )[0]
+
+    def _disasm(self, disasm_id):
+        start, end = struct.unpack_from(
+            "<QQ", self._map, self._strings_offset + disasm_id * 8
+        )
+        offset = self._disasms_offset
+        return self._map[offset + start : offset + end].decode()
+
+    # Position of the first record with a sequence number >= sn
+    def find_sn(self, sn):
+        block = max(bisect.bisect_right(self._block_sn, sn) - 1, 0)
+        lo = block * self.block_size
+        hi = min(lo + self.block_size, self.num_records)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sn(mid) < sn:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # Position before which no record has a fetch tick >= tick
+    def find_tick(self, tick):
+        block = bisect.bisect_left(self._block_max_fetch, tick)
+        return min(block * self.block_size, self.num_records)
+
+    # Whether an instruction is fetched at or after start_tick if it is not
+    # 0, or else has a sequence number of at least start_sn
+    def reaches(self, start_tick, start_sn):
+        if self.num_records == 0:
+            return False
+        if start_tick != 0:
+            return self._block_max_fetch[-1] >= start_tick
+        return self._sn(self.num_records - 1) >= start_sn
+
+    # Yields the instructions in the given ranges (0 and -1 meaning no
+    # limit), in the format print_inst() expects
+    def insts(self, start_tick, stop_tick, start_sn, stop_sn):
+        pos = max(self.find_sn(start_sn), self.find_tick(start_tick))
+        offset = INDEX_HEADER.size + pos * INDEX_RECORD.size
+        for pos in range(pos, self.num_records):
+            if (
+                stop_tick > 0
+                and pos % self.block_size == 0
+                and self._block_min_fetch[pos // self.block_size] > stop_tick
+            ):
+                return
+            record = INDEX_RECORD.unpack_from(self._map, offset)
+            offset += INDEX_RECORD.size
+            sn = record[0]
+            if stop_sn > 0 and sn > stop_sn:
+                return
+            fetch = record[4]
+            if fetch < start_tick or (stop_tick > 0 and fetch > stop_tick):
+                continue
+            inst = dict(zip(index_stages, record[4:]))
+            inst["sn"] = sn
+            inst["pc"] = "0x%08x" % record[1]
+            inst["upc"] = str(record[2])
+            inst["disasm"] = self._disasm(record[3])
+            if inst["retire"] == 0:
+                inst["disasm"] = "-----" + inst["disasm"]
+            yield inst
+
+
+# Renders the instructions in the given ranges from an index
+def process_index(
+    index,
+    outfile,
+    cycle_time,
+    width,
+    color,
+    timestamps,
+    committed_only,
+    store_completions,
+    start_tick,
+    stop_tick,
+    start_sn,
+    stop_sn,
+):
+    insts = index.insts(start_tick, stop_tick, start_sn, stop_sn)
+    if committed_only:
+        insts = (inst for inst in insts if inst["retire"] != 0)
+    # As when reading the trace, the header is printed even if the range
+    # is empty, unless the trace ends before it starts
+    if index.reaches(start_tick, start_sn):
+        print_header(outfile, width, timestamps, store_completions)
+    for inst in insts:
+        print_inst(
+            outfile,
+            inst,
+            cycle_time,
+            width,
+            color,
+            timestamps,
+            store_completions,
+        )
+
+
+# Opens the index of a trace, or the trace itself if it is an index. The
+# index is built if 'build' is set and it is missing, invalid or out of date.
+def open_index(path, build):
+    if TraceIndex.is_index(path):
+        return TraceIndex(path)
+    idx_path = index_path(path)
+    if os.path.exists(idx_path):
+        try:
+            index = TraceIndex(idx_path)
+        except ValueError as e:
+            # e.g., another version of the format, or a truncated file
+            problem = f"invalid index {idx_path} ({e})"
+        else:
+            if index.matches(path):
+                return index
+            index.close()
+            problem = f"out of date index {idx_path}"
+        if not build:
+            print(f"Ignoring {problem}, rebuild it with --index")
+            return None
+    if not build:
+        return None
+    print("Indexing trace... ", end=" ", flush=True)
+    num_insts = build_index(path, idx_path)
+    print(f"done! ({num_insts} instructions)")
+    return TraceIndex(idx_path)
+
+
 def validate_range(my_range):
     my_range = [int(i) for i in my_range.split(":")]
     if (
@@ -498,7 +922,21 @@ def main():
         default=False,
         help="additionally display store completion ticks",
     )
-    parser.add_argument("tracefile")
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        default=False,
+        help="build a binary index of the trace (TRACE_FILE.idx) if it "
+        "is missing, invalid or out of date, making later views of any "
+        "range fast",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        default=False,
+        help="read the text trace even if an index is available",
+    )
+    parser.add_argument("tracefile", help="text trace or index file")
 
     args = parser.parse_args()
     tick_range = validate_range(args.tick_range)
@@ -509,7 +947,28 @@ def main():
     if not inst_range:
         parser.error("invalid range")
         sys.exit(1)
+    index = None
+    if not args.no_index:
+        index = open_index(args.tracefile, args.index)
+
     # Process trace
+    if index:
+        print("Processing index... ", end=" ")
+        with index, open(args.outfile, "w") as out:
+            process_index(
+                index,
+                out,
+                args.cycle_time,
+                args.width,
+                args.color,
+                args.timestamps,
+                args.only_committed,
+                args.store_completions,
+                *(tick_range + inst_range),
+            )
+        print("done!")
+        return
+
     print("Processing trace... ", end=" ")
     with open(args.tracefile, "r") as trace:
         with open(args.outfile, "w") as out:
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Bulk reader for gem5 packet traces (see src/proto/packet.proto).
+#
+# The packets are decoded a block of the file at a time, straight into
+# numpy structured arrays, without going through the protobuf message
+# classes. A Packet message only has varint fields, so the body of a trace
+# is a plain sequence of varints: the length of a message, then the tag and
+# the value of each of its fields. All the varints of a block are decoded at
+# once with numpy, and the message boundaries are then found by following
+# the length prefixes.
+
+import gzip
+import numpy as np
+
+import protolib
+
+# Fields of the Packet message, by field number
+packet_fields = {
+    1: "tick",
+    2: "cmd",
+    3: "addr",
+    4: "size",
+    5: "flags",
+    6: "pkt_id",
+    7: "pc",
+}
+
+# Bits of the 'present' field, telling which optional fields a packet has
+HAS_FLAGS = 1
+HAS_PKT_ID = 2
+HAS_PC = 4
+
+_optional_fields = {5: HAS_FLAGS, 6: HAS_PKT_ID, 7: HAS_PC}
+
+packet_dtype = np.dtype(
+    [
+        ("tick", np.uint64),
+        ("cmd", np.uint32),
+        ("addr", np.uint64),
+        ("size", np.uint32),
+        ("flags", np.uint32),
+        ("pkt_id", np.uint64),
+        ("pc", np.uint64),
+        ("present", np.uint8),
+    ]
+)
+
+# Values of the cmd field (see the Command enum in src/mem/packet.hh)
+READ_REQ = 1
+WRITE_REQ = 4
+
+
+def _read_varint(buf, pos):
+    """Decodes the varint at pos in buf, returns it and the next position."""
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        result |= (b & 0x7F) << shift
+        pos += 1
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _message_fields(buf):
+    """Yields the (field number, value) of the fields of a message."""
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        wire_type = key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            value, pos = buf[pos : pos + 8], pos + 8
+        elif wire_type == 2:
+            size, pos = _read_varint(buf, pos)
+            value, pos = buf[pos : pos + size], pos + size
+        elif wire_type == 5:
+            value, pos = buf[pos : pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield key >> 3, value
+
+
+def encode_varint(value):
+    """The varint encoding of a value, as bytes."""
+    out = bytearray()
+    bits = value & 0x7F
+    value >>= 7
+    while value:
+        out.append(0x80 | bits)
+        bits = value & 0x7F
+        value >>= 7
+    out.append(bits)
+    return bytes(out)
+
+
+class PacketHeader:
+    """The PacketHeader message at the start of a packet trace."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.obj_id = ""
+        self.ver = 0
+        self.tick_freq = 0
+        self.id_strings = {}
+        for field, value in _message_fields(raw):
+            if field == 1:
+                self.obj_id = value.decode()
+            elif field == 2:
+                self.ver = value
+            elif field == 3:
+                self.tick_freq = value
+            elif field == 4:
+                entry = dict(_message_fields(value))
+                self.id_strings[entry.get(1, 0)] = entry.get(2, b"").decode()
+
+
+def decode_varints(data):
+    """
+    Decodes all the complete varints of a uint8 array.
+
+    :returns: The values, the position of the first byte of each varint and
+    the position following the last complete varint.
+    """
+    last_pos = np.flatnonzero(data < 0x80)
+    if not len(last_pos):
+        return np.empty(0, np.uint64), np.empty(0, np.int64), 0
+    end = int(last_pos[-1]) + 1
+    start_pos = np.empty(len(last_pos), np.int64)
+    start_pos[0] = 0
+    start_pos[1:] = last_pos[:-1] + 1
+    lengths = last_pos - start_pos + 1
+    if lengths.max() > 10:
+        raise ValueError("Too many bytes when decoding varint")
+
+    # Add the k-th byte of the varints that have one, most are short
+    values = (data[start_pos] & 0x7F).astype(np.uint64)
+    longer = np.flatnonzero(lengths > 1)
+    k = 1
+    while len(longer):
+        bits = (data[start_pos[longer] + k] & 0x7F).astype(np.uint64)
+        values[longer] |= bits << np.uint64(7 * k)
+        k += 1
+        longer = longer[lengths[longer] > k]
+    return values, start_pos, end
+
+
+def _walk_messages(following):
+    """
+    Follows the chain of messages from the first varint. Returns the varints
+    starting a message and the varint the chain stopped at.
+    """
+    num_varints = len(following)
+    following = following.tolist()
+    message_starts = []
+    append = message_starts.append
+    i = 0
+    while i < num_varints:
+        j = following[i]
+        if j < 0:
+            if j == -2:
+                raise ValueError("Malformed packet trace")
+            break
+        append(i)
+        i = j
+    return np.array(message_starts, np.int64), i
+
+
+def _find_messages(values, following):
+    """
+    Same as _walk_messages(), for the usual case of messages starting with
+    the tick field (tag 8), without walking the chain one message at a time.
+    Returns None if some message doesn't start with the tick field.
+    """
+    num_varints = len(values)
+    # Every message start is followed by the tag of the tick field, but so
+    # are a few tags whose value is 8.
+    candidates = np.flatnonzero(values[1:] == 8)
+    num_candidates = len(candidates)
+    if not num_candidates or candidates[0] != 0:
+        return None
+
+    # Where the chain goes from each candidate, num_candidates if it leaves
+    # the candidates
+    nexts = following[candidates]
+    jump = np.searchsorted(candidates, nexts)
+    jump[nexts < 0] = num_candidates
+    found = jump < num_candidates
+    found[found] = candidates[jump[found]] == nexts[found]
+    jump[~found] = num_candidates
+    jump = np.append(jump, num_candidates)
+
+    # Mark the candidates the chain from the first one goes through, by
+    # pointer doubling: after k steps the chain is known up to 2**k
+    # messages.
+    on_chain = np.zeros(num_candidates + 1, bool)
+    on_chain[0] = True
+    steps = 1
+    while steps <= num_candidates:
+        on_chain[jump[on_chain]] = True
+        jump = jump[jump]
+        steps *= 2
+    chain = candidates[np.flatnonzero(on_chain[:num_candidates])]
+
+    last = chain[-1]
+    if following[last] == num_varints:
+        return chain, num_varints
+    if following[last] == -1:
+        # The last message isn't complete
+        return chain[:-1], int(last)
+    return None
+
+
+def decode_packets(data):
+    """
+    Decodes the complete Packet messages at the start of a buffer of
+    length-prefixed messages.
+
+    :returns: The packets, as an array of packet_dtype, the offsets of the
+    messages (including their length prefix) in the buffer, followed by the
+    end of the last message.
+    """
+    data = np.frombuffer(data, np.uint8)
+    values, start_pos, end = decode_varints(data)
+    num_varints = len(values)
+
+    # Following the length prefix of every varint, as if it started a
+    # message, gives the varint the next message would start at: -1 if it
+    # isn't complete and -2 if it isn't on a varint boundary.
+    varint_at = np.full(end + 1, -2, np.int64)
+    varint_at[start_pos] = np.arange(num_varints)
+    varint_at[end] = num_varints
+    payload_pos = np.append(start_pos[1:], end)
+    lengths = np.minimum(values, np.uint64(end + 1)).astype(np.int64)
+    targets = payload_pos + lengths
+    incomplete = targets > end
+    targets[incomplete] = end
+    following = varint_at[targets]
+    following[incomplete] = -1
+
+    found = _find_messages(values, following)
+    if found is None:
+        message_starts, i = _walk_messages(following)
+    else:
+        message_starts, i = found
+    consumed = int(start_pos[i]) if i < num_varints else end
+
+    num_packets = len(message_starts)
+    packets = np.zeros(num_packets, packet_dtype)
+    offsets = np.append(start_pos[message_starts], consumed)
+    if not num_packets:
+        return packets, offsets
+
+    # Tags and values alternate after the length prefix of every message
+    sizes = np.diff(np.append(message_starts, i))
+    if np.any(sizes % 2 == 0):
+        raise ValueError("Malformed packet trace")
+    place = np.arange(i) - np.repeat(message_starts, sizes)
+    tag_varints = np.flatnonzero(place % 2 == 1)
+    tags = values[tag_varints]
+    if np.any(tags & 7):
+        raise ValueError("Packet messages may only have varint fields")
+    numbers = (tags >> 3).astype(np.int64)
+    if np.any(numbers > len(packet_fields)):
+        raise ValueError("Unknown field in packet trace")
+    messages = np.repeat(np.arange(num_packets), sizes // 2)
+
+    # Scatter the values in a table with one column per field
+    table = np.zeros((num_packets, len(packet_fields) + 1), np.uint64)
+    present = np.zeros((num_packets, len(packet_fields) + 1), bool)
+    table[messages, numbers] = values[tag_varints + 1]
+    present[messages, numbers] = True
+    for number, name in packet_fields.items():
+        packets[name] = table[:, number]
+    for number, bit in _optional_fields.items():
+        packets["present"] |= present[:, number] * np.uint8(bit)
+    return packets, offsets
+
+
+class PacketTraceReader:
+    """
+    Reads a (possibly gzipped) packet trace a block at a time.
+
+    Usage
+    -----
+    ```
+    reader = PacketTraceReader("system.monitor.trace.gz")
+    print(reader.header.tick_freq)
+    for packets in reader.blocks():
+        reads = packets[packets["cmd"] == READ_REQ]
+    ```
+    """
+
+    def __init__(self, path, block_size=1 << 22):
+        """
+        :param path: The path of the trace.
+        :param block_size: The number of bytes of the trace decoded at once.
+        """
+        self.block_size = block_size
+        self._file = protolib.openFileRd(path)
+        if self._file.read(4) != b"gem5":
+            self._file.close()
+            raise ValueError(f"Unrecognized file {path}")
+
+        # The header is small, read it one byte at a time to leave the file
+        # at the first packet.
+        size, _ = protolib._DecodeVarint32(self._file)
+        self.header = PacketHeader(self._file.read(size))
+
+    def raw_blocks(self):
+        """
+        Yields (packets, data, offsets) for every block of the trace, where
+        the message of packets[i] is data[offsets[i] : offsets[i + 1]].
+        """
+        tail = b""
+        while True:
+            chunk = self._file.read(self.block_size)
+            data = tail + chunk
+            if not data:
+                return
+            packets, offsets = decode_packets(data)
+            consumed = int(offsets[-1])
+            tail = data[consumed:]
+            if len(packets):
+                yield packets, data, offsets
+            if not chunk:
+                if tail:
+                    raise ValueError("Truncated packet trace")
+                return
+
+    def blocks(self):
+        """Yields the packets of the trace, a block at a time."""
+        for packets, _, _ in self.raw_blocks():
+            yield packets
+
+    def read(self):
+        """Reads all the packets of the trace in a single array."""
+        blocks = list(self.blocks())
+        if not blocks:
+            return np.zeros(0, packet_dtype)
+        return np.concatenate(blocks)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_packets(path):
+    """Reads all the packets of a packet trace in a single array."""
+    with PacketTraceReader(path) as reader:
+        return reader.read()
+
+
+class PacketTraceWriter:
+    """
+    Writes a packet trace, gzipped if the path ends in .gz, from the raw
+    messages of another trace.
+    """
+
+    def __init__(self, path, header):
+        """
+        :param path: The path of the trace.
+        :param header: The PacketHeader of the trace.
+        """
+        if path.endswith(".gz"):
+            self._file = gzip.open(path, "wb")
+        else:
+            self._file = open(path, "wb")
+        self._file.write(b"gem5")
+        self._file.write(encode_varint(len(header.raw)))
+        self._file.write(header.raw)
+
+    def write_selected(self, data, offsets, selected):
+        """
+        Writes the selected messages of a block returned by
+        PacketTraceReader.raw_blocks().
+
+        :param selected: A boolean array, True for the packets to write.
+        """
+        if selected.all():
+            self._file.write(data[offsets[0] : offsets[-1]])
+            return
+        # The message of every byte of the block
+        sizes = np.diff(offsets)
+        keep = np.repeat(selected, sizes)
+        block = np.frombuffer(data, np.uint8)[offsets[0] : offsets[-1]]
+        self._file.write(block[keep].tobytes())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()